@@ -0,0 +1,3 @@
+# Carrega o .env antes de qualquer módulo do app ler o ambiente
+# (vários leem limites e caminhos no import).
+from app.config import settings  # noqa: F401
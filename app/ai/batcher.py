@@ -0,0 +1,134 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+OnPartial = Callable[[Dict], Awaitable[None]]
+ParseOne = Callable[[str, Optional[OnPartial]], Awaitable[Dict]]
+ParseMany = Callable[[List[str]], Awaitable[List[Dict]]]
+
+# Janela de coleta por chat (0 desliga o micro-batching)
+BATCH_WINDOW_MS = float(os.getenv("AI_BATCH_WINDOW_MS", "200"))
+BATCH_MAX_SIZE = int(os.getenv("AI_BATCH_MAX_SIZE", "10"))
+
+
+class MicroBatcher:
+    """
+    Agrupa mensagens do mesmo chat que chegam dentro de uma janela curta
+    e as interpreta em uma única chamada multi-item.
+
+    Cada chamador de submit recebe de volta apenas o resultado da sua
+    mensagem, na mesma ordem em que as mensagens chegaram.
+    """
+
+    def __init__(
+        self,
+        parse_one: ParseOne,
+        parse_many: ParseMany,
+        window_ms: float = BATCH_WINDOW_MS,
+        max_batch: int = BATCH_MAX_SIZE,
+    ):
+        self.parse_one = parse_one
+        self.parse_many = parse_many
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+
+        self._pending: Dict[Hashable, List[Tuple[str, asyncio.Future, Optional[OnPartial]]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        # o loop só guarda referência fraca às tasks: sem isto um lote em
+        # andamento pode ser coletado e os chamadores ficam esperando
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        key: Hashable,
+        text: str,
+        on_partial: Optional[OnPartial] = None,
+    ) -> Dict:
+        """
+        on_partial só é chamado quando a mensagem acaba sozinha no lote
+        (resultado em streaming); lotes multi-item respondem de uma vez.
+        """
+        if self.window <= 0:
+            return await self.parse_one(text, on_partial)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        bucket = self._pending.setdefault(key, [])
+        bucket.append((text, future, on_partial))
+
+        if len(bucket) >= self.max_batch:
+            self._flush_now(key)
+        elif len(bucket) == 1:
+            self._timers[key] = loop.call_later(self.window, self._flush_now, key)
+
+        return await future
+
+    async def close(self) -> None:
+        """
+        Descarta as janelas abertas e cancela os lotes em andamento; os
+        chamadores recebem CancelledError.
+        """
+        for key in list(self._timers):
+            self._timers.pop(key).cancel()
+
+        for items in self._pending.values():
+            for _, future, _ in items:
+                future.cancel()
+        self._pending.clear()
+
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    # =====================
+    # INTERNAL
+    # =====================
+
+    def _flush_now(self, key: Hashable) -> None:
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+
+        items = self._pending.pop(key, [])
+        if items:
+            task = asyncio.create_task(self._run(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, items: List[Tuple[str, asyncio.Future, Optional[OnPartial]]]) -> None:
+        texts = [text for text, _, _ in items]
+        error: Optional[BaseException] = RuntimeError("Lote interrompido antes do resultado")
+
+        try:
+            if len(texts) == 1:
+                results = [await self.parse_one(texts[0], items[0][2])]
+            else:
+                results = await self.parse_many(texts)
+
+            if len(results) != len(items):
+                raise ValueError(
+                    f"parse_many devolveu {len(results)} resultados para {len(items)} mensagens"
+                )
+
+            for (_, future, _), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+        except Exception as e:
+            error = e
+
+        except BaseException:
+            error = None
+            raise
+
+        finally:
+            # erro, cancelamento ou resposta curta: nenhum chamador fica pendurado
+            for _, future, _ in items:
+                if future.done():
+                    continue
+
+                if error is None:
+                    future.cancel()
+                else:
+                    future.set_exception(error)
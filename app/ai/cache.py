@@ -0,0 +1,97 @@
+import copy
+import os
+import re
+import threading
+from datetime import date
+from typing import Any, Dict, Hashable, Optional
+
+from cachetools import TTLCache
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class _CountingTTLCache(TTLCache):
+    """
+    TTLCache (LRU + TTL) que conta remoções por capacidade e por expiração.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.evictions = 0
+        self.expirations = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        return expired
+
+
+class ParseCache:
+    """
+    Cache de resultados de parsing do LLM, compartilhado entre instâncias.
+
+    A chave é (namespace, texto normalizado, data de referência): a mesma
+    mensagem em outro dia pode ter outra interpretação ("amanhã", "ontem").
+    Os valores são copiados na entrada e na saída, pois os handlers
+    modificam os dicionários retornados.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        self._cache = _CountingTTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        namespace: str,
+        text: str,
+        reference_date: Optional[date] = None,
+    ) -> tuple:
+        normalized = _WHITESPACE_RE.sub(" ", text.strip().lower())
+        reference_date = reference_date or date.today()
+
+        return namespace, normalized, reference_date.isoformat()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._cache.get(key)
+
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._cache[key] = copy.deepcopy(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._cache),
+                "maxsize": int(self._cache.maxsize),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self._cache.evictions,
+                "expirations": self._cache.expirations,
+            }
+
+
+# Instância única usada por IntentRouter, FinanceParser, MemoryParser
+# e MessageExtractor.
+parse_cache = ParseCache(
+    maxsize=int(os.getenv("AI_CACHE_MAXSIZE", "1024")),
+    ttl=float(os.getenv("AI_CACHE_TTL_SECONDS", "3600")),
+)
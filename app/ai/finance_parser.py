@@ -1,30 +1,33 @@
 import json
-import os
+import time
 from datetime import datetime
-from typing import Dict
-from dotenv import load_dotenv
-from openai import OpenAI
+from typing import AsyncIterator, Dict
 
-load_dotenv()
+from app.ai.cache import parse_cache
+from app.ai.finance_rules import FinanceRuleParser, PAYMENT_METHOD_MAP
+from app.ai.partial_json import parse_partial_object
+from app.ai.metrics import finance_parse_stats, token_usage
+from app.ai.prompts import PromptBuilder
+from app.ai.resilience import openai_guard
+from app.infra.openai.client import OpenAIClientMixin
 
 
-class FinanceParser:
+class FinanceParser(OpenAIClientMixin):
     """
     Interpreta mensagens financeiras em português (PT-BR)
     e converte em dados estruturados (SEM regras de negócio).
     """
 
     MODEL = "gpt-4o-mini"
+    TIMEOUT = 15.0
 
-    SYSTEM_PROMPT = f"""
-Hoje é {datetime.now().strftime('%Y-%m-%d')}.
-
+    SYSTEM_PROMPT = """
 Você é um parser financeiro pessoal.
 
 Sua única função é transformar mensagens em português
 em um JSON ESTRITO seguindo exatamente este formato:
 
-{{
+{
   "module": "finance",
   "description": "string curta em português",
   "amount": number,
@@ -34,7 +37,7 @@ em um JSON ESTRITO seguindo exatamente este formato:
   "account": "string ou null",
   "installments_total": number ou null,
   "transaction_date": "YYYY-MM-DD"
-}}
+}
 
 Regras IMPORTANTES:
 - Responda APENAS com JSON válido
@@ -46,29 +49,60 @@ Regras IMPORTANTES:
 - Se não houver data explícita, use a data de hoje
 """
 
+    PROMPT = PromptBuilder("finance", SYSTEM_PROMPT)
+
     def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
+        self.rules = FinanceRuleParser()
 
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY is not set")
+    def parse(self, text: str) -> Dict:
+        fast = self.parse_local(text)
+        if fast:
+            return fast
 
-        self.client = OpenAI(api_key=api_key)
+        cache_key = parse_cache.make_key("finance", text)
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-    def parse(self, text: str) -> Dict:
+        started = time.perf_counter()
         try:
-            response = self.client.chat.completions.create(
-                model=self.MODEL,
-                messages=[
-                    {"role": "system", "content": self.SYSTEM_PROMPT},
-                    {"role": "user", "content": text},
-                ],
-                temperature=0.1,
+            response = openai_guard.call(
+                self.client.chat.completions.create,
+                **self._request(text),
             )
+            parsed = self._handle_response(response)
+            parse_cache.set(cache_key, parsed)
+
+            return parsed
+
+        except Exception as e:
+            print("⚠️ FinanceParser fallback:", e)
+            return self._fallback(text)
+
+        finally:
+            finance_parse_stats.record("llm", time.perf_counter() - started)
 
-            raw = response.choices[0].message.content.strip()
-            parsed = json.loads(raw)
+    async def parse_async(self, text: str) -> Dict:
+        """
+        Versão não bloqueante de parse, para uso nos handlers do bot.
+        """
+        fast = self.parse_local(text)
+        if fast:
+            return fast
 
-            parsed = self._normalize(parsed)
+        cache_key = parse_cache.make_key("finance", text)
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        try:
+            response = await openai_guard.acall(
+                self.async_client.chat.completions.create,
+                **self._request(text),
+            )
+            parsed = self._handle_response(response)
+            parse_cache.set(cache_key, parsed)
 
             return parsed
 
@@ -76,11 +110,107 @@ Regras IMPORTANTES:
             print("⚠️ FinanceParser fallback:", e)
             return self._fallback(text)
 
+        finally:
+            finance_parse_stats.record("llm", time.perf_counter() - started)
+
+    async def stream_async(self, text: str) -> AsyncIterator[Dict]:
+        """
+        Versão em streaming de parse_async: produz dicionários parciais
+        conforme os campos do JSON ficam completos. O último item produzido
+        é sempre o resultado final normalizado.
+        """
+        fast = self.parse_local(text)
+        if fast:
+            yield fast
+            return
+
+        cache_key = parse_cache.make_key("finance", text)
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        started = time.perf_counter()
+        try:
+            stream = await openai_guard.acall(
+                self.async_client.chat.completions.create,
+                **self._request(text),
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+
+            buffer = ""
+            last_partial = None
+
+            async for chunk in stream:
+                if chunk.usage:
+                    token_usage.record("finance", chunk.usage)
+
+                if not chunk.choices:
+                    continue
+
+                buffer += chunk.choices[0].delta.content or ""
+                partial = parse_partial_object(buffer)
+
+                if partial and partial != last_partial:
+                    last_partial = partial
+                    yield dict(partial)
+
+            parsed = self._handle_content(buffer)
+            parse_cache.set(cache_key, parsed)
+
+        except Exception as e:
+            print("⚠️ FinanceParser fallback:", e)
+            parsed = self._fallback(text)
+
+        finally:
+            finance_parse_stats.record("llm", time.perf_counter() - started)
+
+        yield parsed
+
+    def parse_local(self, text: str) -> Dict | None:
+        """
+        Fast path sem rede para mensagens formulaicas.
+        Retorna None quando a regra local não tem confiança suficiente.
+        """
+        started = time.perf_counter()
+        parsed = self.rules.parse(text)
+
+        if parsed:
+            finance_parse_stats.record("rules", time.perf_counter() - started)
+
+        return parsed
+
     # =====================
     # INTERNAL
     # =====================
 
+    def _request(self, text: str) -> Dict:
+        return {
+            "model": self.MODEL,
+            "messages": self.PROMPT.messages(text),
+            "prompt_cache_key": self.PROMPT.cache_key,
+            "temperature": 0.1,
+            "timeout": self.TIMEOUT,
+        }
+
+    def _handle_response(self, response) -> Dict:
+        token_usage.record("finance", response.usage)
+
+        return self._handle_content(response.choices[0].message.content)
+
+    def _handle_content(self, raw: str) -> Dict:
+        parsed = json.loads(raw.strip())
+
+        return self._normalize(parsed)
+
     def _fallback(self, text: str) -> Dict:
+        degraded = self.rules.parse(
+            text, min_confidence=self.rules.DEGRADED_CONFIDENCE
+        )
+        if degraded:
+            return degraded
+
         return {
             "module": "finance",
             "description": text[:60],
@@ -110,25 +240,10 @@ Regras IMPORTANTES:
             data["needs_review"] = True
 
         # 🔹 normaliza payment_method (apenas mapeia, não valida)
-        payment_map = {
-            "credito": "credit",
-            "crédito": "credit",
-            "debito": "debit",
-            "débito": "debit",
-            "pix": "pix",
-            "dinheiro": "cash",
-            "transferencia": "transfer",
-            "transferência": "transfer",
-            "deposito": "transfer",
-            "depósito": "transfer",
-            "salario": "transfer",
-            "salário": "transfer",
-        }
-
         pm = data.get("payment_method")
         if isinstance(pm, str):
             pm_norm = pm.lower().strip()
-            data["payment_method"] = payment_map.get(pm_norm, pm_norm)
+            data["payment_method"] = PAYMENT_METHOD_MAP.get(pm_norm, pm_norm)
         else:
             data["payment_method"] = None
 
@@ -0,0 +1,267 @@
+import re
+import unicodedata
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+# Vocabulário de formas de pagamento (texto sem acento -> valor canônico).
+# Também usado por FinanceParser._normalize para mapear a saída do LLM.
+PAYMENT_METHOD_MAP = {
+    "credito": "credit",
+    "crédito": "credit",
+    "cartao": "credit",
+    "cartão": "credit",
+    "debito": "debit",
+    "débito": "debit",
+    "pix": "pix",
+    "dinheiro": "cash",
+    "especie": "cash",
+    "espécie": "cash",
+    "transferencia": "transfer",
+    "transferência": "transfer",
+    "ted": "transfer",
+    "doc": "transfer",
+    "deposito": "transfer",
+    "depósito": "transfer",
+    "salario": "transfer",
+    "salário": "transfer",
+}
+
+# Palavras-chave (sem acento) -> categoria em português
+CATEGORY_KEYWORDS = {
+    "Alimentação": [
+        "mercado", "supermercado", "almoco", "jantar", "lanche", "restaurante",
+        "ifood", "padaria", "cafe", "pizza", "acougue", "feira", "hamburguer",
+    ],
+    "Transporte": [
+        "uber", "99", "taxi", "gasolina", "combustivel", "estacionamento",
+        "onibus", "metro", "pedagio",
+    ],
+    "Moradia": [
+        "aluguel", "condominio", "luz", "energia", "agua", "gas", "internet",
+    ],
+    "Saúde": [
+        "farmacia", "remedio", "medico", "consulta", "dentista", "academia",
+        "exame",
+    ],
+    "Lazer": ["cinema", "show", "bar", "viagem", "ingresso"],
+    "Assinaturas": ["netflix", "spotify", "assinatura", "streaming"],
+    "Vestuário": ["roupa", "tenis", "camisa", "camiseta", "calca", "sapato"],
+    "Educação": ["curso", "livro", "faculdade", "escola", "mensalidade"],
+    "Salário": ["salario"],
+}
+
+INCOME_CUES = {"recebi", "ganhei", "entrou", "caiu", "reembolso", "salario", "rendimento"}
+EXPENSE_CUES = {"paguei", "comprei", "gastei", "gasto", "pago", "assinei"}
+
+# Mensagens com estas palavras são do módulo de memória, nunca da regra local
+MEMORY_CUES = {
+    "lembrete", "lembrar", "lembre", "ideia", "reflexao", "nota", "anotar",
+    "anotacao",
+}
+
+# Números seguidos destas unidades não são valores em dinheiro
+NON_MONEY_UNITS = re.compile(
+    r"\s*(?:h\b|horas?|min|minutos?|dias?|semanas?|meses|anos?|km|kg|g\b|ml|l\b|%)"
+)
+
+# Palavras que não fazem parte da descrição
+STOPWORDS = {
+    "no", "na", "nos", "nas", "em", "de", "do", "da", "com", "pelo", "pela",
+    "o", "a", "os", "as", "um", "uma", "r", "reais", "real", "vezes", "x",
+    "parcelas", "parcelado", "parcelada", "hoje", "ontem", "anteontem",
+    "amanha", "dia", "via", "por", "cartao", "pra", "para", "e", "ou", "que",
+} | INCOME_CUES | EXPENSE_CUES
+
+INSTALLMENTS_RE = re.compile(
+    r"\b(?:em\s+)?(\d{1,2})\s*(?:x\b|vezes\b|parcelas\b)", re.IGNORECASE
+)
+FULL_DATE_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?\b")
+DAY_RE = re.compile(r"\bdia\s+(\d{1,2})\b", re.IGNORECASE)
+AMOUNT_RE = re.compile(
+    r"(r\$\s*)?\b(\d{1,3}(?:\.\d{3})+|\d+)(?:[,.](\d{1,2}))?(\s*(?:mil|k)\b)?",
+    re.IGNORECASE,
+)
+WORD_RE = re.compile(r"[\wÀ-ÿ$]+")
+
+
+def strip_accents(text: str) -> str:
+    return "".join(
+        c for c in unicodedata.normalize("NFKD", text)
+        if not unicodedata.combining(c)
+    )
+
+
+class FinanceRuleParser:
+    """
+    Parser local (sem rede) para mensagens financeiras formulaicas em PT-BR,
+    como "paguei R$ 45,90 no pix mercado" ou "comprei tênis 600 em 3x no crédito".
+
+    Retorna None quando a confiança é baixa, para que o chamador use o LLM.
+    """
+
+    MIN_CONFIDENCE = 0.85
+
+    # usado quando o LLM está indisponível: melhor um palpite para o
+    # usuário confirmar do que nenhum
+    DEGRADED_CONFIDENCE = 0.6
+
+    def parse(
+        self,
+        text: str,
+        today: Optional[date] = None,
+        min_confidence: Optional[float] = None,
+    ) -> Optional[Dict]:
+        today = today or date.today()
+        min_confidence = self.MIN_CONFIDENCE if min_confidence is None else min_confidence
+        plain = strip_accents(text.lower())
+
+        if MEMORY_CUES & set(WORD_RE.findall(plain)):
+            return None
+
+        installments, plain = self._extract_installments(plain)
+        transaction_date, plain = self._extract_date(plain, today)
+        amount, plain = self._extract_amount(plain)
+
+        if amount is None or amount <= 0:
+            return None
+
+        words = WORD_RE.findall(plain)
+        payment_method = self._payment_method(words, installments)
+        transaction_type = "income" if INCOME_CUES & set(words) else "expense"
+        has_cue = (
+            bool((INCOME_CUES | EXPENSE_CUES) & set(words))
+            or "r$" in text.lower()
+            or payment_method is not None
+        )
+        category = self._category(words)
+        description = self._description(text, words) or category
+
+        confidence = 0.4
+        confidence += 0.2 if has_cue else 0.0
+        confidence += 0.2 if category else 0.0
+        confidence += 0.1 if payment_method else 0.0
+        confidence += 0.1 if description else 0.0
+
+        if confidence < min_confidence:
+            return None
+
+        return {
+            "module": "finance",
+            "description": description,
+            "amount": amount,
+            "transaction_type": transaction_type,
+            "category": category,
+            "payment_method": payment_method,
+            "account": None,
+            "installments_total": installments,
+            "transaction_date": transaction_date.isoformat(),
+            "needs_review": False,
+        }
+
+    # =====================
+    # INTERNAL
+    # =====================
+
+    @staticmethod
+    def _extract_installments(plain: str) -> tuple[Optional[int], str]:
+        match = INSTALLMENTS_RE.search(plain)
+        if not match:
+            return None, plain
+
+        installments = int(match.group(1))
+        plain = plain[:match.start()] + " " + plain[match.end():]
+
+        return (installments if installments > 1 else None), plain
+
+    @staticmethod
+    def _extract_date(plain: str, today: date) -> tuple[date, str]:
+        match = FULL_DATE_RE.search(plain)
+        if match:
+            day, month, year = match.groups()
+            year = int(year) if year else today.year
+            if year < 100:
+                year += 2000
+            try:
+                found = date(year, int(month), int(day))
+                return found, plain[:match.start()] + " " + plain[match.end():]
+            except ValueError:
+                pass
+
+        match = DAY_RE.search(plain)
+        if match:
+            try:
+                found = today.replace(day=int(match.group(1)))
+                return found, plain[:match.start()] + " " + plain[match.end():]
+            except ValueError:
+                pass
+
+        words = set(WORD_RE.findall(plain))
+        if "anteontem" in words:
+            return today - timedelta(days=2), plain
+        if "ontem" in words:
+            return today - timedelta(days=1), plain
+        if "amanha" in words:
+            return today + timedelta(days=1), plain
+
+        return today, plain
+
+    @staticmethod
+    def _extract_amount(plain: str) -> tuple[Optional[float], str]:
+        candidates = [
+            m for m in AMOUNT_RE.finditer(plain)
+            if m.group(2) and not NON_MONEY_UNITS.match(plain, m.end())
+        ]
+
+        if not candidates:
+            return None, plain
+
+        with_currency = [m for m in candidates if m.group(1)]
+        if with_currency:
+            match = with_currency[0]
+        elif len(candidates) == 1:
+            match = candidates[0]
+        else:
+            # vários números sem "R$": ambíguo demais para a regra local
+            return None, plain
+
+        integer = match.group(2).replace(".", "")
+        cents = (match.group(3) or "0").ljust(2, "0")
+        amount = float(f"{integer}.{cents}")
+
+        if match.group(4):
+            amount *= 1000
+
+        return round(amount, 2), plain[:match.start()] + " " + plain[match.end():]
+
+    @staticmethod
+    def _payment_method(words: List[str], installments: Optional[int]) -> Optional[str]:
+        for word in words:
+            if word in PAYMENT_METHOD_MAP and word not in {"salario"}:
+                return PAYMENT_METHOD_MAP[word]
+
+        # parcelamento sem forma explícita é quase sempre no crédito
+        return "credit" if installments else None
+
+    @staticmethod
+    def _category(words: List[str]) -> Optional[str]:
+        for category, keywords in CATEGORY_KEYWORDS.items():
+            if any(word in keywords for word in words):
+                return category
+        return None
+
+    @staticmethod
+    def _description(text: str, words: List[str]) -> str:
+        # mantém acentos do texto original para as palavras que sobraram
+        original = {strip_accents(w.lower()): w for w in WORD_RE.findall(text)}
+
+        kept = [
+            original.get(word, word)
+            for word in words
+            if word not in STOPWORDS
+            and word not in PAYMENT_METHOD_MAP
+            and not word.isdigit()
+            and word != "$"
+        ]
+
+        description = " ".join(kept).strip()
+        return description[:1].upper() + description[1:]
@@ -0,0 +1,386 @@
+"""
+Classificador local de intenção (memory x finance).
+
+Regressão logística sobre um bag-of-words com hashing (unigramas + bigramas),
+treinada a partir do histórico das tabelas memory_notes e transactions.
+Classifica em microssegundos; perto da fronteira de decisão o chamador
+deve escalar para o LLM.
+
+As transações só guardam a descrição, então o treino usa mensagens geradas
+por templates a partir delas. A avaliação usa só texto real: as mensagens
+que o usuário confirmou no bot (tabela intent_samples).
+
+Uso:
+    python -m app.ai.intent_classifier train     # relatório + salva o modelo
+    python -m app.ai.intent_classifier report    # só o relatório (80/20)
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.ai.finance_rules import strip_accents
+
+MODEL_PATH = Path(os.getenv("INTENT_MODEL_PATH", "data/intent_model.json"))
+
+# p(finance) precisa estar a pelo menos MARGIN de 0.5 para dispensar o LLM
+MARGIN = float(os.getenv("INTENT_CLASSIFIER_MARGIN", "0.35"))
+
+# O roteamento local só dispensa o LLM se, no texto real separado para
+# teste, o modelo acertou pelo menos isso quando estava confiante
+MIN_CONFIDENT_ACCURACY = float(os.getenv("INTENT_CLASSIFIER_MIN_ACCURACY", "0.97"))
+MIN_EVAL_SAMPLES = int(os.getenv("INTENT_CLASSIFIER_MIN_EVAL_SAMPLES", "50"))
+
+N_FEATURES = 2 ** 18
+
+_TOKEN_RE = re.compile(r"r\$|\d+|[a-z]+")
+
+Sample = Tuple[str, str]  # (texto, "memory" | "finance")
+
+# Mensagens geradas a partir da mesma linha de origem, e se são texto real
+# escrito pelo usuário (True) ou renderizado por template (False)
+Source = Tuple[List[Sample], bool]
+
+# Mensagens confirmadas no bot, com a intenção escolhida pelo usuário
+SAMPLES_TABLE = "intent_samples"
+
+
+def _features(text: str) -> List[int]:
+    tokens = _TOKEN_RE.findall(strip_accents(text.lower()))
+    # números viram um token genérico: o valor em si não indica a intenção
+    tokens = ["<num>" if t.isdigit() else t for t in tokens]
+
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    return [zlib.crc32(g.encode()) % N_FEATURES for g in grams]
+
+
+class HashedIntentClassifier:
+    def __init__(
+        self,
+        weights: Optional[Dict[int, float]] = None,
+        bias: float = 0.0,
+        report: Optional[Dict] = None,
+    ):
+        self.weights = weights or {}
+        self.bias = bias
+        # avaliação em texto real feita no 'train' (None: não houve)
+        self.report = report
+
+    # =====================
+    # INFERENCE
+    # =====================
+
+    def finance_probability(self, text: str) -> float:
+        score = self.bias + sum(self.weights.get(f, 0.0) for f in _features(text))
+        return 1.0 / (1.0 + math.exp(-max(min(score, 30.0), -30.0)))
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        """
+        Retorna (intenção, confiança em [0.5, 1]).
+        """
+        p = self.finance_probability(text)
+        return ("finance", p) if p >= 0.5 else ("memory", 1.0 - p)
+
+    def classify_confident(self, text: str, margin: float = MARGIN) -> Optional[str]:
+        """
+        Retorna a intenção apenas quando longe da fronteira de decisão.
+        """
+        p = self.finance_probability(text)
+
+        if abs(p - 0.5) < margin:
+            return None
+
+        return "finance" if p >= 0.5 else "memory"
+
+    def trusted(self) -> bool:
+        """
+        Se o modelo foi validado em mensagens reais o bastante para decidir
+        sem o LLM. Treinado só com templates, não é.
+        """
+        return (
+            self.report is not None
+            and self.report["samples"] >= MIN_EVAL_SAMPLES
+            and self.report["confident_accuracy"] >= MIN_CONFIDENT_ACCURACY
+        )
+
+    # =====================
+    # TRAINING
+    # =====================
+
+    @classmethod
+    def train(
+        cls,
+        samples: List[Sample],
+        epochs: int = 8,
+        learning_rate: float = 0.3,
+        l2: float = 1e-5,
+        seed: int = 42,
+    ) -> "HashedIntentClassifier":
+        model = cls()
+        rng = random.Random(seed)
+        encoded = [(_features(text), 1.0 if label == "finance" else 0.0) for text, label in samples]
+
+        for epoch in range(epochs):
+            rng.shuffle(encoded)
+            lr = learning_rate / (1 + epoch)
+
+            for features, target in encoded:
+                score = model.bias + sum(model.weights.get(f, 0.0) for f in features)
+                error = 1.0 / (1.0 + math.exp(-max(min(score, 30.0), -30.0))) - target
+
+                for f in features:
+                    w = model.weights.get(f, 0.0)
+                    model.weights[f] = w - lr * (error + l2 * w)
+
+                model.bias -= lr * error
+
+        model.weights = {f: w for f, w in model.weights.items() if abs(w) > 1e-6}
+        return model
+
+    # =====================
+    # PERSISTENCE
+    # =====================
+
+    def save(self, path: Path = MODEL_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "n_features": N_FEATURES,
+            "bias": self.bias,
+            "weights": {str(f): round(w, 6) for f, w in self.weights.items()},
+            "report": self.report,
+        }))
+
+    @classmethod
+    def load(cls, path: Path = MODEL_PATH) -> Optional["HashedIntentClassifier"]:
+        if not path.exists():
+            return None
+
+        data = json.loads(path.read_text())
+
+        if data.get("n_features") != N_FEATURES:
+            return None
+
+        return cls(
+            weights={int(f): w for f, w in data["weights"].items()},
+            bias=data["bias"],
+            report=data.get("report"),
+        )
+
+
+_CLASSIFIER: HashedIntentClassifier | None = None
+_LOADED = False
+
+
+def get_intent_classifier() -> Optional[HashedIntentClassifier]:
+    """
+    Returns the trained classifier, or None if no model was trained yet.
+    """
+    global _CLASSIFIER, _LOADED
+
+    if not _LOADED:
+        _CLASSIFIER = HashedIntentClassifier.load()
+        _LOADED = True
+
+    return _CLASSIFIER
+
+
+# =====================
+# TRAINING DATA
+# =====================
+
+_FINANCE_TEMPLATES = [
+    "{description} {amount}",
+    "paguei {amount} {description}",
+    "gastei R$ {amount} com {description}",
+    "comprei {description} por {amount}",
+    "{description} {amount} no pix",
+    "{description} R$ {amount} no crédito",
+]
+
+_INCOME_TEMPLATES = [
+    "recebi {amount} {description}",
+    "entrou {amount} de {description}",
+    "{description} {amount}",
+]
+
+
+def _transaction_messages(row: Dict, rng: random.Random) -> Iterable[str]:
+    """
+    As transações guardam só a descrição; geramos mensagens no formato
+    em que o usuário costuma escrevê-las.
+    """
+    description = (row.get("description") or "").strip()
+    if not description:
+        return []
+
+    amount = f"{abs(float(row.get('amount') or 0)):.2f}".replace(".", ",")
+    templates = (
+        _INCOME_TEMPLATES
+        if row.get("transaction_type") == "income"
+        else _FINANCE_TEMPLATES
+    )
+
+    return [t.format(description=description, amount=amount) for t in rng.sample(templates, 2)]
+
+
+def load_training_data(limit: int = 5000, seed: int = 42) -> List[Source]:
+    """
+    Uma entrada por linha de origem: o split é feito por linha, antes de
+    expandir uma transação em várias mensagens, para que mensagens irmãs
+    não caiam uma no treino e outra no teste.
+    """
+    from app.infra.supabase.client import get_supabase_client
+
+    supabase = get_supabase_client()
+    rng = random.Random(seed)
+
+    logged = (
+        supabase.table(SAMPLES_TABLE)
+        .select("text, intent")
+        .order("created_at", desc=True)
+        .limit(limit)
+        .execute()
+    ).data or []
+
+    memories = (
+        supabase.table("memory_notes")
+        .select("content")
+        .order("created_at", desc=True)
+        .limit(limit)
+        .execute()
+    ).data or []
+
+    transactions = (
+        supabase.table("transactions")
+        .select("description, amount, transaction_type")
+        .order("transaction_date", desc=True)
+        .limit(limit)
+        .execute()
+    ).data or []
+
+    sources: List[Source] = [
+        ([(row["text"], row["intent"])], True) for row in logged if row.get("text")
+    ]
+    sources.extend(
+        ([(m["content"], "memory")], False) for m in memories if m.get("content")
+    )
+
+    for row in transactions:
+        messages = _transaction_messages(row, rng)
+        if messages:
+            sources.append(([(text, "finance") for text in messages], False))
+
+    return sources
+
+
+def record_labeled_message(text: Optional[str], intent: str) -> None:
+    """
+    Guarda a mensagem que o usuário confirmou, com a intenção escolhida:
+    é o texto real usado para avaliar o classificador. Best-effort e
+    bloqueante (roda no io_executor).
+    """
+    if not text:
+        return
+
+    from app.infra.supabase.client import get_supabase_client
+
+    try:
+        get_supabase_client().table(SAMPLES_TABLE).insert(
+            {"text": text, "intent": intent}
+        ).execute()
+    except Exception as e:
+        print(f"[WARN] Falha ao registrar mensagem rotulada: {e}")
+
+
+def evaluate(model: HashedIntentClassifier, samples: List[Sample], margin: float = MARGIN) -> Dict:
+    correct = 0
+    confident = 0
+    confident_correct = 0
+    latencies = []
+
+    for text, label in samples:
+        started = time.perf_counter()
+        intent, _ = model.classify(text)
+        latencies.append(time.perf_counter() - started)
+
+        correct += intent == label
+
+        decided = model.classify_confident(text, margin)
+        if decided:
+            confident += 1
+            confident_correct += decided == label
+
+    latencies.sort()
+    total = len(samples) or 1
+
+    return {
+        "samples": len(samples),
+        "accuracy": correct / total,
+        "coverage": confident / total,
+        "confident_accuracy": confident_correct / (confident or 1),
+        "p50_us": latencies[len(latencies) // 2] * 1e6 if latencies else 0.0,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6 if latencies else 0.0,
+    }
+
+
+def _split(sources: List[Source], seed: int = 42) -> Tuple[List[Sample], List[Sample]]:
+    """
+    80/20 por linha de origem. O teste fica só com texto real; mensagens
+    de template só servem para treinar.
+    """
+    shuffled = sources[:]
+    random.Random(seed).shuffle(shuffled)
+    cut = int(len(shuffled) * 0.8)
+
+    train_set = [sample for samples, _ in shuffled[:cut] for sample in samples]
+    test_set = [sample for samples, real in shuffled[cut:] if real for sample in samples]
+
+    return train_set, test_set
+
+
+def _print_report(report: Dict) -> None:
+    print(f"Amostras de teste:        {report['samples']}")
+    print(f"Acurácia:                 {report['accuracy']:.1%}")
+    print(f"Cobertura (sem LLM):      {report['coverage']:.1%}")
+    print(f"Acurácia quando confiante: {report['confident_accuracy']:.1%}")
+    print(f"Latência p50 / p99:       {report['p50_us']:.1f} µs / {report['p99_us']:.1f} µs")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Classificador local de intenção")
+    parser.add_argument("command", choices=["train", "report"])
+    parser.add_argument("--limit", type=int, default=5000)
+    args = parser.parse_args()
+
+    sources = load_training_data(limit=args.limit)
+    train_set, test_set = _split(sources)
+
+    # o relatório sempre vem de um modelo que não viu o test_set: o salvo
+    # por 'train' usa todo o histórico e não serve para medir acurácia
+    report = None
+    if test_set:
+        report = evaluate(HashedIntentClassifier.train(train_set), test_set)
+        _print_report(report)
+    else:
+        print(f"Sem mensagens reais em {SAMPLES_TABLE} para avaliar; confirme mensagens no bot.")
+
+    if args.command == "train":
+        model = HashedIntentClassifier.train([s for samples, _ in sources for s in samples])
+        model.report = report
+        model.save()
+        print(f"Modelo salvo em {MODEL_PATH}")
+
+        if not model.trusted():
+            print("Avaliação em texto real insuficiente: o roteamento continua pelo LLM.")
+
+
+if __name__ == "__main__":
+    main()
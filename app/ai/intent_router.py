@@ -1,20 +1,26 @@
-from typing import Literal
-from openai import OpenAI
-from dotenv import load_dotenv
-import os
+import time
+from typing import Literal, Optional
 
-load_dotenv()
+from app.ai.cache import parse_cache
+from app.ai.intent_classifier import get_intent_classifier
+from app.ai.metrics import intent_stats, token_usage
+from app.ai.resilience import openai_guard
+from app.infra.openai.client import OpenAIClientMixin
 
 
 Intent = Literal["memory", "finance"]
 
 
-class IntentRouter:
+class IntentRouter(OpenAIClientMixin):
     """
     Decide qual módulo deve processar a mensagem do usuário.
+
+    Usa primeiro o classificador local; o LLM só é chamado quando
+    o classificador está perto da fronteira de decisão.
     """
 
     MODEL = "gpt-4o-mini"
+    TIMEOUT = 10.0
 
     SYSTEM_PROMPT = """
 Você é um classificador de intenções.
@@ -29,22 +35,101 @@ memory
 finance
 """
 
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY not set")
+    def route(self, text: str) -> Intent:
+        local = self.route_local(text)
+        if local:
+            return local
+
+        cache_key = parse_cache.make_key("intent", text)
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        try:
+            response = openai_guard.call(
+                self.client.chat.completions.create,
+                **self._request(text),
+            )
+        except Exception as e:
+            print("⚠️ IntentRouter fallback:", e)
+            return self._fallback(text)
+
+        intent_stats.record("llm", time.perf_counter() - started)
+
+        intent = self._handle_response(response)
+        parse_cache.set(cache_key, intent)
+
+        return intent
+
+    async def route_async(self, text: str) -> Intent:
+        local = self.route_local(text)
+        if local:
+            return local
+
+        cache_key = parse_cache.make_key("intent", text)
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        started = time.perf_counter()
+        try:
+            response = await openai_guard.acall(
+                self.async_client.chat.completions.create,
+                **self._request(text),
+            )
+        except Exception as e:
+            print("⚠️ IntentRouter fallback:", e)
+            return self._fallback(text)
+
+        intent_stats.record("llm", time.perf_counter() - started)
+
+        intent = self._handle_response(response)
+        parse_cache.set(cache_key, intent)
+
+        return intent
+
+    def route_local(self, text: str) -> Optional[Intent]:
+        """
+        Classificação local; None quando não há modelo treinado e validado
+        em texto real, ou quando a mensagem está perto da fronteira de decisão.
+        """
+        classifier = get_intent_classifier()
+        if classifier is None or not classifier.trusted():
+            return None
+
+        started = time.perf_counter()
+        intent = classifier.classify_confident(text)
+
+        intent_stats.record("local" if intent else "escalated", time.perf_counter() - started)
+
+        return intent
+
+    @staticmethod
+    def _fallback(text: str) -> Intent:
+        """
+        Sem LLM: melhor palpite do classificador local, ou memória.
+        """
+        classifier = get_intent_classifier()
+        if classifier is None:
+            return "memory"
 
-        self.client = OpenAI(api_key=api_key)
+        intent, _ = classifier.classify(text)
+        return intent
 
-    def route(self, text: str) -> Intent:
-        response = self.client.chat.completions.create(
-            model=self.MODEL,
-            messages=[
+    def _request(self, text: str) -> dict:
+        return {
+            "model": self.MODEL,
+            "messages": [
                 {"role": "system", "content": self.SYSTEM_PROMPT},
                 {"role": "user", "content": text},
             ],
-            temperature=0
-        )
+            "temperature": 0,
+            "timeout": self.TIMEOUT,
+        }
+
+    def _handle_response(self, response) -> Intent:
+        token_usage.record("intent", response.usage)
 
         intent = response.choices[0].message.content.strip().lower()
 
@@ -52,4 +137,4 @@ finance
             # fallback seguro
             return "memory"
 
-        return intent
\ No newline at end of file
+        return intent
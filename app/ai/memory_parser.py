@@ -1,31 +1,33 @@
 import json
-from typing import Dict
+from typing import AsyncIterator, Dict
 from datetime import datetime
-from openai import OpenAI, RateLimitError
-from dotenv import load_dotenv
-import os
 
-load_dotenv()
+from app.ai.cache import parse_cache
+from app.ai.metrics import token_usage
+from app.ai.partial_json import parse_partial_object
+from app.ai.prompts import PromptBuilder
+from app.ai.resilience import openai_guard
+from app.infra.openai.client import OpenAIClientMixin
 
 
-class MemoryParser:
+class MemoryParser(OpenAIClientMixin):
     """
     Parses free text messages (PT-BR) into structured memory data.
     """
 
     MODEL = "gpt-4o-mini"
+    TIMEOUT = 15.0
 
-    SYSTEM_PROMPT = f"""
-Hoje é {datetime.now().strftime('%Y-%m-%d')}.
+    SYSTEM_PROMPT = """
 Você é um parser de texto. Sua única função é transformar mensagens em português
 em um JSON ESTRITO seguindo exatamente este formato:
 
-{{
+{
   "memory_type": "note | idea | reflection | reminder",
   "content": "string em português, sem emojis",
   "tags": ["lista", "de", "tags", "em", "português"],
   "datetime": "ISO-8601 ou null"
-}}
+}
 
 Regras IMPORTANTES:
 - Responda APENAS com JSON válido
@@ -38,40 +40,130 @@ Regras IMPORTANTES:
 - Se não houver tags claras, gere de 1 a 3 tags simples
 """
 
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY is not set")
-
-        self.client = OpenAI(api_key=api_key)
+    PROMPT = PromptBuilder("memory", SYSTEM_PROMPT)
 
     def parse(self, text: str) -> Dict:
         """
         Parses user input into structured memory data.
         """
 
+        cache_key = parse_cache.make_key("memory", text)
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            response = self.client.chat.completions.create(
-                model=self.MODEL,
-                messages=[
-                    {"role": "system", "content": self.SYSTEM_PROMPT},
-                    {"role": "user", "content": text}
-                ],
-                temperature=0.1
+            response = openai_guard.call(
+                self.client.chat.completions.create,
+                **self._request(text),
             )
+            parsed = self._handle_response(response)
+            parse_cache.set(cache_key, parsed)
 
-            raw_content = response.choices[0].message.content.strip()
-            parsed = json.loads(raw_content)
+            return parsed
 
-            self._validate(parsed)
-            parsed["datetime"] = self._normalize_datetime(parsed.get("datetime"))
+        except (json.JSONDecodeError, Exception):
+            return self._fallback(text)
+
+    async def parse_async(self, text: str) -> Dict:
+        """
+        Non-blocking variant of parse, meant for the bot handlers.
+        """
+
+        cache_key = parse_cache.make_key("memory", text)
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await openai_guard.acall(
+                self.async_client.chat.completions.create,
+                **self._request(text),
+            )
+            parsed = self._handle_response(response)
+            parse_cache.set(cache_key, parsed)
 
             return parsed
 
-        except (RateLimitError, json.JSONDecodeError, Exception):
+        except (json.JSONDecodeError, Exception):
             return self._fallback(text)
 
+    async def stream_async(self, text: str) -> AsyncIterator[Dict]:
+        """
+        Streaming variant of parse_async. Yields partial dicts as JSON
+        fields complete; the last item is always the final validated result.
+        """
+
+        cache_key = parse_cache.make_key("memory", text)
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        try:
+            stream = await openai_guard.acall(
+                self.async_client.chat.completions.create,
+                **self._request(text),
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+
+            buffer = ""
+            last_partial = None
+
+            async for chunk in stream:
+                if chunk.usage:
+                    token_usage.record("memory", chunk.usage)
+
+                if not chunk.choices:
+                    continue
+
+                buffer += chunk.choices[0].delta.content or ""
+                partial = parse_partial_object(buffer)
+
+                if partial and partial != last_partial:
+                    last_partial = partial
+                    yield dict(partial)
+
+            parsed = self._handle_content(buffer)
+            parse_cache.set(cache_key, parsed)
+
+        except (json.JSONDecodeError, Exception):
+            parsed = self._fallback(text)
+
+        yield parsed
+
+    def _request(self, text: str) -> Dict:
+        """
+        Builds the chat completion arguments shared by sync and async calls.
+        """
+        return {
+            "model": self.MODEL,
+            "messages": self.PROMPT.messages(text),
+            "prompt_cache_key": self.PROMPT.cache_key,
+            "temperature": 0.1,
+            "timeout": self.TIMEOUT,
+        }
+
+    def _handle_response(self, response) -> Dict:
+        """
+        Extracts, validates and normalizes the AI output.
+        """
+        token_usage.record("memory", response.usage)
+
+        return self._handle_content(response.choices[0].message.content)
+
+    def _handle_content(self, raw_content: str) -> Dict:
+        """
+        Validates and normalizes the raw JSON text returned by the AI.
+        """
+        parsed = json.loads(raw_content.strip())
+
+        self._validate(parsed)
+        parsed["datetime"] = self._normalize_datetime(parsed.get("datetime"))
+
+        return parsed
+
     def _normalize_datetime(self, value) -> str | None:
         """
         Normalizes datetime to ISO-8601 full format or None.
@@ -0,0 +1,400 @@
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Dict, List
+
+from app.ai.cache import parse_cache
+from app.ai.finance_parser import FinanceParser
+from app.ai.intent_router import IntentRouter
+from app.ai.memory_parser import MemoryParser
+from app.ai.metrics import finance_parse_stats, token_usage
+from app.ai.partial_json import parse_partial_member, parse_partial_object
+from app.ai.prompts import PromptBuilder
+from app.ai.resilience import openai_guard
+from app.infra.openai.client import OpenAIClientMixin
+
+
+class MessageExtractor(OpenAIClientMixin):
+    """
+    Classifica a mensagem e extrai o payload do módulo correspondente
+    em UMA única chamada ao modelo (roteamento + parsing).
+
+    A validação reaproveita as regras de FinanceParser e MemoryParser.
+    """
+
+    MODEL = "gpt-4o-mini"
+    TIMEOUT = 15.0
+
+    SYSTEM_PROMPT = """
+Você é o parser de um assistente pessoal (segundo cérebro).
+
+Primeiro classifique a mensagem em UMA intenção:
+- memory → anotações, ideias, reflexões, lembretes
+- finance → gastos, pagamentos, salários, compras, dinheiro
+
+Depois preencha APENAS o objeto da intenção escolhida e use null no outro.
+
+Regras para "finance":
+- amount deve ser o valor TOTAL da transação
+- transaction_type: income ou expense
+- payment_method: credit, debit, pix, cash, transfer ou null
+- Se não houver parcelamento, use null em installments_total
+- Se não houver conta/cartão claro, use null em account
+- Se não houver data explícita, use a data de hoje (YYYY-MM-DD)
+
+Regras para "memory":
+- memory_type SEMPRE em inglês: note, idea, reflection ou reminder
+- content e tags SEMPRE em português, sem emojis
+- Nunca traduza o conteúdo
+- datetime DEVE ser null se não houver data (ISO-8601)
+- Se houver data SEM hora, assuma 09:00
+- Se não houver tags claras, gere de 1 a 3 tags simples
+"""
+
+    PROMPT = PromptBuilder("extract", SYSTEM_PROMPT)
+
+    ITEM_SCHEMA = {
+        "type": "object",
+        "additionalProperties": False,
+        "required": ["intent", "finance", "memory"],
+        "properties": {
+            "intent": {"type": "string", "enum": ["memory", "finance"]},
+            "finance": {
+                "anyOf": [
+                    {
+                        "type": "object",
+                        "additionalProperties": False,
+                        "required": [
+                            "description",
+                            "amount",
+                            "transaction_type",
+                            "category",
+                            "payment_method",
+                            "account",
+                            "installments_total",
+                            "transaction_date",
+                        ],
+                        "properties": {
+                            "description": {"type": "string"},
+                            "amount": {"type": ["number", "null"]},
+                            "transaction_type": {
+                                "type": "string",
+                                "enum": ["income", "expense"],
+                            },
+                            "category": {"type": "string"},
+                            "payment_method": {"type": ["string", "null"]},
+                            "account": {"type": ["string", "null"]},
+                            "installments_total": {"type": ["integer", "null"]},
+                            "transaction_date": {"type": "string"},
+                        },
+                    },
+                    {"type": "null"},
+                ]
+            },
+            "memory": {
+                "anyOf": [
+                    {
+                        "type": "object",
+                        "additionalProperties": False,
+                        "required": ["memory_type", "content", "tags", "datetime"],
+                        "properties": {
+                            "memory_type": {
+                                "type": "string",
+                                "enum": ["note", "idea", "reflection", "reminder"],
+                            },
+                            "content": {"type": "string"},
+                            "tags": {"type": "array", "items": {"type": "string"}},
+                            "datetime": {"type": ["string", "null"]},
+                        },
+                    },
+                    {"type": "null"},
+                ]
+            },
+        },
+    }
+
+    RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "message_extraction",
+            "strict": True,
+            "schema": ITEM_SCHEMA,
+        },
+    }
+
+    BATCH_PROMPT = PromptBuilder("extract_many", SYSTEM_PROMPT + """
+Você receberá VÁRIAS mensagens em uma lista JSON.
+Retorne em "items" exatamente um objeto por mensagem, na mesma ordem.
+""")
+
+    BATCH_RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "message_batch_extraction",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["items"],
+                "properties": {
+                    "items": {"type": "array", "items": ITEM_SCHEMA},
+                },
+            },
+        },
+    }
+
+    def __init__(self):
+        self.finance_parser = FinanceParser()
+        self.memory_parser = MemoryParser()
+
+    def extract(self, text: str) -> Dict:
+        """
+        Retorna {"intent": "finance" | "memory", "data": payload validado}.
+        """
+        local = self.extract_local(text)
+        if local:
+            return local
+
+        started = time.perf_counter()
+        extracted = None
+        try:
+            response = openai_guard.call(
+                self.client.chat.completions.create,
+                **self._request(text),
+            )
+            extracted = self._handle_response(response, text)
+            parse_cache.set(parse_cache.make_key("extract", text), extracted)
+
+            return extracted
+
+        except Exception as e:
+            print("⚠️ MessageExtractor fallback:", e)
+            extracted = self._fallback(text)
+            return extracted
+
+        finally:
+            self._record_finance("llm", started, [extracted])
+
+    async def extract_async(self, text: str, local_checked: bool = False) -> Dict:
+        """
+        Versão não bloqueante de extract, para uso nos handlers do bot.
+
+        local_checked=True: o chamador já tentou extract_local sem sucesso;
+        não repete a regra nem a consulta ao cache (que contaria outro miss).
+        """
+        if not local_checked:
+            local = self.extract_local(text)
+            if local:
+                return local
+
+        started = time.perf_counter()
+        extracted = None
+        try:
+            response = await openai_guard.acall(
+                self.async_client.chat.completions.create,
+                **self._request(text),
+            )
+            extracted = self._handle_response(response, text)
+            parse_cache.set(parse_cache.make_key("extract", text), extracted)
+
+            return extracted
+
+        except Exception as e:
+            print("⚠️ MessageExtractor fallback:", e)
+            extracted = self._fallback(text)
+            return extracted
+
+        finally:
+            self._record_finance("llm", started, [extracted])
+
+    async def stream_async(self, text: str, local_checked: bool = False) -> AsyncIterator[Dict]:
+        """
+        Versão em streaming de extract_async: assim que a intenção chega,
+        produz {"intent", "data"} com o objeto parcial daquela intenção.
+        O último item produzido é sempre o resultado final validado.
+        """
+        if not local_checked:
+            local = self.extract_local(text)
+            if local:
+                yield local
+                return
+
+        started = time.perf_counter()
+        extracted = None
+        try:
+            stream = await openai_guard.acall(
+                self.async_client.chat.completions.create,
+                **self._request(text),
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+
+            buffer = ""
+            last_partial = None
+
+            async for chunk in stream:
+                if chunk.usage:
+                    token_usage.record("extract", chunk.usage)
+
+                if not chunk.choices:
+                    continue
+
+                buffer += chunk.choices[0].delta.content or ""
+
+                # "intent" é o primeiro campo do schema; o objeto da intenção vem depois
+                intent = (parse_partial_object(buffer) or {}).get("intent")
+                if intent not in ("finance", "memory"):
+                    continue
+
+                partial = parse_partial_member(buffer, intent)
+                if partial and partial != last_partial:
+                    last_partial = partial
+                    yield {"intent": intent, "data": dict(partial)}
+
+            extracted = self._build_result(json.loads(buffer.strip()), text)
+            parse_cache.set(parse_cache.make_key("extract", text), extracted)
+
+        except Exception as e:
+            print("⚠️ MessageExtractor fallback:", e)
+            extracted = self._fallback(text)
+
+        finally:
+            self._record_finance("llm", started, [extracted])
+
+        yield extracted
+
+    async def extract_many_async(self, texts: List[str], local_checked: bool = False) -> List[Dict]:
+        """
+        Interpreta várias mensagens em uma única chamada multi-item.
+        Retorna um resultado por mensagem, na mesma ordem.
+        """
+        results: List[Dict | None] = (
+            [None] * len(texts) if local_checked else [self.extract_local(text) for text in texts]
+        )
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        if len(missing) == 1:
+            results[missing[0]] = await self.extract_async(texts[missing[0]], local_checked=True)
+        elif missing:
+            pending = [texts[i] for i in missing]
+
+            for i, extracted in zip(missing, await self._extract_batch(pending)):
+                results[i] = extracted
+
+        return results
+
+    def extract_local(self, text: str) -> Dict | None:
+        """
+        Caminhos sem rede: regra financeira local e cache de respostas.
+        """
+        fast = self.finance_parser.parse_local(text)
+        if fast:
+            return {"intent": "finance", "data": fast}
+
+        return parse_cache.get(parse_cache.make_key("extract", text))
+
+    # =====================
+    # INTERNAL
+    # =====================
+
+    async def _extract_batch(self, texts: List[str]) -> List[Dict]:
+        started = time.perf_counter()
+        try:
+            response = await openai_guard.acall(
+                self.async_client.chat.completions.create,
+                model=self.MODEL,
+                messages=self.BATCH_PROMPT.messages(
+                    json.dumps(texts, ensure_ascii=False)
+                ),
+                prompt_cache_key=self.BATCH_PROMPT.cache_key,
+                temperature=0.1,
+                response_format=self.BATCH_RESPONSE_FORMAT,
+                timeout=self.TIMEOUT * 2,
+            )
+            token_usage.record("extract_many", response.usage)
+
+            items = json.loads(response.choices[0].message.content)["items"]
+
+            if len(items) != len(texts):
+                raise ValueError("Batch response size mismatch")
+
+        except Exception as e:
+            # cada mensagem é refeita sozinha e entra nas métricas por lá
+            print("⚠️ MessageExtractor batch fallback:", e)
+            return list(await asyncio.gather(
+                *(self.extract_async(t, local_checked=True) for t in texts)
+            ))
+
+        results = []
+        for text, item in zip(texts, items):
+            extracted = self._build_result(item, text)
+            parse_cache.set(parse_cache.make_key("extract", text), extracted)
+            results.append(extracted)
+
+        self._record_finance("llm_batch", started, results)
+        return results
+
+    @staticmethod
+    def _record_finance(path: str, started: float, results: List[Dict | None]) -> None:
+        # finance_parse_stats mede o parsing financeiro: chamadas que só
+        # extraíram memórias não entram
+        if any(r and r["intent"] == "finance" for r in results):
+            finance_parse_stats.record(path, time.perf_counter() - started)
+
+    def _request(self, text: str) -> Dict:
+        return {
+            "model": self.MODEL,
+            "messages": self.PROMPT.messages(text),
+            "prompt_cache_key": self.PROMPT.cache_key,
+            "temperature": 0.1,
+            "response_format": self.RESPONSE_FORMAT,
+            "timeout": self.TIMEOUT,
+        }
+
+    def _handle_response(self, response, text: str) -> Dict:
+        token_usage.record("extract", response.usage)
+
+        raw = response.choices[0].message.content.strip()
+
+        return self._build_result(json.loads(raw), text)
+
+    def _build_result(self, extracted: Dict, text: str) -> Dict:
+        if extracted.get("intent") == "finance":
+            return {
+                "intent": "finance",
+                "data": self._finance_payload(extracted.get("finance"), text),
+            }
+
+        return {
+            "intent": "memory",
+            "data": self._memory_payload(extracted.get("memory"), text),
+        }
+
+    def _finance_payload(self, data: Dict | None, text: str) -> Dict:
+        if not isinstance(data, dict):
+            return self.finance_parser._fallback(text)
+
+        data["module"] = "finance"
+        return self.finance_parser._normalize(data)
+
+    def _memory_payload(self, data: Dict | None, text: str) -> Dict:
+        try:
+            self.memory_parser._validate(data)
+        except Exception:
+            return self.memory_parser._fallback(text)
+
+        data["datetime"] = self.memory_parser._normalize_datetime(data.get("datetime"))
+        return data
+
+    def _fallback(self, text: str) -> Dict:
+        # sem LLM: regra financeira relaxada, depois o palpite do IntentRouter;
+        # na dúvida vira memória
+        finance = self.finance_parser._fallback(text)
+
+        if not finance.get("needs_review") or IntentRouter._fallback(text) == "finance":
+            return {"intent": "finance", "data": finance}
+
+        return {
+            "intent": "memory",
+            "data": self.memory_parser._fallback(text),
+        }
@@ -0,0 +1,88 @@
+import threading
+from collections import Counter, deque
+from typing import Dict
+
+
+class LatencyStats:
+    """
+    Contadores e latências (janela deslizante) por caminho de execução,
+    ex.: "rules" (parser local) e "llm" (chamada à OpenAI).
+    """
+
+    def __init__(self, window: int = 1000):
+        self._window = window
+        self._samples: Dict[str, deque] = {}
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, path: str, seconds: float) -> None:
+        with self._lock:
+            self._counts[path] += 1
+            self._samples.setdefault(path, deque(maxlen=self._window)).append(seconds)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Retorna {caminho: {"count", "p50_ms", "p99_ms"}}.
+        """
+        with self._lock:
+            return {
+                path: {
+                    "count": self._counts[path],
+                    "p50_ms": self._percentile(samples, 50) * 1000,
+                    "p99_ms": self._percentile(samples, 99) * 1000,
+                }
+                for path, samples in self._samples.items()
+            }
+
+    def hit_rate(self, path: str) -> float:
+        with self._lock:
+            total = sum(self._counts.values())
+            return self._counts[path] / total if total else 0.0
+
+    @staticmethod
+    def _percentile(samples, pct: int) -> float:
+        ordered = sorted(samples)
+        if not ordered:
+            return 0.0
+
+        index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+        return ordered[index]
+
+
+class TokenUsage:
+    """
+    Acumula o uso de tokens (prompt, cache de prompt e completion)
+    informado em cada resposta da OpenAI, por parser.
+    """
+
+    def __init__(self):
+        self._totals: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, usage) -> None:
+        if usage is None:
+            return
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", 0) or 0
+
+        with self._lock:
+            totals = self._totals.setdefault(name, Counter())
+            totals["calls"] += 1
+            totals["prompt_tokens"] += usage.prompt_tokens or 0
+            totals["cached_tokens"] += cached
+            totals["completion_tokens"] += usage.completion_tokens or 0
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(totals) for name, totals in self._totals.items()}
+
+
+# Estatísticas do fast path financeiro (regras locais x LLM)
+finance_parse_stats = LatencyStats()
+
+# Estatísticas do roteamento de intenção (classificador local x LLM)
+intent_stats = LatencyStats()
+
+# Uso de tokens de todas as chamadas à OpenAI
+token_usage = TokenUsage()
@@ -0,0 +1,104 @@
+import json
+from typing import Dict, Optional
+
+
+def parse_partial_object(buffer: str) -> Optional[Dict]:
+    """
+    Interpreta o prefixo de um objeto JSON ainda em streaming.
+
+    Retorna apenas os campos de primeiro nível já completos (seguidos de
+    vírgula, ou o objeto inteiro se já foi fechado). Valores aninhados
+    (listas, objetos) só aparecem quando terminam.
+    """
+    start = buffer.find("{")
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    last_complete = None
+
+    for i in range(start, len(buffer)):
+        ch = buffer[i]
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return _loads(buffer[start:i + 1])
+        elif ch == "," and depth == 1:
+            last_complete = i
+
+    if last_complete is None:
+        return {}
+
+    return _loads(buffer[start:last_complete] + "}")
+
+
+def _loads(raw: str) -> Optional[Dict]:
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError:
+        return None
+
+    return value if isinstance(value, dict) else None
+
+
+def parse_partial_member(buffer: str, key: str) -> Optional[Dict]:
+    """
+    Interpreta o prefixo do objeto aninhado em `key` (campo de primeiro
+    nível), com as mesmas regras de parse_partial_object.
+
+    Retorna None enquanto a chave não chegou ou se o valor não é um objeto
+    (ex.: null).
+    """
+    start = buffer.find("{")
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    string_start = None
+
+    for i in range(start, len(buffer)):
+        ch = buffer[i]
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+                if depth == 1 and buffer[string_start + 1:i] == key:
+                    rest = buffer[i + 1:].lstrip()
+                    if rest.startswith(":"):
+                        value = rest[1:].lstrip()
+                        return parse_partial_object(value) if value.startswith("{") else None
+            continue
+
+        if ch == '"':
+            in_string = True
+            string_start = i
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return None
+
+    return None
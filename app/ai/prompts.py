@@ -0,0 +1,55 @@
+from datetime import date
+from typing import Dict, List, Mapping, Optional
+
+WEEKDAYS = [
+    "segunda-feira", "terça-feira", "quarta-feira", "quinta-feira",
+    "sexta-feira", "sábado", "domingo",
+]
+
+
+class PromptBuilder:
+    """
+    Monta as mensagens de um parser com um prefixo estático byte a byte
+    (o system prompt, elegível ao cache de prompt do provedor) e um sufixo
+    pequeno com a data atual e o contexto do usuário.
+
+    Nada que muda entre chamadas pode entrar no prefixo: uma data embutida
+    no system prompt invalida o cache todo dia e fica velha em processos
+    de longa duração.
+    """
+
+    def __init__(self, name: str, system_prompt: str):
+        self.name = name
+        self.system_prompt = system_prompt.strip()
+
+    def messages(
+        self,
+        text: str,
+        *,
+        today: Optional[date] = None,
+        context: Optional[Mapping[str, str]] = None,
+    ) -> List[Dict]:
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "system", "content": self.suffix(today, context)},
+            {"role": "user", "content": text},
+        ]
+
+    @property
+    def cache_key(self) -> str:
+        # agrupa as chamadas do mesmo prompt no mesmo nó de cache do provedor
+        return f"second-brain:{self.name}"
+
+    @staticmethod
+    def suffix(
+        today: Optional[date] = None,
+        context: Optional[Mapping[str, str]] = None,
+    ) -> str:
+        today = today or date.today()
+
+        lines = [f"Hoje é {today.isoformat()} ({WEEKDAYS[today.weekday()]})."]
+
+        for key, value in (context or {}).items():
+            lines.append(f"{key}: {value}")
+
+        return "\n".join(lines)
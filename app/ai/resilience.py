@@ -0,0 +1,377 @@
+import asyncio
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Tuple
+
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+# Limites do nosso tier na OpenAI
+OPENAI_RPM = float(os.getenv("OPENAI_RPM", "500"))
+OPENAI_TPM = float(os.getenv("OPENAI_TPM", "200000"))
+
+# Espera máxima por capacidade antes de degradar para o fallback local
+MAX_QUEUE_WAIT = float(os.getenv("OPENAI_MAX_QUEUE_WAIT_SECONDS", "2"))
+
+RETRY_ATTEMPTS = int(os.getenv("OPENAI_RETRY_ATTEMPTS", "3"))
+BREAKER_FAILURES = int(os.getenv("OPENAI_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("OPENAI_BREAKER_RESET_SECONDS", "30"))
+
+
+@lru_cache(maxsize=None)
+def retryable_errors() -> Tuple[type, ...]:
+    """
+    Erros do lado do provedor: vale tentar de novo e contam para o circuit
+    breaker. Importa o SDK só na primeira chamada, não no import do bot.
+    """
+    from openai import (
+        APIConnectionError,
+        APITimeoutError,
+        InternalServerError,
+        RateLimitError,
+    )
+
+    return (
+        RateLimitError,
+        APITimeoutError,
+        APIConnectionError,
+        InternalServerError,
+    )
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    A OpenAI está falhando; a chamada nem foi feita.
+    """
+
+
+class LocalRateLimitError(RuntimeError):
+    """
+    O token bucket local não teria capacidade dentro da espera máxima.
+    """
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe. reserve() desconta a capacidade e diz quanto
+    tempo esperar; o chamador decide se dorme (sync) ou aguarda (async).
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, cost: float, max_wait: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            wait = max(0.0, (cost - self._tokens) / self.rate)
+            if wait > max_wait:
+                raise LocalRateLimitError("OpenAI client-side rate limit reached")
+
+            self._tokens -= cost
+            return wait
+
+    def refund(self, cost: float) -> None:
+        """
+        Devolve uma reserva que não vai ser usada.
+        """
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + cost)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            elapsed = time.monotonic() - self._updated
+            return min(self.capacity, self._tokens + elapsed * self.rate)
+
+
+class CircuitBreaker:
+    """
+    closed → open após N falhas seguidas; depois de reset_timeout deixa
+    passar uma chamada de teste (half-open) que fecha ou reabre o circuito.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+
+            if state == "closed":
+                return True
+
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+
+            if self._failures >= self.failure_threshold or self._opened_at:
+                self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+
+        return "open"
+
+
+def _estimate_tokens(kwargs: Dict[str, Any]) -> float:
+    # ~4 caracteres por token + folga para a resposta
+    chars = sum(len(str(m.get("content", ""))) for m in kwargs.get("messages", []))
+    return chars / 4 + 300
+
+
+class _StreamGuard:
+    """
+    Repassa os chunks de um stream da OpenAI e informa o resultado ao
+    circuit breaker uma única vez: sucesso ao terminar, falha/sucesso
+    conforme o erro, e libera a chamada de teste do half-open se o stream
+    for fechado, abandonado ou nunca iterado (close/aclose ou finalizador).
+    Um generator não serve: sem iniciar, fechá-lo não executa o corpo.
+    """
+
+    def __init__(self, stream, breaker: CircuitBreaker):
+        self._stream = stream
+        self._breaker = breaker
+        self._iterator = None
+        self._settled = False
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        if self._iterator is None:
+            self._iterator = iter(self._stream)
+
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            self._settle(self._breaker.record_success)
+            raise
+        except BaseException as e:
+            self._settle(lambda: self._record_error(e))
+            raise
+
+    def __aiter__(self) -> AsyncIterator:
+        return self
+
+    async def __anext__(self):
+        if self._iterator is None:
+            self._iterator = self._stream.__aiter__()
+
+        try:
+            return await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self._settle(self._breaker.record_success)
+            raise
+        except BaseException as e:
+            self._settle(lambda: self._record_error(e))
+            raise
+
+    def close(self) -> None:
+        self._settle(self._breaker.release_trial)
+
+        close = getattr(self._stream, "close", None)
+        if close:
+            close()
+
+    async def aclose(self) -> None:
+        self._settle(self._breaker.release_trial)
+
+        close = getattr(self._stream, "aclose", None) or getattr(self._stream, "close", None)
+        if close:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+
+    def __getattr__(self, name: str) -> Any:
+        # atributos do stream original (ex.: response)
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._stream, name)
+
+    def __del__(self):
+        if not getattr(self, "_settled", True):
+            self._breaker.release_trial()
+
+    def _settle(self, outcome: Callable[[], None]) -> None:
+        if not self._settled:
+            self._settled = True
+            outcome()
+
+    def _record_error(self, error: BaseException) -> None:
+        if isinstance(error, retryable_errors()):
+            self._breaker.record_failure()
+        elif isinstance(error, Exception):
+            # o provedor respondeu (ex.: 400): não é indisponibilidade
+            self._breaker.record_success()
+        else:
+            # consumidor cancelado no meio do stream
+            self._breaker.release_trial()
+
+
+class ResilientCaller:
+    """
+    Envolve as chamadas à OpenAI com rate limiting no cliente (RPM e TPM),
+    retries limitados com backoff exponencial e jitter, e circuit breaker.
+
+    Quando o circuito está aberto ou não há capacidade a tempo, levanta
+    CircuitOpenError / LocalRateLimitError na hora, para o parser cair no
+    fallback local em vez de enfileirar requisições travadas.
+    """
+
+    def __init__(self):
+        self.requests = TokenBucket(OPENAI_RPM)
+        self.tokens = TokenBucket(OPENAI_TPM)
+        self.breaker = CircuitBreaker(BREAKER_FAILURES, BREAKER_RESET_SECONDS)
+
+    def call(self, fn: Callable, /, **kwargs) -> Any:
+        self._check_breaker()
+
+        try:
+            for attempt in Retrying(**self._retry_options()):
+                with attempt:
+                    time.sleep(self._reserve(kwargs))
+                    result = fn(**kwargs)
+
+        except retryable_errors():
+            self.breaker.record_failure()
+            raise
+
+        except LocalRateLimitError:
+            self.breaker.release_trial()
+            raise
+
+        except Exception:
+            # o provedor respondeu (ex.: 400): não é indisponibilidade
+            self.breaker.record_success()
+            raise
+
+        except BaseException:
+            # interrompido no meio da chamada: libera a chamada de teste do half-open
+            self.breaker.release_trial()
+            raise
+
+        if kwargs.get("stream"):
+            # com stream=True o resultado só se conhece ao consumir o stream
+            return _StreamGuard(result, self.breaker)
+
+        self.breaker.record_success()
+        return result
+
+    async def acall(self, fn: Callable, /, **kwargs) -> Any:
+        self._check_breaker()
+
+        try:
+            async for attempt in AsyncRetrying(**self._retry_options()):
+                with attempt:
+                    await asyncio.sleep(self._reserve(kwargs))
+                    result = await fn(**kwargs)
+
+        except retryable_errors():
+            self.breaker.record_failure()
+            raise
+
+        except LocalRateLimitError:
+            self.breaker.release_trial()
+            raise
+
+        except Exception:
+            # o provedor respondeu (ex.: 400): não é indisponibilidade
+            self.breaker.record_success()
+            raise
+
+        except BaseException:
+            # cancelado no meio da chamada: libera a chamada de teste do half-open
+            self.breaker.release_trial()
+            raise
+
+        if kwargs.get("stream"):
+            # com stream=True o resultado só se conhece ao consumir o stream
+            return _StreamGuard(result, self.breaker)
+
+        self.breaker.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "breaker": self.breaker.state,
+            "requests_available": int(self.requests.available),
+            "tokens_available": int(self.tokens.available),
+        }
+
+    # =====================
+    # INTERNAL
+    # =====================
+
+    def _check_breaker(self) -> None:
+        if not self.breaker.allow():
+            raise CircuitOpenError("OpenAI circuit breaker is open")
+
+    def _reserve(self, kwargs: Dict[str, Any]) -> float:
+        request_wait = self.requests.reserve(1, MAX_QUEUE_WAIT)
+
+        try:
+            token_wait = self.tokens.reserve(_estimate_tokens(kwargs), MAX_QUEUE_WAIT)
+        except LocalRateLimitError:
+            # a chamada não acontece: não pode gastar a vaga de requisição
+            self.requests.refund(1)
+            raise
+
+        return max(request_wait, token_wait)
+
+    @staticmethod
+    def _retry_options() -> Dict[str, Any]:
+        return {
+            "retry": retry_if_exception_type(retryable_errors()),
+            "wait": wait_random_exponential(multiplier=0.5, max=4),
+            "stop": stop_after_attempt(RETRY_ATTEMPTS),
+            "reraise": True,
+        }
+
+
+# Instância única compartilhada por todos os parsers
+openai_guard = ResilientCaller()
@@ -0,0 +1,158 @@
+import json
+import re
+from typing import Dict, Iterable, List, Optional
+
+from app.ai.cache import parse_cache
+from app.ai.finance_rules import CATEGORY_KEYWORDS, WORD_RE, strip_accents
+from app.ai.metrics import token_usage
+from app.ai.prompts import PromptBuilder
+from app.ai.resilience import openai_guard
+from app.infra.openai.client import OpenAIClientMixin
+
+DEFAULT_CATEGORY = "Outros"
+CATEGORIES = list(CATEGORY_KEYWORDS) + [DEFAULT_CATEGORY]
+
+# Termos comuns em extratos que não aparecem em mensagens do usuário
+STATEMENT_KEYWORDS = {
+    "Alimentação": ["supermerc", "mercad", "restaur", "lanchon", "panific", "atacad"],
+    "Transporte": ["posto", "combust", "uber", "99app", "estacion", "sem parar"],
+    "Saúde": ["drogaria", "droga", "farma", "hospital", "clinica", "laborat"],
+    "Assinaturas": ["netflix", "spotify", "amazon prime", "disney", "youtube", "apple.com"],
+    "Moradia": ["enel", "sabesp", "cemig", "copel", "condom", "aluguel"],
+}
+
+# dígitos e pontuação variam entre lançamentos do mesmo estabelecimento
+_NOISE_RE = re.compile(r"[\d\W_]+")
+
+
+def normalize_description(description: str) -> str:
+    return _NOISE_RE.sub(" ", strip_accents(description.lower())).strip()
+
+
+class StatementCategorizer(OpenAIClientMixin):
+    """
+    Categoriza descrições de extrato bancário: heurística local primeiro,
+    e UMA chamada ao LLM por lote só para as descrições desconhecidas.
+    """
+
+    MODEL = "gpt-4o-mini"
+    TIMEOUT = 30.0
+    MAX_PER_CALL = 100
+
+    SYSTEM_PROMPT = """
+Você categoriza lançamentos de extrato bancário brasileiro.
+
+Você receberá uma lista JSON de descrições. Retorne em "categories"
+exatamente uma categoria por descrição, na mesma ordem.
+
+Use apenas as categorias permitidas. Na dúvida, use "Outros".
+"""
+
+    PROMPT = PromptBuilder("categorize", SYSTEM_PROMPT)
+
+    RESPONSE_FORMAT = {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "statement_categories",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["categories"],
+                "properties": {
+                    "categories": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": CATEGORIES},
+                    },
+                },
+            },
+        },
+    }
+
+    def __init__(self):
+        self.llm_categorized = 0
+
+    def categorize_local(self, description: str) -> Optional[str]:
+        plain = normalize_description(description)
+        words = set(WORD_RE.findall(plain))
+
+        for category, keywords in CATEGORY_KEYWORDS.items():
+            if words.intersection(keywords):
+                return category
+
+        for category, fragments in STATEMENT_KEYWORDS.items():
+            if any(fragment in plain for fragment in fragments):
+                return category
+
+        return None
+
+    def categorize_many(self, descriptions: Iterable[str]) -> Dict[str, str]:
+        """
+        Retorna {descrição: categoria}. Bloqueante: chame no io_executor.
+        """
+        result: Dict[str, str] = {}
+        unknown: Dict[str, List[str]] = {}
+
+        for description in descriptions:
+            if description in result:
+                continue
+
+            category = (
+                self.categorize_local(description)
+                or parse_cache.get(self._cache_key(description))
+            )
+
+            if category is not None:
+                result[description] = category
+            else:
+                unknown.setdefault(normalize_description(description), []).append(description)
+
+        keys = list(unknown)
+        for start in range(0, len(keys), self.MAX_PER_CALL):
+            batch = keys[start:start + self.MAX_PER_CALL]
+
+            categories = self._categorize_llm(batch)
+
+            for i, key in enumerate(batch):
+                for description in unknown[key]:
+                    if categories is None:
+                        # LLM indisponível: não guarda o palpite no cache
+                        result[description] = DEFAULT_CATEGORY
+                    else:
+                        result[description] = categories[i]
+                        parse_cache.set(self._cache_key(description), categories[i])
+
+        return result
+
+    # =====================
+    # INTERNAL
+    # =====================
+
+    @staticmethod
+    def _cache_key(description: str):
+        return parse_cache.make_key("category", normalize_description(description))
+
+    def _categorize_llm(self, descriptions: List[str]) -> Optional[List[str]]:
+        try:
+            response = openai_guard.call(
+                self.client.chat.completions.create,
+                model=self.MODEL,
+                messages=self.PROMPT.messages(json.dumps(descriptions, ensure_ascii=False)),
+                prompt_cache_key=self.PROMPT.cache_key,
+                temperature=0,
+                response_format=self.RESPONSE_FORMAT,
+                timeout=self.TIMEOUT,
+            )
+            token_usage.record("categorize", response.usage)
+
+            categories = json.loads(response.choices[0].message.content)["categories"]
+
+            if len(categories) != len(descriptions):
+                raise ValueError("Category response size mismatch")
+
+        except Exception as e:
+            print("⚠️ StatementCategorizer fallback:", e)
+            return None
+
+        self.llm_categorized += len(descriptions)
+        return categories
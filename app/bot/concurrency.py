@@ -0,0 +1,92 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Dict, Hashable, Optional
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+# Updates processados em paralelo (entre chats diferentes)
+MAX_CONCURRENT_UPDATES = int(os.getenv("BOT_MAX_CONCURRENT_UPDATES", "16"))
+
+# Updates aceitos (em execução + esperando a vez do chat) antes de
+# o Application parar de puxar novos
+MAX_PENDING_UPDATES = int(os.getenv("BOT_MAX_PENDING_UPDATES", "256"))
+
+
+class ChatLocks:
+    """
+    Um lock FIFO por chat, criado sob demanda e descartado quando ninguém
+    mais espera por ele.
+    """
+
+    def __init__(self):
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._users: Dict[Hashable, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, chat_id: Optional[Hashable]):
+        if chat_id is None:
+            yield
+            return
+
+        lock = self._locks.setdefault(chat_id, asyncio.Lock())
+        self._users[chat_id] = self._users.get(chat_id, 0) + 1
+
+        try:
+            async with lock:
+                yield
+        finally:
+            self._users[chat_id] -= 1
+            if not self._users[chat_id]:
+                del self._users[chat_id]
+                del self._locks[chat_id]
+
+    @property
+    def active_chats(self) -> int:
+        return len(self._locks)
+
+
+def chat_key(update: object) -> Optional[int]:
+    if isinstance(update, Update) and update.effective_chat:
+        return update.effective_chat.id
+    return None
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """
+    Processa updates de chats diferentes em paralelo (até `workers` ao mesmo
+    tempo) e updates do mesmo chat um de cada vez, na ordem de chegada.
+
+    O semáforo do BaseUpdateProcessor é tomado antes de do_process_update,
+    então ele só limita o total aceito; o limite de workers é aplicado depois
+    do lock do chat, para que uma rajada de um chat não ocupe as vagas dos
+    outros.
+    """
+
+    def __init__(
+        self,
+        workers: int = MAX_CONCURRENT_UPDATES,
+        max_pending: int = MAX_PENDING_UPDATES,
+        locks: Optional[ChatLocks] = None,
+    ):
+        super().__init__(max(workers, max_pending))
+        self.workers = workers
+        self.locks = locks or chat_locks
+        self._workers: Optional[asyncio.Semaphore] = None
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        async with self.locks.hold(chat_key(update)):
+            async with self._workers:
+                await coroutine
+
+    async def initialize(self) -> None:
+        self._workers = asyncio.Semaphore(self.workers)
+
+    async def shutdown(self) -> None:
+        pass
+
+
+# Compartilhado com os handlers não bloqueantes (ex.: texto livre), que
+# tomam o lock do chat só na etapa que mexe no estado da conversa
+chat_locks = ChatLocks()
@@ -51,13 +51,56 @@ def format_memory_list(memories: list[dict]) -> str:
 
     return messages.MEMORY_LIST_HEADER + "\n".join(lines)
 
+def format_month(month) -> str:
+    return f"{messages.FINANCE_MONTHS[month.month - 1]}/{month.year}"
+
+
+def format_monthly_summary(summary: dict) -> str:
+    month = format_month(summary["month"])
+
+    if not summary["tx_count"]:
+        return messages.FINANCE_SUMMARY_EMPTY.format(month=month)
+
+    text = messages.FINANCE_SUMMARY_HEADER.format(month=month)
+    text += messages.FINANCE_SUMMARY_TOTALS.format(**summary)
+
+    expenses = [c for c in summary["categories"] if c["type"] != "income"]
+    if expenses:
+        text += messages.FINANCE_SUMMARY_CATEGORIES
+        for category in expenses:
+            text += (
+                f"• {category['category']}: R$ {category['total']:.2f} "
+                f"({category['count']})\n"
+            )
+
+    return text
+
+
+def format_cash_flow_forecast(forecast: list) -> str:
+    if not any(m["inflow"] or m["outflow"] for m in forecast):
+        return messages.FINANCE_FORECAST_EMPTY.format(months=len(forecast))
+
+    text = messages.FINANCE_FORECAST_HEADER.format(months=len(forecast))
+
+    for month in forecast:
+        text += messages.FINANCE_FORECAST_MONTH.format(
+            **{**month, "month": format_month(month["month"])}
+        )
+
+    return text
+
+
 def format_finance_confirmation(data: dict) -> str:
+    # campos ausentes aparecem como "…" (confirmação parcial em streaming)
+    amount = data.get("amount")
+    amount_text = f"{amount:.2f}" if isinstance(amount, (int, float)) else "…"
+
     return (
         f"*Confirme a transação financeira:*\n\n"
-        f"Descrição: {data['description']}\n"
-        f"Valor: R$ {data['amount']:.2f}\n"
-        f"Tipo: {data['transaction_type']}\n"
-        f"Categoria: {data['category']}\n"
-        f"Pagamento: {data['payment_method']}\n"
-        f"Data: {data['transaction_date']}"
+        f"Descrição: {data.get('description', '…')}\n"
+        f"Valor: R$ {amount_text}\n"
+        f"Tipo: {data.get('transaction_type', '…')}\n"
+        f"Categoria: {data.get('category', '…')}\n"
+        f"Pagamento: {data.get('payment_method', '…')}\n"
+        f"Data: {data.get('transaction_date', '…')}"
     )
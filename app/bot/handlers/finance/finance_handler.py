@@ -4,12 +4,15 @@ from datetime import date
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
 from app.ai.finance_parser import FinanceParser
+from app.ai.intent_classifier import record_labeled_message
+from app.infra.executor import io_executor
+from app.infra.outbox import notion_outbox
 from app.modules.finance.finance_service import FinanceService
 from app.modules.finance.repository import FinanceRepository
 from app.modules.finance.installment_service import InstallmentService
-from app.modules.finance.notion_sync_service import FinanceNotionSyncService
 
 from app.bot.messages import GENERAL_ERROR, GENERAL_CANCELLED
+from app.bot.pending import PendingStore, parse_callback_data, pending_store
 from app.bot.formatters import format_finance_confirmation
 
 logger = logging.getLogger(__name__)
@@ -19,7 +22,7 @@ def _build_finance_service() -> FinanceService:
     return FinanceService(
         repository=FinanceRepository(),
         installment_service=InstallmentService(),
-        notion_sync_service=FinanceNotionSyncService(),
+        outbox=notion_outbox,
     )
 
 
@@ -28,17 +31,45 @@ async def handle_finance_text(update, context):
 
     try:
         parser = FinanceParser()
-        parsed = parser.parse(text)
+        parsed = await parser.parse_async(text)
+
+    except Exception:
+        logger.exception("Erro ao interpretar mensagem financeira")
+        await update.message.reply_text(GENERAL_ERROR)
+        return
+
+    await reply_finance_confirmation(update, context, parsed)
 
-        context.user_data["pending_finance"] = parsed
+
+async def reply_finance_confirmation(update, context, parsed: dict, message=None):
+    """
+    Guarda a transação já interpretada e pede confirmação ao usuário.
+    """
+    try:
+        # uma pendência por mensagem do usuário; o id vai no callback_data
+        message_id = update.message.message_id
+        await pending_store.put_async(
+            PendingStore.make_key("finance", update.effective_chat.id, message_id),
+            # o texto original vira amostra rotulada se o usuário confirmar
+            {**parsed, "source_text": update.message.text},
+        )
 
         keyboard = InlineKeyboardMarkup([
             [
-                InlineKeyboardButton("✅ Salvar", callback_data="finance:confirm"),
-                InlineKeyboardButton("❌ Cancelar", callback_data="finance:cancel"),
+                InlineKeyboardButton("✅ Salvar", callback_data=f"finance:confirm:{message_id}"),
+                InlineKeyboardButton("❌ Cancelar", callback_data=f"finance:cancel:{message_id}"),
             ]
         ])
 
+        # confirmação parcial já enviada em streaming: só edita
+        if message is not None:
+            await message.edit_text(
+                format_finance_confirmation(parsed),
+                reply_markup=keyboard,
+                parse_mode="Markdown",
+            )
+            return
+
         await update.message.reply_text(
             format_finance_confirmation(parsed),
             reply_markup=keyboard,
@@ -54,18 +85,21 @@ async def handle_finance_confirmation(update, context):
     query = update.callback_query
     await query.answer()
 
-    pending = context.user_data.get("pending_finance")
+    action, message_id = parse_callback_data(query.data)
+    key = PendingStore.make_key("finance", update.effective_chat.id, message_id)
+
+    pending = (await pending_store.get_async(key)) if message_id else None
 
     if not pending:
         await query.edit_message_text(GENERAL_CANCELLED)
         return
 
-    if query.data == "finance:cancel":
-        context.user_data.pop("pending_finance", None)
+    if action == "cancel":
+        await pending_store.delete_async(key)
         await query.edit_message_text(GENERAL_CANCELLED)
         return
 
-    if query.data == "finance:confirm":
+    if action == "confirm":
         try:
             if pending.get("needs_review"):
                 await query.edit_message_text(
@@ -74,7 +108,7 @@ async def handle_finance_confirmation(update, context):
                 )
                 return
 
-            service = _build_finance_service()
+            service = await io_executor.run(_build_finance_service)
 
             amount = pending["amount"]
             if not amount or amount <= 0:
@@ -83,7 +117,8 @@ async def handle_finance_confirmation(update, context):
             tx_type = pending["transaction_type"]
 
             if tx_type == "expense":
-                service.add_expense(
+                await io_executor.run(
+                    service.add_expense,
                     amount=amount,
                     description=pending["description"],
                     category=pending.get("category"),
@@ -91,14 +126,16 @@ async def handle_finance_confirmation(update, context):
                     installments=pending.get("installments_total") or 1,
                 )
             else:
-                service.add_income(
+                await io_executor.run(
+                    service.add_income,
                     amount=amount,
                     description=pending["description"],
                     category=pending.get("category"),
                     received_date=date.fromisoformat(pending["transaction_date"]),
                 )
 
-            context.user_data.pop("pending_finance", None)
+            await pending_store.delete_async(key)
+            await io_executor.run(record_labeled_message, pending.get("source_text"), "finance")
 
             await query.edit_message_text(
                 "💰 Transação financeira salva com sucesso."
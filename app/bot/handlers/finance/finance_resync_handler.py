@@ -1,3 +1,4 @@
+from app.infra.executor import io_executor
 from app.modules.finance.resync_service import FinanceResyncService
 
 
@@ -5,7 +6,7 @@ async def handle_resync_notion(update, context):
     await update.message.reply_text("🔄 Iniciando resync com o Notion...")
 
     service = FinanceResyncService()
-    result = service.resync_all()
+    result = await io_executor.run(service.resync_all)
 
     await update.message.reply_text(
         f"""✅ Resync finalizado
@@ -0,0 +1,102 @@
+import logging
+from datetime import date
+
+from app.bot.formatters import format_cash_flow_forecast, format_monthly_summary
+from app.bot.messages import (
+    FINANCE_FORECAST_INVALID,
+    FINANCE_SUMMARY_INVALID_MONTH,
+    GENERAL_ERROR,
+)
+from app.infra.executor import io_executor
+from app.modules.finance.finance_service import FinanceService
+from app.modules.finance.installment_service import InstallmentService
+from app.modules.finance.repository import FinanceRepository
+
+logger = logging.getLogger(__name__)
+
+FORECAST_DEFAULT_MONTHS = 6
+
+# mesmo limite de app.modules.finance.forecast, sem importar numpy aqui
+FORECAST_MAX_MONTHS = 36
+
+
+def _build_finance_service() -> FinanceService:
+    return FinanceService(
+        repository=FinanceRepository(),
+        installment_service=InstallmentService(),
+    )
+
+
+def _parse_month(args) -> date | None:
+    """
+    /resumo → mês atual; /resumo 9 ou 09/2026 → mês indicado.
+    """
+    today = date.today()
+
+    if not args:
+        return today.replace(day=1)
+
+    month, _, year = args[0].partition("/")
+
+    try:
+        year = int(year) if year else today.year
+        if year < 100:
+            year += 2000
+        return date(year, int(month), 1)
+    except ValueError:
+        return None
+
+
+async def handle_monthly_summary(update, context):
+    """
+    /resumo [MM/AAAA]: resumo do mês lido dos rollups.
+    """
+    month = _parse_month(context.args)
+
+    if month is None:
+        await update.message.reply_text(FINANCE_SUMMARY_INVALID_MONTH)
+        return
+
+    try:
+        service = await io_executor.run(_build_finance_service)
+        summary = await io_executor.run(service.get_monthly_summary, month)
+
+    except Exception:
+        logger.exception("Erro ao montar resumo mensal")
+        await update.message.reply_text(GENERAL_ERROR)
+        return
+
+    await update.message.reply_text(
+        format_monthly_summary(summary),
+        parse_mode="Markdown"
+    )
+
+
+async def handle_cash_flow_forecast(update, context):
+    """
+    /previsao [N]: entradas e saídas já comprometidas nos próximos N meses.
+    """
+    try:
+        months = int(context.args[0]) if context.args else FORECAST_DEFAULT_MONTHS
+    except ValueError:
+        months = 0
+
+    if not 1 <= months <= FORECAST_MAX_MONTHS:
+        await update.message.reply_text(
+            FINANCE_FORECAST_INVALID.format(max_months=FORECAST_MAX_MONTHS)
+        )
+        return
+
+    try:
+        service = await io_executor.run(_build_finance_service)
+        forecast = await io_executor.run(service.get_cash_flow_forecast, months)
+
+    except Exception:
+        logger.exception("Erro ao montar previsão de caixa")
+        await update.message.reply_text(GENERAL_ERROR)
+        return
+
+    await update.message.reply_text(
+        format_cash_flow_forecast(forecast),
+        parse_mode="Markdown"
+    )
@@ -0,0 +1,123 @@
+import logging
+import os
+import tempfile
+import time
+
+from app.ai.finance_rules import strip_accents
+from app.ai.statement_categorizer import StatementCategorizer
+from app.bot.messages import GENERAL_ERROR
+from app.bot.rate_limit import BACKGROUND
+from app.infra.executor import io_executor
+from app.infra.outbox import notion_outbox
+from app.modules.finance.repository import FinanceRepository
+from app.modules.finance.statement_import import (
+    BANK,
+    CARD,
+    StatementFormatError,
+    StatementImporter,
+    chunked,
+    iter_statement_rows,
+)
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".csv", ".ofx", ".qfx")
+
+# Limite do Bot API para download de arquivos por bots
+MAX_FILE_SIZE = 20 * 1024 * 1024
+
+PROGRESS_INTERVAL_SECONDS = 2.0
+
+
+def _caption_convention(caption: str | None) -> str | None:
+    """
+    Legenda do documento força a convenção de sinal: "fatura"/"cartão"
+    (compras positivas) ou "extrato"/"conta". Sem legenda, detecta.
+    """
+    text = strip_accents((caption or "").lower())
+
+    if "fatura" in text or "cartao" in text:
+        return CARD
+    if "extrato" in text or "conta" in text:
+        return BANK
+
+    return None
+
+
+async def handle_statement_document(update, context):
+    """
+    Importa um extrato CSV/OFX enviado como documento, em lotes,
+    editando uma mensagem de progresso.
+    """
+    document = update.message.document
+    filename = document.file_name or ""
+
+    if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+        await update.message.reply_text("📎 Envie o extrato em CSV ou OFX.")
+        return
+
+    if document.file_size and document.file_size > MAX_FILE_SIZE:
+        await update.message.reply_text("📎 Arquivo muito grande (máx. 20 MB).")
+        return
+
+    status = await update.message.reply_text("📥 Importando extrato...")
+
+    fd, path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1])
+    os.close(fd)
+
+    importer = StatementImporter(
+        repository=FinanceRepository(),
+        categorizer=StatementCategorizer(),
+        outbox=notion_outbox,
+    )
+
+    try:
+        telegram_file = await document.get_file()
+        await telegram_file.download_to_drive(path)
+
+        convention = _caption_convention(update.message.caption)
+        rows = chunked(iter_statement_rows(path, filename, convention))
+        last_progress = time.monotonic()
+
+        while True:
+            # leitura + parsing do próximo lote também saem do event loop
+            chunk = await io_executor.run(next, rows, None)
+            if chunk is None:
+                break
+
+            await io_executor.run(importer.import_chunk, chunk)
+
+            if time.monotonic() - last_progress >= PROGRESS_INTERVAL_SECONDS:
+                last_progress = time.monotonic()
+                # progresso tem prioridade baixa na fila de envio (o atalho
+                # Message.edit_text não repassa rate_limit_args)
+                await context.bot.edit_message_text(
+                    f"⏳ {importer.imported} lançamentos importados...",
+                    chat_id=status.chat_id,
+                    message_id=status.message_id,
+                    rate_limit_args=BACKGROUND,
+                )
+
+    except StatementFormatError as e:
+        await status.edit_text(f"❌ Não reconheci o extrato: {e}")
+        return
+
+    except Exception:
+        logger.exception("Erro ao importar extrato")
+        await status.edit_text(
+            f"{GENERAL_ERROR}\n\n{importer.imported} lançamentos já tinham sido importados."
+        )
+        return
+
+    finally:
+        os.remove(path)
+
+    summary = importer.summary()
+    await status.edit_text(
+        f"✅ Extrato importado\n\n"
+        f"📄 Lançamentos: {summary['imported']}\n"
+        f"♻️ Já importados antes: {summary['duplicates']}\n"
+        f"💰 Entradas: R$ {summary['income']:.2f}\n"
+        f"💸 Saídas: R$ {summary['expense']:.2f}\n"
+        f"🤖 Categorizados pela IA: {summary['llm_categorized']}"
+    )
@@ -1,7 +1,9 @@
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
 
-from app.infra.notion.reminders import create_notion_reminder
+from app.infra.executor import io_executor
+from app.infra.outbox import notion_outbox
+from app.ai.intent_classifier import record_labeled_message
 from app.ai.memory_parser import MemoryParser
 from app.modules.memory.repository import MemoryRepository
 from app.bot.messages import (
@@ -9,6 +11,7 @@ from app.bot.messages import (
     GENERAL_CANCELLED,
 )
 from app.bot.formatters import format_memory_confirmation
+from app.bot.pending import PendingStore, parse_callback_data, pending_store
 
 
 async def handle_memory_text(update, context):
@@ -20,18 +23,45 @@ async def handle_memory_text(update, context):
 
     try:
         parser = MemoryParser()
-        parsed = parser.parse(text)
+        parsed = await parser.parse_async(text)
 
-        # guarda a memória pendente no contexto
-        context.user_data["pending_memory"] = parsed
+    except Exception as e:
+        print(e)
+        await update.message.reply_text(GENERAL_ERROR)
+        return
+
+    await reply_memory_confirmation(update, context, parsed)
+
+
+async def reply_memory_confirmation(update, context, parsed: dict, message=None):
+    """
+    Guarda a memória já interpretada e pede confirmação antes de salvar.
+    """
+    try:
+        # guarda a memória pendente; o id da mensagem vai no callback_data
+        message_id = update.message.message_id
+        await pending_store.put_async(
+            PendingStore.make_key("memory", update.effective_chat.id, message_id),
+            # o texto original vira amostra rotulada se o usuário confirmar
+            {**parsed, "source_text": update.message.text},
+        )
 
         keyboard = InlineKeyboardMarkup([
             [
-                InlineKeyboardButton("✅ Salvar", callback_data="memory:confirm"),
-                InlineKeyboardButton("❌ Cancelar", callback_data="memory:cancel"),
+                InlineKeyboardButton("✅ Salvar", callback_data=f"memory:confirm:{message_id}"),
+                InlineKeyboardButton("❌ Cancelar", callback_data=f"memory:cancel:{message_id}"),
             ]
         ])
 
+        # confirmação parcial já enviada em streaming: só edita
+        if message is not None:
+            await message.edit_text(
+                format_memory_confirmation(parsed),
+                reply_markup=keyboard,
+                parse_mode="Markdown",
+            )
+            return
+
         await update.message.reply_text(
             format_memory_confirmation(parsed),
             reply_markup=keyboard,
@@ -43,43 +73,62 @@ async def handle_memory_text(update, context):
         await update.message.reply_text(GENERAL_ERROR)
 
 
+def _save_memory(pending: dict) -> dict:
+    """
+    Persiste a memória e enfileira o lembrete do Notion.
+    Bloqueante: roda no io_executor.
+    """
+    repo = MemoryRepository()
+
+    # 🔹 salva a memória (APENAS campos da tabela)
+    memory_data = {
+        "content": pending["content"],
+        "memory_type": pending["memory_type"],
+        "tags": pending.get("tags", []),
+        "context": None,
+        "source": "telegram",
+    }
+
+    saved = repo.create(memory_data)
+
+    # 🔗 envia para Notion Calendar se for lembrete (via outbox)
+    # o memory_id é a chave de idempotência do lembrete no Notion
+    if pending["memory_type"] == "reminder" and pending.get("datetime"):
+        try:
+            notion_outbox.enqueue("notion_reminder", {
+                "title": pending["content"],
+                "reminder_datetime": pending["datetime"],
+                "tags": pending.get("tags", []),
+                "source": "telegram",
+                "memory_id": saved["id"],
+            })
+        except Exception as e:
+            # a memória já está salva: não quebrar a confirmação
+            print(f"[WARN] Falha ao enfileirar lembrete no Notion: {e}")
+
+    return saved
+
+
 async def handle_memory_confirmation(update, context):
     query = update.callback_query
     await query.answer()
 
-    pending = context.user_data.get("pending_memory")
+    action, message_id = parse_callback_data(query.data)
+    key = PendingStore.make_key("memory", update.effective_chat.id, message_id)
+
+    pending = (await pending_store.get_async(key)) if message_id else None
 
     if not pending:
         await query.edit_message_text(GENERAL_CANCELLED)
         return
 
-    if query.data == "memory:confirm":
+    if action == "confirm":
         try:
-            repo = MemoryRepository()
-
-            # 🔹 salva a memória (APENAS campos da tabela)
-            memory_data = {
-                "content": pending["content"],
-                "memory_type": pending["memory_type"],
-                "tags": pending.get("tags", []),
-                "context": None,
-                "source": "telegram",
-            }
-
-            saved = repo.create(memory_data)
-
-            # 🔗 envia para Notion Calendar se for lembrete
-            if pending["memory_type"] == "reminder" and pending.get("datetime"):
-                create_notion_reminder(
-                    title=pending["content"],
-                    reminder_datetime=pending["datetime"],
-                    tags=pending.get("tags", []),
-                    source="telegram",
-                    memory_id=saved["id"],
-                )
+            await io_executor.run(_save_memory, pending)
 
             # limpa estado
-            context.user_data.pop("pending_memory", None)
+            await pending_store.delete_async(key)
+            await io_executor.run(record_labeled_message, pending.get("source_text"), "memory")
 
             await query.edit_message_text(
                 "✅ Memória salva com sucesso!"
@@ -89,8 +138,8 @@ async def handle_memory_confirmation(update, context):
             print(e)
             await query.edit_message_text(GENERAL_ERROR)
 
-    elif query.data == "memory:cancel":
-        context.user_data.pop("pending_memory", None)
+    elif action == "cancel":
+        await pending_store.delete_async(key)
         await query.edit_message_text(GENERAL_CANCELLED)
 
 
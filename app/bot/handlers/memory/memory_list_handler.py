@@ -1,23 +1,107 @@
-from app.modules.memory.repository import MemoryRepository
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
 
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
-async def handle_list_memories(update, context):
+from app.infra.executor import io_executor
+from app.modules.memory.repository import Cursor, MemoryRepository
+
+PAGE_SIZE = 5
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _encode_cursor(row: dict) -> str:
     """
-    Telegram handler to list recent memories.
+    (created_at, id) compacto para caber nos 64 bytes do callback_data:
+    microssegundos desde a epoch + uuid em hex.
     """
-    repo = MemoryRepository()
-    memories = repo.list_recent(limit=5)
+    created = datetime.fromisoformat(row["created_at"])
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+
+    micros = (created - _EPOCH) // datetime.resolution
+
+    try:
+        memory_id = uuid.UUID(str(row["id"])).hex
+    except ValueError:
+        memory_id = str(row["id"])
+
+    return f"{micros}:{memory_id}"
+
+
+def _decode_cursor(micros: str, memory_id: str) -> Cursor:
+    created = _EPOCH + int(micros) * datetime.resolution
+
+    if len(memory_id) == 32:
+        memory_id = str(uuid.UUID(hex=memory_id))
+
+    return created.isoformat(), memory_id
+
+
+def _render(page: dict):
+    memories = page["items"]
 
     if not memories:
-        await update.message.reply_text("Nenhuma memória encontrada.")
-        return
+        return "Nenhuma memória encontrada.", None
 
     text = "🧠 *Últimas memórias:*\n\n"
 
     for mem in memories:
         text += f"- {mem['content']}\n"
 
+    buttons = []
+    if page["has_newer"]:
+        buttons.append(InlineKeyboardButton(
+            "⬅️ Mais recentes", callback_data=f"mem:n:{_encode_cursor(memories[0])}"
+        ))
+    if page["has_older"]:
+        buttons.append(InlineKeyboardButton(
+            "Mais antigas ➡️", callback_data=f"mem:o:{_encode_cursor(memories[-1])}"
+        ))
+
+    return text, InlineKeyboardMarkup([buttons]) if buttons else None
+
+
+async def handle_list_memories(update, context):
+    """
+    Telegram handler to list recent memories.
+    """
+    repo = MemoryRepository()
+    page = await io_executor.run(repo.list_page, limit=PAGE_SIZE)
+
+    text, keyboard = _render(page)
+
     await update.message.reply_text(
         text,
+        reply_markup=keyboard,
+        parse_mode="Markdown"
+    )
+
+
+async def handle_memories_page(update, context):
+    """
+    Navegação de /ultimas: mem:o:<cursor> (mais antigas) e mem:n:<cursor>.
+    """
+    query = update.callback_query
+    await query.answer()
+
+    _, direction, micros, memory_id = query.data.split(":", 3)
+    cursor = _decode_cursor(micros, memory_id)
+
+    repo = MemoryRepository()
+    after: Optional[Cursor] = cursor if direction == "o" else None
+    before: Optional[Cursor] = cursor if direction == "n" else None
+
+    page = await io_executor.run(
+        repo.list_page, limit=PAGE_SIZE, after=after, before=before
+    )
+
+    text, keyboard = _render(page)
+
+    await query.edit_message_text(
+        text,
+        reply_markup=keyboard,
         parse_mode="Markdown"
     )
@@ -0,0 +1,139 @@
+import logging
+
+from telegram.helpers import escape_markdown
+
+from app.ai.cache import parse_cache
+from app.ai.metrics import finance_parse_stats, intent_stats, token_usage
+from app.ai.resilience import openai_guard
+from app.bot.pending import pending_store
+from app.bot.rate_limit import flood_limiter
+from app.infra.executor import io_executor, loop_monitor
+from app.infra.outbox import notion_outbox
+from app.infra.replica import local_replica
+from app.infra.registry import clients
+
+logger = logging.getLogger(__name__)
+
+
+def _md(value) -> str:
+    # nomes de métricas têm "_" (llm_batch, extract_many), que o Markdown lê como itálico
+    return escape_markdown(str(value), version=1)
+
+
+async def handle_stats(update, context):
+    """
+    Mostra métricas operacionais do bot (fast path financeiro x LLM).
+    """
+    snapshot = finance_parse_stats.snapshot()
+
+    lines = ["📈 *Métricas do parser financeiro*", ""]
+
+    for path, stats in sorted(snapshot.items()):
+        lines.append(
+            f"• {_md(path)}: {stats['count']} chamadas | "
+            f"p50 {stats['p50_ms']:.1f} ms | p99 {stats['p99_ms']:.1f} ms"
+        )
+
+    lines.append(
+        f"\nTaxa de acerto local: {finance_parse_stats.hit_rate('rules'):.0%}"
+    )
+
+    intents = intent_stats.snapshot()
+    if intents:
+        lines.append("\n🧭 *Roteamento de intenção*")
+        for path, stats in sorted(intents.items()):
+            lines.append(
+                f"• {_md(path)}: {stats['count']} | p50 {stats['p50_ms']:.3f} ms"
+            )
+
+    guard = openai_guard.stats()
+    lines.append(
+        f"\n🛡️ OpenAI: circuito {_md(guard['breaker'])} | "
+        f"{guard['requests_available']} req e "
+        f"{guard['tokens_available']} tokens disponíveis no bucket"
+    )
+
+    cache = parse_cache.stats()
+    lines.append(
+        f"\n🗃️ Cache: {cache['size']}/{cache['maxsize']} itens | "
+        f"{cache['hits']} hits | {cache['misses']} misses | "
+        f"{cache['evictions']} evicções | {cache['expirations']} expirados"
+    )
+
+    io = io_executor.snapshot()
+    lag = loop_monitor.snapshot()
+    lines.append(
+        f"\n⚙️ I/O: {io['running']}/{io['max_workers']} threads ocupadas | "
+        f"{io['queued']} na fila | espera p99 "
+        f"{io['timings'].get('wait', {}).get('p99_ms', 0.0):.1f} ms"
+    )
+    lines.append(
+        f"⏱️ Lag do event loop: p50 {lag['p50_ms']:.1f} ms | "
+        f"p99 {lag['p99_ms']:.1f} ms | máx {lag['max_ms']:.1f} ms"
+    )
+
+    outbox = await io_executor.run(notion_outbox.stats)
+    lines.append(
+        f"📤 Outbox Notion: {outbox['pending']} pendentes | "
+        f"{outbox['dead']} mortos | atraso {outbox['lag_seconds']:.0f} s"
+    )
+    # com PENDING_STORE_PATH, contar é uma consulta ao SQLite
+    pending = await io_executor.run(len, pending_store)
+    lines.append(f"⏳ Confirmações pendentes: {pending}")
+
+    if local_replica.enabled:
+        replica = await io_executor.run(local_replica.stats)
+        lag = replica["lag_seconds"]
+        lines.append(
+            f"🪞 Réplica local: {replica['transactions']} transações | "
+            f"{replica['memory_notes']} memórias | "
+            f"atraso {'—' if lag is None else f'{lag:.0f} s'} | "
+            f"leitura p50 {replica['read_p50_ms']:.3f} ms"
+        )
+
+    sends = flood_limiter.stats()
+    lines.append(
+        f"📨 Envios: {sends['sent']} | {sends['queued']} na fila | "
+        f"{sends['coalesced']} edições fundidas | {sends['retry_after']} flood waits | "
+        f"espera máx {sends['max_wait_ms']:.0f} ms"
+    )
+
+    usage = token_usage.snapshot()
+    if usage:
+        lines.append("\n🔢 *Tokens*")
+        for name, totals in sorted(usage.items()):
+            prompt = totals.get("prompt_tokens", 0)
+            cached = totals.get("cached_tokens", 0)
+            lines.append(
+                f"• {_md(name)}: {totals.get('calls', 0)} chamadas | "
+                f"prompt {prompt} ({cached / prompt if prompt else 0:.0%} em cache) | "
+                f"completion {totals.get('completion_tokens', 0)}"
+            )
+
+    await update.message.reply_text(
+        "\n".join(lines),
+        parse_mode="Markdown"
+    )
+
+
+async def handle_health(update, context):
+    """
+    Verifica a conexão com OpenAI, Supabase e Notion. O detalhe das falhas
+    vai para o log, não para o chat.
+    """
+    try:
+        results = await io_executor.run(clients.health_check)
+    except Exception:
+        logger.exception("Falha ao verificar a saúde dos serviços")
+        await update.message.reply_text("❌ Não foi possível verificar os serviços agora.")
+        return
+
+    lines = ["🩺 Saúde dos serviços", ""]
+    for name, status in results.items():
+        if status == "ok":
+            lines.append(f"✅ {name}: ok")
+        else:
+            logger.warning("Health check de %s falhou: %s", name, status)
+            lines.append(f"❌ {name}: indisponível")
+
+    await update.message.reply_text("\n".join(lines))
@@ -0,0 +1,288 @@
+"""
+Ingress do modo webhook com vários processos: recebe os POSTs do Telegram,
+valida o secret token e repassa cada update ao worker do seu chat.
+
+A afinidade por chat mantém a ordem das mensagens e o estado da conversa
+(user_data, confirmações pendentes) no mesmo processo.
+
+Só o ingress registra o webhook (setWebhook). Os workers não sobem o
+Updater do PTB, que sempre chama setWebhook: recebem os updates por um
+servidor local e os colocam na update_queue do Application. O ingress
+supervisiona os workers e reinicia, com backoff, os que morrerem.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from telegram import Bot, Update
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError, HTTPRequest
+from tornado.web import Application, RequestHandler
+
+from app.bot.webhook import (
+    BOT_WORKERS,
+    SECRET_HEADER,
+    WEBHOOK_LISTEN,
+    WEBHOOK_PATH,
+    WEBHOOK_PORT,
+    WEBHOOK_SECRET_TOKEN,
+    webhook_options,
+)
+from app.config import settings
+
+FORWARD_TIMEOUT = float(os.getenv("WEBHOOK_FORWARD_TIMEOUT_SECONDS", "10"))
+
+# Reinício de workers: espera dobra a cada queda rápida, até o máximo;
+# um worker que ficou de pé por WORKER_STABLE_SECONDS volta à espera base
+WORKER_BACKOFF_BASE = float(os.getenv("BOT_WORKER_BACKOFF_BASE_SECONDS", "1"))
+WORKER_BACKOFF_MAX = float(os.getenv("BOT_WORKER_BACKOFF_MAX_SECONDS", "30"))
+WORKER_STABLE_SECONDS = float(os.getenv("BOT_WORKER_STABLE_SECONDS", "60"))
+
+
+def affinity_key(payload: Dict) -> int:
+    """
+    Id do chat do update (ou do usuário, para updates sem chat).
+    """
+    for value in payload.values():
+        if not isinstance(value, dict):
+            continue
+
+        chat = value.get("chat") or (value.get("message") or {}).get("chat")
+        if chat and "id" in chat:
+            return chat["id"]
+
+        sender = value.get("from") or value.get("user")
+        if sender and "id" in sender:
+            return sender["id"]
+
+    return 0
+
+
+def pick_worker(payload: Dict, workers: int) -> int:
+    key = str(affinity_key(payload)).encode()
+    return zlib.crc32(key) % workers
+
+
+class TelegramIngressHandler(RequestHandler):
+    def initialize(self, worker_urls: List[str]):
+        self.worker_urls = worker_urls
+
+    async def post(self):
+        if self.request.headers.get(SECRET_HEADER) != WEBHOOK_SECRET_TOKEN:
+            self.set_status(403)
+            return
+
+        try:
+            payload = json.loads(self.request.body)
+        except ValueError:
+            self.set_status(400)
+            return
+
+        url = self.worker_urls[pick_worker(payload, len(self.worker_urls))]
+
+        try:
+            await AsyncHTTPClient().fetch(HTTPRequest(
+                url,
+                method="POST",
+                body=self.request.body,
+                headers={
+                    "Content-Type": "application/json",
+                    SECRET_HEADER: WEBHOOK_SECRET_TOKEN,
+                },
+                request_timeout=FORWARD_TIMEOUT,
+            ))
+        except (HTTPClientError, OSError):
+            # Telegram reenvia o update quando não recebe 2xx
+            self.set_status(502)
+
+
+class WorkerSupervisor:
+    """
+    Sobe os N processos worker e reinicia os que saírem, cada um com seu
+    próprio backoff (um worker em crash loop não atrasa os outros).
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.processes: List[subprocess.Popen] = []
+        self.restarts = 0
+        self._started_at = [0.0] * count
+        self._backoff = [0.0] * count
+        self._restart_at: List[Optional[float]] = [None] * count
+
+    def start(self) -> None:
+        self.processes = [self._spawn(index) for index in range(self.count)]
+
+    async def run(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            self.check(time.monotonic())
+
+            try:
+                await asyncio.wait_for(stop.wait(), 1)
+            except asyncio.TimeoutError:
+                pass
+
+    def check(self, now: float) -> None:
+        for index, process in enumerate(self.processes):
+            if process.poll() is None:
+                continue
+
+            if self._restart_at[index] is None:
+                lived = now - self._started_at[index]
+                self._backoff[index] = (
+                    WORKER_BACKOFF_BASE
+                    if lived >= WORKER_STABLE_SECONDS
+                    else min(WORKER_BACKOFF_MAX, max(WORKER_BACKOFF_BASE, self._backoff[index] * 2))
+                )
+                self._restart_at[index] = now + self._backoff[index]
+                print(
+                    f"[WARN] Worker {index} saiu com código {process.returncode}; "
+                    f"reiniciando em {self._backoff[index]:.0f}s"
+                )
+
+            elif now >= self._restart_at[index]:
+                self.processes[index] = self._spawn(index)
+                self._restart_at[index] = None
+                self.restarts += 1
+
+    def terminate(self) -> None:
+        for process in self.processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in self.processes:
+            process.wait()
+
+    def _spawn(self, index: int) -> subprocess.Popen:
+        env = dict(
+            os.environ,
+            BOT_MODE="webhook",
+            BOT_WORKER_INDEX=str(index),
+            WEBHOOK_LISTEN="127.0.0.1",
+            WEBHOOK_PORT=str(WEBHOOK_PORT + 1 + index),
+        )
+        self._started_at[index] = time.monotonic()
+
+        return subprocess.Popen([sys.executable, "-m", "app.bot.telegram_bot"], env=env)
+
+
+async def register_webhook() -> None:
+    options = webhook_options()
+
+    async with Bot(settings.require("telegram_bot_token")) as bot:
+        await bot.set_webhook(
+            url=options["webhook_url"],
+            secret_token=options["secret_token"],
+            allowed_updates=options["allowed_updates"],
+        )
+
+
+async def serve(workers: int = BOT_WORKERS, spawn: bool = True) -> None:
+    if not WEBHOOK_SECRET_TOKEN:
+        raise RuntimeError("WEBHOOK_SECRET_TOKEN is not set")
+
+    supervisor = WorkerSupervisor(workers)
+    if spawn:
+        supervisor.start()
+
+    worker_urls = [
+        f"http://127.0.0.1:{WEBHOOK_PORT + 1 + i}/{WEBHOOK_PATH}" for i in range(workers)
+    ]
+
+    app = Application([
+        (rf"/{WEBHOOK_PATH}", TelegramIngressHandler, {"worker_urls": worker_urls}),
+    ])
+    server = app.listen(WEBHOOK_PORT, address=WEBHOOK_LISTEN, xheaders=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        if spawn:
+            # com o ingress já ouvindo: updates que chegarem antes dos
+            # workers subirem recebem 502 e o Telegram reenvia
+            await register_webhook()
+
+        print(f"Webhook ingress on :{WEBHOOK_PORT} → {workers} workers")
+
+        if spawn:
+            await supervisor.run(stop)
+        else:
+            await stop.wait()
+
+    finally:
+        server.stop()
+        supervisor.terminate()
+
+
+def run_ingress(workers: Optional[int] = None) -> None:
+    asyncio.run(serve(workers or BOT_WORKERS))
+
+
+# =====================
+# WORKER
+# =====================
+
+class WorkerUpdateHandler(RequestHandler):
+    def initialize(self, telegram_app):
+        self.telegram_app = telegram_app
+
+    async def post(self):
+        if self.request.headers.get(SECRET_HEADER) != WEBHOOK_SECRET_TOKEN:
+            self.set_status(403)
+            return
+
+        try:
+            payload = json.loads(self.request.body)
+        except ValueError:
+            self.set_status(400)
+            return
+
+        update = Update.de_json(payload, self.telegram_app.bot)
+        await self.telegram_app.update_queue.put(update)
+
+
+async def serve_worker(application) -> None:
+    """
+    Roda o Application do PTB sem o Updater: o servidor local só enfileira
+    os updates repassados pelo ingress.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await application.initialize()
+    if application.post_init:
+        await application.post_init(application)
+
+    await application.start()
+
+    server = Application([
+        (rf"/{WEBHOOK_PATH}", WorkerUpdateHandler, {"telegram_app": application}),
+    ]).listen(WEBHOOK_PORT, address=WEBHOOK_LISTEN)
+
+    try:
+        await stop.wait()
+
+    finally:
+        server.stop()
+
+        await application.stop()
+        if application.post_stop:
+            await application.post_stop(application)
+
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
+
+
+def run_worker(application) -> None:
+    asyncio.run(serve_worker(application))
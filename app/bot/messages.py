@@ -13,7 +13,13 @@ HELP_MESSAGE = (
     "• _Reflexão estou rendendo melhor de manhã_\n\n"
     "📌 Comandos disponíveis:\n"
     "/help — mostra esta ajuda\n"
-    "/ultimas — lista suas últimas memórias\n\n"
+    "/ultimas — lista suas últimas memórias\n"
+    "/resumo — resumo financeiro do mês (ex.: /resumo 09/2026)\n"
+    "/previsao — entradas e saídas já comprometidas nos próximos meses (ex.: /previsao 12)\n"
+    "/stats — métricas do bot\n"
+    "/health — verifica OpenAI, Supabase e Notion\n\n"
+    "📎 Envie um extrato CSV ou OFX para importar lançamentos "
+    "(legenda \"fatura\" para faturas de cartão).\n\n"
     "Tudo é salvo de forma organizada automaticamente."
 )
 
@@ -38,6 +44,41 @@ GENERAL_ERROR = (
 GENERAL_CANCELLED = "❌ Operação cancelada."
 
 
+# ---------- FINANCE ----------
+
+FINANCE_MONTHS = (
+    "janeiro", "fevereiro", "março", "abril", "maio", "junho",
+    "julho", "agosto", "setembro", "outubro", "novembro", "dezembro",
+)
+
+FINANCE_SUMMARY_HEADER = "📊 *Resumo de {month}*\n\n"
+
+FINANCE_SUMMARY_TOTALS = (
+    "💰 Entradas: R$ {income:.2f}\n"
+    "💸 Saídas: R$ {expense:.2f}\n"
+    "📈 Saldo do mês: R$ {balance:.2f}\n"
+    "💳 Em parcelas: R$ {installments:.2f}\n"
+)
+
+FINANCE_SUMMARY_CATEGORIES = "\n*Gastos por categoria*\n"
+
+FINANCE_SUMMARY_EMPTY = "📭 Nenhum lançamento em {month}."
+
+FINANCE_SUMMARY_INVALID_MONTH = "📅 Use /resumo MM/AAAA (ex.: /resumo 09/2026)."
+
+FINANCE_FORECAST_HEADER = "🔮 *Compromissos dos próximos {months} meses*\n\n"
+
+FINANCE_FORECAST_MONTH = (
+    "*{month}*\n"
+    "💰 R$ {inflow:.2f} | 💸 R$ {outflow:.2f} "
+    "(parcelas R$ {installments:.2f}) | acumulado R$ {cumulative:.2f}\n"
+)
+
+FINANCE_FORECAST_EMPTY = "📭 Nenhum lançamento futuro nos próximos {months} meses."
+
+FINANCE_FORECAST_INVALID = "📅 Use /previsao N, com N de 1 a {max_months} (ex.: /previsao 6)."
+
+
 # ---------- MEMORY ----------
 
 MEMORY_CONFIRMATION = (
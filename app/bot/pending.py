@@ -0,0 +1,174 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from cachetools import TTLCache
+
+from app.infra.executor import io_executor
+
+# Confirmações não respondidas expiram depois disso
+PENDING_TTL_SECONDS = float(os.getenv("PENDING_TTL_SECONDS", str(24 * 3600)))
+
+# Teto de confirmações guardadas (as mais antigas saem primeiro)
+PENDING_MAXSIZE = int(os.getenv("PENDING_MAXSIZE", "5000"))
+
+# Vazio: só em memória. Com caminho: sobrevive a restarts.
+PENDING_STORE_PATH = os.getenv("PENDING_STORE_PATH", "")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_confirmations (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pending_confirmations_expires
+    ON pending_confirmations (expires_at);
+"""
+
+
+class PendingStore:
+    """
+    Confirmações pendentes (finance/memory) aguardando o clique do usuário.
+
+    Cada confirmação tem sua própria chave — (tipo, chat, id da mensagem do
+    usuário) — que vai no callback_data dos botões, então várias podem ficar
+    abertas ao mesmo tempo sem uma sobrescrever a outra.
+
+    O tamanho é limitado por PENDING_MAXSIZE e PENDING_TTL_SECONDS; com
+    PENDING_STORE_PATH as pendências ficam em SQLite e sobrevivem a restarts.
+    """
+
+    def __init__(
+        self,
+        path: str = PENDING_STORE_PATH,
+        ttl: float = PENDING_TTL_SECONDS,
+        maxsize: int = PENDING_MAXSIZE,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl) if not path else None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @staticmethod
+    def make_key(kind: str, chat_id: int, message_id: int) -> str:
+        return f"{kind}:{chat_id}:{message_id}"
+
+    def put(self, key: str, data: Dict) -> None:
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+        with self._lock:
+            if self._memory is not None:
+                self._memory[key] = payload
+                return
+
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO pending_confirmations VALUES (?, ?, ?)",
+                (key, payload, time.time() + self.ttl),
+            )
+
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._evict(db)
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            if self._memory is not None:
+                payload = self._memory.get(key)
+            else:
+                row = self._db().execute(
+                    "SELECT payload FROM pending_confirmations "
+                    "WHERE key = ? AND expires_at > ?",
+                    (key, time.time()),
+                ).fetchone()
+                payload = row[0] if row else None
+
+        return json.loads(payload) if payload else None
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._memory is not None:
+                self._memory.pop(key, None)
+            else:
+                self._db().execute("DELETE FROM pending_confirmations WHERE key = ?", (key,))
+
+    # =====================
+    # ASYNC
+    # =====================
+    # Para os handlers: em memória a operação é instantânea e roda no
+    # event loop; em SQLite ela faz I/O de disco e vai para o io_executor.
+
+    async def put_async(self, key: str, data: Dict) -> None:
+        if self._memory is not None:
+            return self.put(key, data)
+        await io_executor.run(self.put, key, data)
+
+    async def get_async(self, key: str) -> Optional[Dict]:
+        if self._memory is not None:
+            return self.get(key)
+        return await io_executor.run(self.get, key)
+
+    async def delete_async(self, key: str) -> None:
+        if self._memory is not None:
+            return self.delete(key)
+        await io_executor.run(self.delete, key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._memory is not None:
+                self._memory.expire()
+                return len(self._memory)
+
+            return self._db().execute(
+                "SELECT COUNT(*) FROM pending_confirmations WHERE expires_at > ?",
+                (time.time(),),
+            ).fetchone()[0]
+
+    # =====================
+    # INTERNAL
+    # =====================
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+
+        return self._conn
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        db.execute("DELETE FROM pending_confirmations WHERE expires_at <= ?", (time.time(),))
+
+        # acima do teto: descarta as que expiram primeiro (as mais antigas)
+        db.execute(
+            "DELETE FROM pending_confirmations WHERE key IN ("
+            "  SELECT key FROM pending_confirmations ORDER BY expires_at DESC"
+            "  LIMIT -1 OFFSET ?"
+            ")",
+            (self.maxsize,),
+        )
+
+
+def parse_callback_data(data: str) -> Tuple[str, Optional[str]]:
+    """
+    "finance:confirm:123" -> ("confirm", "123").
+    Botões antigos ("finance:confirm") não têm id: a pendência expirou.
+    """
+    parts = data.split(":")
+    return parts[1], (parts[2] if len(parts) > 2 else None)
+
+
+# Instância única usada pelos handlers de confirmação
+pending_store = PendingStore()
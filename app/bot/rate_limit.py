@@ -0,0 +1,395 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from datetime import timedelta
+from typing import Any, Deque, Dict, Optional, Tuple, Union
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from app.bot.webhook import BOT_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# Prioridades (rate_limit_args): respostas ao usuário saem antes de
+# notificações de fundo (progresso de importação, lembretes, broadcasts)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# Limites do Telegram, com folga: ~30 msg/s no total, ~1 msg/s por chat
+# privado (rajadas curtas toleradas) e 20 msg/min por grupo
+GLOBAL_RATE = float(os.getenv("BOT_GLOBAL_RATE", "29"))
+CHAT_RATE = float(os.getenv("BOT_CHAT_RATE", "1"))
+CHAT_BURST = float(os.getenv("BOT_CHAT_BURST", "3"))
+GROUP_RATE_PER_MINUTE = float(os.getenv("BOT_GROUP_RATE_PER_MINUTE", "20"))
+GROUP_BURST = float(os.getenv("BOT_GROUP_BURST", "3"))
+
+# Tentativas extras depois de um 429 (RetryAfter)
+MAX_RETRIES = int(os.getenv("BOT_RETRY_AFTER_RETRIES", "2"))
+
+# Edições que podem ser fundidas: só o conteúdo mais recente importa
+COALESCED_ENDPOINTS = {"editMessageText", "editMessageCaption", "editMessageReplyMarkup"}
+
+MAX_IDLE_BUCKETS = 1024
+
+
+class _Bucket:
+    """
+    Token bucket em segundos do loop; capacidade `burst`, recarga `rate`/s.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def delay(self, now: float) -> float:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def idle(self, now: float) -> bool:
+        return self.delay(now) == 0 and self.tokens >= self.burst
+
+
+class _Request:
+    __slots__ = (
+        "chat", "priority", "coalesce_key", "call", "granted", "result", "enqueued",
+        "waiters", "task",
+    )
+
+    def __init__(self, chat, priority: int, coalesce_key, call: Tuple):
+        self.chat = chat
+        self.priority = priority
+        self.coalesce_key = coalesce_key
+        self.call = call
+        self.granted = asyncio.get_running_loop().create_future()
+        self.result = asyncio.get_running_loop().create_future()
+        self.enqueued = time.monotonic()
+        # chamadores esperando o resultado (o original + edições fundidas)
+        self.waiters = 1
+        self.task: Optional[asyncio.Task] = None
+
+
+class FloodControlRateLimiter(BaseRateLimiter):
+    """
+    Agenda todas as chamadas ao Bot API que têm chat_id (envios e edições)
+    respeitando os limites global, por chat e por grupo do Telegram.
+
+    - Fila por prioridade (INTERACTIVE antes de BACKGROUND, via
+      `rate_limit_args`) e, dentro dela, round-robin entre chats: um chat
+      no limite não segura os outros.
+    - Edições ainda na fila para a mesma mensagem são fundidas: a chamada
+      sai uma vez, com o conteúdo mais recente, e todos recebem o resultado.
+      O envio roda numa task própria, então cancelar um dos chamadores não
+      derruba a edição dos outros; só sai da fila quando ninguém mais espera.
+    - Um 429 pausa todos os envios pelo retry_after e a chamada volta para
+      a frente da fila.
+
+    Com BOT_WORKERS > 1 o limite global é dividido entre os processos
+    (cada chat fica sempre no mesmo worker, então o limite por chat vale).
+    """
+
+    def __init__(
+        self,
+        global_rate: float = GLOBAL_RATE / max(BOT_WORKERS, 1),
+        chat_rate: float = CHAT_RATE,
+        chat_burst: float = CHAT_BURST,
+        group_rate_per_minute: float = GROUP_RATE_PER_MINUTE,
+        group_burst: float = GROUP_BURST,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.global_bucket = _Bucket(global_rate, 1)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        # rajada + recarga em 60 s não passa do limite por minuto
+        self.group_rate = max(group_rate_per_minute - group_burst, 1) / 60
+        self.group_burst = group_burst
+        self.max_retries = max_retries
+
+        self._buckets: Dict[Any, _Bucket] = {}
+        # prioridade -> chat -> fila FIFO do chat
+        self._queues: Dict[int, "OrderedDict[Any, Deque[_Request]]"] = {}
+        self._edits: Dict[Tuple, _Request] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._paused_until = 0.0
+
+        self.sent = 0
+        self.coalesced = 0
+        self.retry_after_hits = 0
+        self.max_wait = 0.0
+
+    async def initialize(self) -> None:
+        self._ensure_dispatcher()
+
+    async def shutdown(self) -> None:
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+
+        for queue in self._queues.values():
+            for requests in queue.values():
+                for request in requests:
+                    if not request.granted.done():
+                        request.granted.set_exception(RuntimeError("Rate limiter stopped"))
+
+        self._queues.clear()
+        self._edits.clear()
+
+    async def process_request(
+        self,
+        callback,
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[int],
+    ) -> Union[bool, Dict, list]:
+        chat = data.get("chat_id")
+
+        # getUpdates, answerCallbackQuery, getFile...: fora dos limites de envio
+        if chat is None:
+            return await callback(*args, **kwargs)
+
+        try:
+            chat = int(chat)
+        except (TypeError, ValueError):
+            pass
+
+        priority = rate_limit_args or INTERACTIVE
+        call = (callback, args, kwargs)
+
+        coalesce_key = None
+        if endpoint in COALESCED_ENDPOINTS and data.get("message_id") is not None:
+            coalesce_key = (endpoint, chat, data["message_id"])
+
+            queued = self._edits.get(coalesce_key)
+            if queued is not None:
+                # a edição anterior ainda não saiu: passa a enviar esta versão
+                queued.call = call
+                self.coalesced += 1
+
+                if priority < queued.priority:
+                    self._requeue(queued, priority)
+
+                queued.waiters += 1
+                return await self._wait(queued)
+
+        request = _Request(chat, priority, coalesce_key, call)
+        if coalesce_key:
+            self._edits[coalesce_key] = request
+
+        self._enqueue(request)
+        request.task = asyncio.create_task(self._run(request))
+
+        return await self._wait(request)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": sum(len(r) for q in self._queues.values() for r in q.values()),
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "retry_after": self.retry_after_hits,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
+
+    # =====================
+    # INTERNAL
+    # =====================
+
+    async def _wait(self, request: _Request):
+        try:
+            return await asyncio.shield(request.result)
+
+        finally:
+            request.waiters -= 1
+
+            if request.waiters == 0 and not request.result.done():
+                # todos os chamadores foram cancelados: libera a vaga na fila
+                if request.coalesce_key and self._edits.get(request.coalesce_key) is request:
+                    del self._edits[request.coalesce_key]
+
+                self._dequeue(request)
+                request.task.cancel()
+
+    async def _run(self, request: _Request) -> None:
+        # o resultado (ou o erro) chega aos chamadores por request.result
+        try:
+            await self._execute(request)
+        except asyncio.CancelledError:
+            request.result.cancel()
+            raise
+        except Exception as e:
+            self._fail(request, e)
+
+    async def _execute(self, request: _Request):
+        for attempt in range(self.max_retries + 1):
+            await request.granted
+
+            if request.coalesce_key and self._edits.get(request.coalesce_key) is request:
+                # saiu da fila: edições novas não entram mais nesta chamada
+                del self._edits[request.coalesce_key]
+
+            callback, args, kwargs = request.call
+
+            try:
+                result = await callback(*args, **kwargs)
+
+            except RetryAfter as e:
+                self.retry_after_hits += 1
+
+                if attempt == self.max_retries:
+                    logger.error("Flood limit mesmo após %d tentativas", self.max_retries)
+                    self._fail(request, e)
+                    raise
+
+                # int ou timedelta, conforme PTB_TIMEDELTA
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+
+                pause = retry_after + 0.1
+                logger.warning("Flood limit do Telegram: pausando envios por %.1fs", pause)
+
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+                request.granted = asyncio.get_running_loop().create_future()
+                self._enqueue(request, front=True)
+                continue
+
+            except Exception as e:
+                self._fail(request, e)
+                raise
+
+            self.sent += 1
+            if not request.result.done():
+                request.result.set_result(result)
+            return result
+
+    @staticmethod
+    def _fail(request: _Request, error: Exception) -> None:
+        if not request.result.done():
+            request.result.set_exception(error)
+            # cada chamador recebe o erro pelo próprio await; marca como lido
+            request.result.exception()
+
+    def _enqueue(self, request: _Request, front: bool = False) -> None:
+        queue = self._queues.setdefault(request.priority, OrderedDict())
+        requests = queue.setdefault(request.chat, deque())
+
+        if front:
+            requests.appendleft(request)
+        else:
+            requests.append(request)
+
+        self._ensure_dispatcher()
+        self._wakeup.set()
+
+    def _dequeue(self, request: _Request) -> bool:
+        requests = self._queues.get(request.priority, {}).get(request.chat)
+        if not requests or request not in requests:
+            return False
+
+        requests.remove(request)
+        if not requests:
+            del self._queues[request.priority][request.chat]
+
+        return True
+
+    def _requeue(self, request: _Request, priority: int) -> None:
+        if self._dequeue(request):
+            request.priority = priority
+            self._enqueue(request)
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    def _bucket(self, chat, now: float) -> _Bucket:
+        bucket = self._buckets.get(chat)
+
+        if bucket is None:
+            if len(self._buckets) > MAX_IDLE_BUCKETS:
+                self._buckets = {k: b for k, b in self._buckets.items() if not b.idle(now)}
+
+            is_group = isinstance(chat, str) or chat < 0
+            bucket = (
+                _Bucket(self.group_rate, self.group_burst)
+                if is_group
+                else _Bucket(self.chat_rate, self.chat_burst)
+            )
+            self._buckets[chat] = bucket
+
+        return bucket
+
+    def _next_ready(self, now: float) -> Tuple[Optional[_Request], float]:
+        """
+        Primeiro pedido (por prioridade, depois round-robin entre chats) cujo
+        chat tem capacidade agora; senão, quanto falta para o próximo.
+        """
+        soonest = float("inf")
+
+        for priority in sorted(self._queues):
+            queue = self._queues[priority]
+
+            for chat, requests in queue.items():
+                delay = self._bucket(chat, now).delay(now)
+                if delay > 0:
+                    soonest = min(soonest, delay)
+                    continue
+
+                request = requests.popleft()
+                if requests:
+                    queue.move_to_end(chat)
+                else:
+                    del queue[chat]
+
+                return request, 0.0
+
+        return None, soonest
+
+    async def _dispatch(self) -> None:
+        while True:
+            now = time.monotonic()
+
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            wait = self.global_bucket.delay(now)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            request, wait = self._next_ready(now)
+
+            if request is None:
+                self._wakeup.clear()
+                timeout = None if wait == float("inf") else wait
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.global_bucket.take()
+            self._bucket(request.chat, now).take()
+            self.max_wait = max(self.max_wait, now - request.enqueued)
+
+            if not request.granted.done():
+                request.granted.set_result(None)
+
+
+# Instância única: o Application usa para todas as chamadas do bot
+flood_limiter = FloodControlRateLimiter()
@@ -0,0 +1,73 @@
+import logging
+import os
+import time
+
+from app.bot.formatters import (
+    format_finance_confirmation,
+    format_memory_confirmation,
+)
+
+logger = logging.getLogger(__name__)
+
+# Liga/desliga as confirmações em streaming
+STREAMING_ENABLED = os.getenv("AI_STREAMING", "1") == "1"
+
+# Intervalo mínimo entre edições da mesma mensagem
+EDIT_INTERVAL_SECONDS = float(os.getenv("AI_STREAMING_EDIT_INTERVAL", "0.7"))
+
+# Campos que precisam estar prontos antes de mostrar a confirmação
+REQUIRED_FIELDS = {
+    "finance": ("description", "amount"),
+    "memory": ("memory_type", "content"),
+}
+
+FORMATTERS = {
+    "finance": format_finance_confirmation,
+    "memory": format_memory_confirmation,
+}
+
+
+class StreamingConfirmation:
+    """
+    Mostra a confirmação assim que os campos obrigatórios chegam do LLM
+    e a edita conforme o resto do JSON chega.
+
+    O handler usa `message` para editar a confirmação final (com os botões)
+    em vez de enviar uma nova mensagem.
+    """
+
+    def __init__(self, update):
+        self.update = update
+        self.message = None
+        self._last_text = None
+        self._last_edit = 0.0
+
+    async def on_partial(self, extracted: dict) -> None:
+        intent = extracted["intent"]
+        data = extracted["data"]
+
+        if not all(data.get(field) is not None for field in REQUIRED_FIELDS[intent]):
+            return
+
+        text = FORMATTERS[intent](data) + "\n\n⏳ _interpretando…_"
+
+        if text == self._last_text:
+            return
+
+        try:
+            if self.message is None:
+                self.message = await self.update.message.reply_text(
+                    text, parse_mode="Markdown"
+                )
+            elif time.monotonic() - self._last_edit >= EDIT_INTERVAL_SECONDS:
+                await self.message.edit_text(text, parse_mode="Markdown")
+            else:
+                return
+
+        except Exception:
+            # conteúdo parcial pode não ser Markdown válido; a versão final corrige
+            logger.debug("Falha ao atualizar confirmação parcial", exc_info=True)
+            return
+
+        self._last_text = text
+        self._last_edit = time.monotonic()
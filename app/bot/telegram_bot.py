@@ -1,6 +1,6 @@
-import os
+import asyncio
 import logging
-from dotenv import load_dotenv
+from typing import List
 
 from telegram import Update
 from telegram.ext import (
@@ -11,19 +11,40 @@ from telegram.ext import (
     ContextTypes,
     filters,
 )
+from app.ai.batcher import MicroBatcher
 from app.ai.intent_router import IntentRouter
-from app.bot.messages import GENERAL_START
+from app.ai.message_extractor import MessageExtractor
+from app.bot.concurrency import ChatOrderedUpdateProcessor, chat_locks
+from app.bot.messages import GENERAL_ERROR, GENERAL_START
+from app.bot.rate_limit import flood_limiter
+from app.bot.streaming import STREAMING_ENABLED, StreamingConfirmation
 from app.bot.handlers.memory.memory_handler import (
-    handle_memory_text,
+    reply_memory_confirmation,
     handle_memory_confirmation,
 )
 from app.bot.handlers.help_handler import handle_help
-from app.bot.handlers.memory.memory_list_handler import handle_list_memories
+from app.bot.handlers.stats_handler import handle_health, handle_stats
+from app.bot.handlers.memory.memory_list_handler import (
+    handle_list_memories,
+    handle_memories_page,
+)
 from app.bot.handlers.finance.finance_resync_handler import handle_resync_notion
+from app.bot.handlers.finance.finance_summary_handler import (
+    handle_cash_flow_forecast,
+    handle_monthly_summary,
+)
+from app.bot.handlers.finance.statement_import_handler import handle_statement_document
 from app.bot.handlers.finance.finance_handler import (
-    handle_finance_text,
+    reply_finance_confirmation,
     handle_finance_confirmation,
 )
+from app.bot.webhook import BOT_MODE, is_ingress, is_worker, webhook_options
+from app.config import settings
+from app.infra.executor import io_executor, loop_monitor
+from app.infra.notion.reminders import create_notion_reminder
+from app.infra.outbox import OutboxWorker, notion_outbox
+from app.infra.replica import ReplicaSyncWorker, local_replica
+from app.modules.finance.notion_sync_service import FinanceNotionSyncService
 
 
 
@@ -32,21 +53,109 @@ logging.basicConfig(
     level=logging.INFO
 )
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 intent_router = IntentRouter()
+message_extractor = MessageExtractor()
+
+
+async def parse_message(text: str, on_partial=None) -> dict:
+    """
+    Interpreta uma única mensagem: classificador local + parser do módulo,
+    ou roteamento + parsing combinados quando o classificador está em dúvida.
+
+    Com on_partial, a chamada roda em streaming (parser do módulo ou
+    extração combinada) e cada resultado parcial é repassado antes do final.
+
+    Só é chamada depois de extract_local não resolver a mensagem.
+    """
+    intent = intent_router.route_local(text)
+
+    parsers = {
+        "finance": message_extractor.finance_parser,
+        "memory": message_extractor.memory_parser,
+    }
+
+    if on_partial:
+        if intent:
+            partials = _with_intent(intent, parsers[intent].stream_async(text))
+        else:
+            partials = message_extractor.stream_async(text, local_checked=True)
+
+        previous = None
+        async for extracted in partials:
+            if previous is not None:
+                await on_partial(previous)
+            previous = extracted
+
+        return previous
+
+    if intent:
+        return {"intent": intent, "data": await parsers[intent].parse_async(text)}
+
+    return await message_extractor.extract_async(text, local_checked=True)
+
+
+async def _with_intent(intent: str, partials):
+    async for data in partials:
+        yield {"intent": intent, "data": data}
+
+
+async def parse_messages(texts: List[str]) -> List[dict]:
+    return await message_extractor.extract_many_async(texts, local_checked=True)
+
+
+# route_message já tentou extract_local antes de submeter: os dois
+# caminhos do batcher não repetem a regra nem a consulta ao cache
+message_batcher = MicroBatcher(
+    parse_one=parse_message,
+    parse_many=parse_messages,
+)
 
 
 async def route_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     text = update.message.text
+    chat_id = update.effective_chat.id
+    stream = StreamingConfirmation(update)
 
-    intent = intent_router.route(text)
+    # o handler roda com block=False. A extração é disparada antes do lock
+    # para que a rajada do chat caia na mesma janela do micro-batcher; o lock
+    # é pedido em seguida, sem await no meio, então a fila do chat segue a
+    # ordem de chegada. Esperar o resultado e responder acontecem com o lock:
+    # as confirmações saem na ordem das mensagens, e os callbacks de
+    # confirmar/cancelar só rodam depois da pendência gravada.
+    extraction = asyncio.ensure_future(_extract(chat_id, text, stream))
 
-    if intent == "finance":
-        await handle_finance_text(update, context)
-    else:
-        await handle_memory_text(update, context)
+    async with chat_locks.hold(chat_id):
+        try:
+            extracted = await extraction
 
+        except Exception:
+            logger.exception("Erro ao interpretar mensagem")
+            await update.message.reply_text(GENERAL_ERROR)
+            return
+
+        if extracted["intent"] == "finance":
+            await reply_finance_confirmation(
+                update, context, extracted["data"], message=stream.message
+            )
+        else:
+            await reply_memory_confirmation(
+                update, context, extracted["data"], message=stream.message
+            )
+
+
+async def _extract(chat_id: int, text: str, stream: StreamingConfirmation) -> dict:
+    # regra local e cache respondem na hora; o resto passa pela
+    # janela de micro-batching do chat
+    return (
+        message_extractor.extract_local(text)
+        or await message_batcher.submit(
+            chat_id,
+            text,
+            on_partial=stream.on_partial if STREAMING_ENABLED else None,
+        )
+    )
 
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -56,28 +165,62 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
-async def route_message(update, context):
-    text = update.message.text.lower()
+def sync_finance_to_notion(transaction: dict):
+    FinanceNotionSyncService().sync_transaction(transaction)
+
 
-    if any(word in text for word in ["r$", "comprei", "paguei", "recebi"]):
-        await handle_finance_text(update, context)
-    else:
-        await handle_memory_text(update, context)
+notion_worker = OutboxWorker(
+    notion_outbox,
+    handlers={
+        "notion_finance": sync_finance_to_notion,
+        "notion_reminder": lambda payload: create_notion_reminder(**payload),
+    },
+)
 
 
-def run_bot():
-    token = os.getenv("TELEGRAM_BOT_TOKEN")
+# só roda com LOCAL_REPLICA_ENABLED
+replica_worker = ReplicaSyncWorker(local_replica)
+
+
+async def on_startup(app):
+    loop_monitor.start()
+    notion_worker.start()
+    replica_worker.start()
 
-    if not token:
-        raise RuntimeError("TELEGRAM_BOT_TOKEN is not set")
 
-    app = ApplicationBuilder().token(token).build()
+async def on_shutdown(app):
+    await message_batcher.close()
+    await replica_worker.stop()
+    await notion_worker.stop()
+    await loop_monitor.stop()
+    io_executor.shutdown()
+    local_replica.close()
+
+
+def build_application(builder: ApplicationBuilder | None = None):
+    """
+    Monta o Application com todos os handlers. `builder` permite trocar
+    opções de transporte (ex.: base_url de um Bot API falso no load test).
+    """
+    token = settings.require("telegram_bot_token")
+
+    app = (
+        (builder or ApplicationBuilder())
+        .token(token)
+        # paralelo entre chats, em ordem dentro de cada chat
+        .concurrent_updates(ChatOrderedUpdateProcessor())
+        # envios e edições passam pela fila com os limites do Telegram
+        .rate_limiter(flood_limiter)
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
 
 
     app.add_handler(
         CallbackQueryHandler(
             handle_finance_confirmation,
-            pattern=r"^finance:(confirm|cancel)$"
+            pattern=r"^finance:(confirm|cancel)(:\d+)?$"
         ),
         group=0
     )   
@@ -85,19 +228,64 @@ def run_bot():
     app.add_handler(
         CallbackQueryHandler(
             handle_memory_confirmation,
-            pattern=r"^memory:(confirm|cancel)$"
+            pattern=r"^memory:(confirm|cancel)(:\d+)?$"
         )
     )
 
+    # 🔹 PAGINAÇÃO DE /ultimas
+    app.add_handler(
+        CallbackQueryHandler(handle_memories_page, pattern=r"^mem:[on]:")
+    )
+
     # 🔹 COMANDOS
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CommandHandler("help", handle_help))
     app.add_handler(CommandHandler("ultimas", handle_list_memories))
     app.add_handler(CommandHandler("resync_notion", handle_resync_notion))
+    app.add_handler(CommandHandler("resumo", handle_monthly_summary))
+    app.add_handler(CommandHandler("previsao", handle_cash_flow_forecast))
+    app.add_handler(CommandHandler("stats", handle_stats))
+    app.add_handler(CommandHandler("health", handle_health))
+    # 🔹 EXTRATOS (CSV/OFX)
+    # block=False: uma importação longa não segura os outros updates do chat
+    app.add_handler(
+        MessageHandler(filters.Document.ALL, handle_statement_document, block=False)
+    )
+
     # 🔹 TEXTO LIVRE
+    # block=False: mensagens em rajada chegam juntas ao micro-batcher
     app.add_handler(
-        MessageHandler(filters.TEXT & ~filters.COMMAND, route_message)
+        MessageHandler(filters.TEXT & ~filters.COMMAND, route_message, block=False)
     )
 
+    return app
+
+
+def run_bot():
+    if is_ingress():
+        from app.bot.ingress import run_ingress
+
+        run_ingress()
+        return
+
+    app = build_application()
+
+    if is_worker():
+        # o ingress registra o webhook e repassa os updates deste worker
+        from app.bot.ingress import run_worker
+
+        print("Telegram bot worker is running (webhook)...")
+        run_worker(app)
+        return
+
+    if BOT_MODE == "webhook":
+        print("Telegram bot is running (webhook)...")
+        app.run_webhook(**webhook_options())
+        return
+
     print("Telegram bot is running...")
     app.run_polling()
+
+
+if __name__ == "__main__":
+    run_bot()
@@ -0,0 +1,53 @@
+import os
+from typing import Dict, Optional
+
+from telegram import Update
+
+# polling (padrão) ou webhook
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+
+# URL pública registrada no Telegram (ex.: https://bot.exemplo.com)
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "telegram")
+WEBHOOK_SECRET_TOKEN = os.getenv("WEBHOOK_SECRET_TOKEN")
+
+# >1 sobe um ingress em WEBHOOK_PORT e N workers em WEBHOOK_PORT+1..N
+BOT_WORKERS = int(os.getenv("BOT_WORKERS", "1"))
+
+# definido pelo ingress em cada processo worker
+BOT_WORKER_INDEX = os.getenv("BOT_WORKER_INDEX")
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def webhook_options(port: Optional[int] = None) -> Dict:
+    """
+    Argumentos de Application.run_webhook / Updater.start_webhook.
+
+    O secret token é obrigatório: o PTB responde 403 a qualquer POST sem o
+    header X-Telegram-Bot-Api-Secret-Token correto.
+    """
+    if not WEBHOOK_URL:
+        raise RuntimeError("WEBHOOK_URL is not set")
+
+    if not WEBHOOK_SECRET_TOKEN:
+        raise RuntimeError("WEBHOOK_SECRET_TOKEN is not set")
+
+    return {
+        "listen": WEBHOOK_LISTEN,
+        "port": port or WEBHOOK_PORT,
+        "url_path": WEBHOOK_PATH,
+        "webhook_url": f"{WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+        "secret_token": WEBHOOK_SECRET_TOKEN,
+        "allowed_updates": Update.ALL_TYPES,
+    }
+
+
+def is_ingress() -> bool:
+    return BOT_MODE == "webhook" and BOT_WORKERS > 1 and BOT_WORKER_INDEX is None
+
+
+def is_worker() -> bool:
+    return BOT_MODE == "webhook" and BOT_WORKER_INDEX is not None
@@ -0,0 +1,43 @@
+import os
+from dataclasses import dataclass, fields
+from typing import Optional
+
+from dotenv import load_dotenv
+
+# Única leitura do .env do processo. Variáveis já definidas no ambiente
+# têm prioridade sobre o arquivo.
+load_dotenv()
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Credenciais e IDs externos, lidos uma vez na inicialização.
+
+    Nada é validado aqui: cada cliente chama require() no primeiro uso,
+    então subir o bot sem, por exemplo, o Notion configurado só falha
+    quando algo tenta sincronizar com o Notion.
+    """
+
+    telegram_bot_token: Optional[str] = None
+    openai_api_key: Optional[str] = None
+    supabase_url: Optional[str] = None
+    supabase_service_key: Optional[str] = None
+    notion_api_token: Optional[str] = None
+    notion_finance_db_id: Optional[str] = None
+    notion_reminders_db_id: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(**{f.name: os.getenv(f.name.upper()) for f in fields(cls)})
+
+    def require(self, name: str) -> str:
+        value = getattr(self, name)
+
+        if not value:
+            raise RuntimeError(f"{name.upper()} is not set")
+
+        return value
+
+
+settings = Settings.from_env()
@@ -0,0 +1,32 @@
+import streamlit as st
+import pandas as pd
+from app.modules.finance.finance_service import FinanceService
+from app.modules.finance.forecast import MAX_MONTHS
+
+def render_forecast(service: FinanceService):
+    st.subheader("🔮 Previsão de caixa")
+
+    months = st.slider("Meses à frente", 1, MAX_MONTHS, 6)
+
+    forecast = service.get_cash_flow_forecast(months)
+
+    if not any(m["inflow"] or m["outflow"] for m in forecast):
+        st.info("Nenhum lançamento futuro no período.")
+        return
+
+    df = pd.DataFrame([
+        {
+            # AAAA-MM: o gráfico ordena o eixo pelo texto
+            "Mês": m["month"].strftime("%Y-%m"),
+            "Entradas": m["inflow"],
+            "Saídas": m["outflow"],
+            "Parcelas": m["installments"],
+            "Nº parcelas": m["installment_count"],
+            "Acumulado": m["cumulative"],
+        }
+        for m in forecast
+    ])
+
+    st.bar_chart(df.set_index("Mês")[["Entradas", "Saídas"]])
+
+    st.dataframe(df, use_container_width=True, hide_index=True)
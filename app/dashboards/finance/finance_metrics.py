@@ -1,8 +1,6 @@
 import streamlit as st
 
-def render_metrics(df):
-    income = df[df["type"] == "income"]["amount"].sum()
-    expense = df[df["type"] == "expense"]["amount"].sum()
+def render_metrics(income: float, expense: float):
     balance = income - expense
 
     col1, col2, col3 = st.columns(3)
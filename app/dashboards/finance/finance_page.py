@@ -1,12 +1,24 @@
 import streamlit as st
 import pandas as pd
+from collections import deque
 from datetime import date
+from app.infra.replica import local_replica
 from app.modules.finance.repository import FinanceRepository
 from app.dashboards.finance.finance_metrics import render_metrics
+from app.dashboards.finance.finance_forecast import render_forecast
+from app.modules.finance.finance_service import FinanceService
+from app.modules.finance.installment_service import InstallmentService
+
+# Linhas exibidas na tabela; as métricas consideram o período inteiro
+TABLE_ROWS = 500
+
+TABLE_COLUMNS = "transaction_date,description,amount,transaction_type,category"
 
 def finance_page():
     st.subheader("💰 Financeiro")
 
+    # o dashboard não tem o worker do bot: puxa as mudanças ao abrir
+    local_replica.refresh()
     repo = FinanceRepository()
 
     col1, col2 = st.columns(2)
@@ -15,17 +27,34 @@ def finance_page():
     with col2:
         end_date = st.date_input("Data final", date.today())
 
-    transactions = repo.list_by_period(start_date, end_date)
+    # lê em páginas: soma as métricas e guarda só as últimas linhas
+    income = 0.0
+    expense = 0.0
+    recent = deque(maxlen=TABLE_ROWS)
+
+    for chunk in repo.iter_chunks(start_date, end_date, columns=TABLE_COLUMNS):
+        for row in chunk:
+            amount = float(row["amount"])
+            if amount >= 0:
+                income += amount
+            else:
+                expense += -amount
+
+        recent.extend(chunk)
 
-    if not transactions:
+    if not recent:
         st.warning("Nenhuma transação encontrada.")
-        return
+    else:
+        render_metrics(income, expense)
 
-    df = pd.DataFrame(transactions)
+        df = pd.DataFrame(list(recent)).drop(columns=["id"], errors="ignore")
 
-    render_metrics(df)
+        st.dataframe(
+            df.sort_values("transaction_date", ascending=False),
+            use_container_width=True
+        )
 
-    st.dataframe(
-        df.sort_values("date", ascending=False),
-        use_container_width=True
+    # independe do período escolhido: sempre de hoje em diante
+    render_forecast(
+        FinanceService(repository=repo, installment_service=InstallmentService())
     )
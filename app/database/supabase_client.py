@@ -1,25 +1,14 @@
-import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING
 
-load_dotenv()  # <-- carrega o .env automaticamente
+from app.infra.registry import clients
 
-_SUPABASE_CLIENT: Client | None = None
+if TYPE_CHECKING:
+    from supabase import Client
 
 
-def get_supabase_client() -> Client:
+def get_supabase_client() -> "Client":
     """
-    Returns a singleton Supabase client.
+    Returns the singleton Supabase client (kept for backwards compatibility;
+    the instance lives in app.infra.registry).
     """
-    global _SUPABASE_CLIENT
-
-    if _SUPABASE_CLIENT is None:
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
-
-        if not supabase_url or not supabase_key:
-            raise RuntimeError("Supabase environment variables are not set")
-
-        _SUPABASE_CLIENT = create_client(supabase_url, supabase_key)
-
-    return _SUPABASE_CLIENT
+    return clients.supabase()
@@ -0,0 +1,140 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.ai.metrics import LatencyStats
+
+# Threads para I/O bloqueante (Supabase, Notion)
+IO_WORKERS = int(os.getenv("IO_EXECUTOR_WORKERS", "8"))
+
+# Chamadas além disso esperam no loop (backpressure) em vez de empilhar
+IO_MAX_QUEUE = int(os.getenv("IO_EXECUTOR_MAX_QUEUE", "64"))
+
+# Intervalo de amostragem do monitor de lag do event loop
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", "0.5"))
+
+
+class BlockingExecutor:
+    """
+    Pool limitado de threads para as chamadas síncronas de Supabase e Notion,
+    para que elas nunca travem o event loop do bot.
+
+    Expõe a profundidade da fila (esperando thread) e os tempos de espera
+    e execução por nome de operação.
+    """
+
+    def __init__(self, max_workers: int = IO_WORKERS, max_queue: int = IO_MAX_QUEUE):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self.stats = LatencyStats()
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._queued = 0
+        self._running = 0
+        self._lock = threading.Lock()
+
+    async def run(self, fn: Callable, /, *args, **kwargs) -> Any:
+        name = getattr(fn, "__qualname__", repr(fn))
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+
+        async with self._slots:
+            submitted = time.perf_counter()
+
+            with self._lock:
+                self._queued += 1
+
+            def call():
+                started = time.perf_counter()
+
+                with self._lock:
+                    self._queued -= 1
+                    self._running += 1
+
+                self.stats.record("wait", started - submitted)
+
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    with self._lock:
+                        self._running -= 1
+
+                    self.stats.record(name, time.perf_counter() - started)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), call)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queued": self._queued,
+                "running": self._running,
+                "max_workers": self.max_workers,
+                "timings": self.stats.snapshot(),
+            }
+
+    def shutdown(self) -> None:
+        if self._pool:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="io"
+            )
+        return self._pool
+
+
+class LoopLagMonitor:
+    """
+    Mede quanto o event loop ficou travado: acorda a cada `interval`
+    segundos e registra o atraso em relação ao horário esperado.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL):
+        self.interval = interval
+        self.stats = LatencyStats()
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> Dict[str, float]:
+        lag = self.stats.snapshot().get("lag", {"p50_ms": 0.0, "p99_ms": 0.0})
+        return {
+            "p50_ms": lag["p50_ms"],
+            "p99_ms": lag["p99_ms"],
+            "max_ms": self.max_lag * 1000,
+        }
+
+    async def _watch(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+
+            lag = max(0.0, time.perf_counter() - expected)
+            self.max_lag = max(self.max_lag, lag)
+            self.stats.record("lag", lag)
+
+
+# Instâncias únicas do processo
+io_executor = BlockingExecutor()
+loop_monitor = LoopLagMonitor()
@@ -1,14 +1,38 @@
-import os
-from notion_client import Client
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Dict, Optional
 
-load_dotenv()
+from app.infra.registry import clients
 
+if TYPE_CHECKING:
+    from notion_client import Client
 
-def get_notion_client() -> Client:
-    token = os.getenv("NOTION_API_TOKEN")
 
-    if not token:
-        raise RuntimeError("NOTION_API_TOKEN is not set")
+def get_notion_client() -> "Client":
+    return clients.notion()
 
-    return Client(auth=token)
+
+# database_id → data_source_id, resolvido uma vez por processo
+_data_sources: Dict[str, str] = {}
+
+
+def find_page(notion: "Client", database_id: str, property_name: str, value: str) -> Optional[str]:
+    """
+    Id da página da database cuja propriedade rich_text `property_name` é
+    igual a `value`, ou None. Usado como chave de idempotência dos syncs.
+    """
+    response = notion.data_sources.query(
+        _data_source_id(notion, database_id),
+        filter={"property": property_name, "rich_text": {"equals": str(value)}},
+        page_size=1,
+    )
+    results = response.get("results") or []
+
+    return results[0]["id"] if results else None
+
+
+def _data_source_id(notion: "Client", database_id: str) -> str:
+    # a consulta é feita na fonte de dados da database (API 2025-09-03)
+    if database_id not in _data_sources:
+        database = notion.databases.retrieve(database_id=database_id)
+        _data_sources[database_id] = database["data_sources"][0]["id"]
+
+    return _data_sources[database_id]
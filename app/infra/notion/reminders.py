@@ -1,10 +1,5 @@
-import os
-from datetime import datetime
-from dotenv import load_dotenv
-
-from app.infra.notion.client import get_notion_client
-
-load_dotenv()
+from app.config import settings
+from app.infra.notion.client import find_page, get_notion_client
 
 
 def create_notion_reminder(
@@ -15,14 +10,12 @@ def create_notion_reminder(
     memory_id: str | None = None,
 ):
     """
-    Cria um lembrete no Notion Calendar.
+    Cria um lembrete no Notion Calendar. Com memory_id, atualiza o lembrete
+    que já tem o mesmo Memory ID: reenvios do outbox não duplicam páginas.
     """
 
     notion = get_notion_client()
-    database_id = os.getenv("NOTION_REMINDERS_DB_ID")
-
-    if not database_id:
-        raise RuntimeError("NOTION_REMINDERS_DB_ID is not set")
+    database_id = settings.require("notion_reminders_db_id")
 
     properties = {
         "Title": {
@@ -62,6 +55,10 @@ def create_notion_reminder(
             ]
         }
 
+    page_id = find_page(notion, database_id, "Memory ID", memory_id) if memory_id else None
+    if page_id:
+        return notion.pages.update(page_id=page_id, properties=properties)
+
     return notion.pages.create(
         parent={"database_id": database_id},
         properties=properties,
@@ -0,0 +1,35 @@
+from typing import TYPE_CHECKING
+
+from app.infra.registry import clients
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+
+def get_openai_client() -> "OpenAI":
+    """
+    Returns the process-wide OpenAI client (pooled, keep-alive).
+    """
+    return clients.openai()
+
+
+def get_async_openai_client() -> "AsyncOpenAI":
+    """
+    Returns the process-wide AsyncOpenAI client (pooled, keep-alive).
+    """
+    return clients.async_openai()
+
+
+class OpenAIClientMixin:
+    """
+    `client` / `async_client` resolvidos no primeiro uso, não no construtor:
+    criar um parser não importa o SDK nem monta o pool HTTP.
+    """
+
+    @property
+    def client(self) -> "OpenAI":
+        return get_openai_client()
+
+    @property
+    def async_client(self) -> "AsyncOpenAI":
+        return get_async_openai_client()
@@ -0,0 +1,249 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.infra.executor import io_executor
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_PATH = os.getenv("OUTBOX_PATH", "data/outbox.sqlite3")
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "5"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE_SECONDS", "2"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX_SECONDS", "600"))
+
+# Tempo que um job reservado fica invisível para outros workers
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "120"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_jobs_due
+    ON outbox_jobs (status, next_attempt_at);
+"""
+
+
+class Outbox:
+    """
+    Fila durável (SQLite) de efeitos externos — hoje, as escritas no Notion.
+
+    enqueue grava o job na mesma hora; OutboxWorker reserva lotes, executa
+    e marca como concluído, ou reagenda com backoff exponencial. Depois de
+    OUTBOX_MAX_ATTEMPTS o job vira "dead" e fica guardado para inspeção.
+
+    A reserva usa lease, então vários processos podem drenar o mesmo arquivo.
+    """
+
+    def __init__(self, path: str = OUTBOX_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        # chamado a cada enqueue para o worker não esperar o poll
+        self.on_enqueue: Optional[Callable[[], None]] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+
+        return self._conn
+
+    # =====================
+    # PRODUTOR
+    # =====================
+
+    def enqueue(self, kind: str, payload: Dict) -> None:
+        self.enqueue_many(kind, [payload])
+
+    def enqueue_many(self, kind: str, payloads: Iterable[Dict]) -> None:
+        now = time.time()
+        rows = [
+            (kind, json.dumps(payload, ensure_ascii=False, default=str), now, now)
+            for payload in payloads
+        ]
+
+        with self._lock:
+            self._db().executemany(
+                "INSERT INTO outbox_jobs (kind, payload, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+        if self.on_enqueue:
+            self.on_enqueue()
+
+    # =====================
+    # CONSUMIDOR
+    # =====================
+
+    def claim(self, limit: int = OUTBOX_BATCH_SIZE) -> List[Dict]:
+        now = time.time()
+
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = db.execute(
+                    "UPDATE outbox_jobs SET claimed_until = ? "
+                    "WHERE id IN ("
+                    "  SELECT id FROM outbox_jobs"
+                    "  WHERE status = 'pending' AND next_attempt_at <= ?"
+                    "  AND (claimed_until IS NULL OR claimed_until < ?)"
+                    "  ORDER BY id LIMIT ?"
+                    ") RETURNING id, kind, payload, attempts",
+                    (now + OUTBOX_LEASE_SECONDS, now, now, limit),
+                ).fetchall()
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+        return [
+            {"id": id_, "kind": kind, "payload": json.loads(payload), "attempts": attempts}
+            for id_, kind, payload, attempts in sorted(rows)
+        ]
+
+    def complete(self, job_ids: List[int]) -> None:
+        if not job_ids:
+            return
+
+        with self._lock:
+            self._db().executemany(
+                "DELETE FROM outbox_jobs WHERE id = ?", [(i,) for i in job_ids]
+            )
+
+    def fail(self, job: Dict, error: str) -> None:
+        attempts = job["attempts"] + 1
+        delay = min(OUTBOX_BACKOFF_MAX, OUTBOX_BACKOFF_BASE * 2 ** attempts)
+        status = "dead" if attempts >= OUTBOX_MAX_ATTEMPTS else "pending"
+
+        with self._lock:
+            self._db().execute(
+                "UPDATE outbox_jobs SET status = ?, attempts = ?, next_attempt_at = ?, "
+                "claimed_until = NULL, last_error = ? WHERE id = ?",
+                (status, attempts, time.time() + delay * random.uniform(0.5, 1), error[:500], job["id"]),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending, oldest = self._db().execute(
+                "SELECT COUNT(*), MIN(created_at) FROM outbox_jobs WHERE status = 'pending'"
+            ).fetchone()
+            dead = self._db().execute(
+                "SELECT COUNT(*) FROM outbox_jobs WHERE status = 'dead'"
+            ).fetchone()[0]
+
+        return {
+            "pending": pending,
+            "dead": dead,
+            "lag_seconds": time.time() - oldest if oldest else 0.0,
+        }
+
+
+class OutboxWorker:
+    """
+    Drena o Outbox em segundo plano, no io_executor, chamando o handler
+    registrado para o `kind` de cada job.
+    """
+
+    def __init__(self, outbox: Outbox, handlers: Dict[str, Callable[[Dict], Any]]):
+        self.outbox = outbox
+        self.handlers = handlers
+        self.processed = 0
+        self.failed = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        # enqueue normalmente roda numa thread do io_executor
+        self._wakeup = asyncio.Event()
+        self.outbox.on_enqueue = lambda: loop.call_soon_threadsafe(self._wakeup.set)
+
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        self.outbox.on_enqueue = None
+
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def drain_once(self) -> int:
+        jobs = await io_executor.run(self.outbox.claim)
+        if jobs:
+            await io_executor.run(self._process, jobs)
+        return len(jobs)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                handled = await self.drain_once()
+            except Exception:
+                logger.exception("Falha ao drenar o outbox")
+                handled = 0
+
+            # lote cheio: provavelmente tem mais esperando
+            if handled >= OUTBOX_BATCH_SIZE:
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def _process(self, jobs: List[Dict]) -> None:
+        for job in jobs:
+            handler = self.handlers.get(job["kind"])
+
+            try:
+                if handler is None:
+                    raise LookupError(f"Sem handler para {job['kind']}")
+
+                handler(job["payload"])
+
+            except Exception as e:
+                logger.warning("Job %s (%s) falhou: %s", job["id"], job["kind"], e)
+                self.outbox.fail(job, repr(e))
+                self.failed += 1
+                continue
+
+            # conclui job a job: se o processo cair no meio do lote, o que
+            # já chegou ao Notion não é reenviado quando o lease expirar
+            self.outbox.complete([job["id"]])
+            self.processed += 1
+
+
+# Outbox único do processo para escritas no Notion
+notion_outbox = Outbox()
@@ -0,0 +1,150 @@
+import os
+import threading
+from typing import Callable, Dict, TypeVar
+
+import httpx
+
+from app.config import settings
+
+T = TypeVar("T")
+
+# Pool compartilhado: cada backend mantém conexões HTTP/2 keep-alive,
+# então o caminho de cada mensagem não paga handshake TLS nem construção
+# de cliente.
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "60"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "20"))
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "20"))
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+class ClientRegistry:
+    """
+    Process-wide registry of lazily built, reused clients for OpenAI,
+    Supabase and Notion.
+
+    The SDKs themselves are imported inside each factory: importing the bot
+    costs nothing for a backend until the first call that uses it.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, factory: Callable[[], T]) -> T:
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+
+        with self._lock:
+            if name not in self._clients:
+                self._clients[name] = factory()
+
+            return self._clients[name]
+
+    # =====================
+    # CLIENTS
+    # =====================
+
+    def openai(self):
+        def build():
+            from openai import DefaultHttpxClient, OpenAI
+
+            return OpenAI(
+                api_key=settings.require("openai_api_key"),
+                timeout=OPENAI_TIMEOUT,
+                # retries ficam a cargo de app.ai.resilience
+                max_retries=0,
+                http_client=DefaultHttpxClient(http2=True, limits=_limits()),
+            )
+
+        return self._get("openai", build)
+
+    def async_openai(self):
+        def build():
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+            return AsyncOpenAI(
+                api_key=settings.require("openai_api_key"),
+                timeout=OPENAI_TIMEOUT,
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(http2=True, limits=_limits()),
+            )
+
+        return self._get("async_openai", build)
+
+    def supabase(self):
+        def build():
+            from supabase import create_client
+            from supabase.lib.client_options import SyncClientOptions
+
+            return create_client(
+                settings.require("supabase_url"),
+                settings.require("supabase_service_key"),
+                options=SyncClientOptions(
+                    httpx_client=httpx.Client(
+                        http2=True,
+                        limits=_limits(),
+                        timeout=SUPABASE_TIMEOUT,
+                        follow_redirects=True,
+                    ),
+                ),
+            )
+
+        return self._get("supabase", build)
+
+    def notion(self):
+        def build():
+            from notion_client import Client
+
+            return Client(
+                auth=settings.require("notion_api_token"),
+                client=httpx.Client(http2=True, limits=_limits()),
+            )
+
+        return self._get("notion", build)
+
+    # =====================
+    # HEALTH
+    # =====================
+
+    def health_check(self) -> Dict[str, str]:
+        """
+        Faz uma chamada barata em cada backend e retorna {backend: "ok" | erro}.
+        """
+        checks = {
+            "openai": lambda: self.openai().models.list(),
+            "supabase": lambda: (
+                self.supabase().table("transactions").select("id").limit(1).execute()
+            ),
+            "notion": lambda: self.notion().users.me(),
+        }
+
+        results = {}
+        for name, check in checks.items():
+            try:
+                check()
+                results[name] = "ok"
+            except Exception as e:
+                results[name] = f"erro: {e}"
+
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self._clients = self._clients, {}
+
+        for name, client in clients.items():
+            close = getattr(client, "close", None)
+            if close and not name.startswith("async_"):
+                close()
+
+
+clients = ClientRegistry()
@@ -0,0 +1,537 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.ai.metrics import LatencyStats
+from app.infra.executor import io_executor
+from app.infra.supabase.client import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ENABLED = os.getenv("LOCAL_REPLICA_ENABLED", "false").lower() in ("1", "true", "yes")
+REPLICA_PATH = os.getenv("LOCAL_REPLICA_PATH", "data/replica.sqlite3")
+REPLICA_SYNC_SECONDS = float(os.getenv("LOCAL_REPLICA_SYNC_SECONDS", "30"))
+REPLICA_PAGE_SIZE = int(os.getenv("LOCAL_REPLICA_PAGE_SIZE", "1000"))
+
+# updated_at vem do início da transação no Postgres: uma escrita longa pode
+# commitar depois de outra mais nova. Cada pull relê essa janela antes do
+# watermark (upserts são idempotentes).
+REPLICA_OVERLAP_SECONDS = float(os.getenv("LOCAL_REPLICA_OVERLAP_SECONDS", "120"))
+
+# Réplica sem pull bem-sucedido há mais que isso não atende leituras
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("LOCAL_REPLICA_MAX_LAG_SECONDS", "600"))
+
+# tabela remota -> colunas guardadas fora do JSON, para filtro e índice
+TABLES = {
+    "transactions": ("transaction_date", "category", "transaction_type"),
+    "memory_notes": ("created_at", "memory_type"),
+}
+
+# Tombstones gravados por trigger nos deletes (supabase/migrations/*_replica_watermarks.sql)
+DELETIONS_TABLE = "replica_deletions"
+
+# colunas de data-hora normalizadas (UTC, microssegundos) para comparar como texto
+TIMESTAMP_COLUMNS = {"created_at", "updated_at"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    transaction_date TEXT,
+    category TEXT,
+    transaction_type TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_date_id
+    ON transactions (transaction_date, id);
+CREATE INDEX IF NOT EXISTS transactions_category_date
+    ON transactions (category, transaction_date);
+CREATE INDEX IF NOT EXISTS transactions_type_date
+    ON transactions (transaction_type, transaction_date);
+
+CREATE TABLE IF NOT EXISTS memory_notes (
+    id TEXT PRIMARY KEY,
+    created_at TEXT,
+    memory_type TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS memory_notes_created_id
+    ON memory_notes (created_at, id);
+CREATE INDEX IF NOT EXISTS memory_notes_type_created
+    ON memory_notes (memory_type, created_at);
+
+CREATE TABLE IF NOT EXISTS replica_state (
+    source TEXT PRIMARY KEY,
+    watermark_at TEXT,
+    watermark_id TEXT,
+    synced_at REAL
+);
+"""
+
+
+def _utc(value: Any) -> Optional[str]:
+    """
+    Data-hora ISO em UTC com microssegundos fixos: a ordem do texto é a
+    ordem do tempo, qualquer que seja o formato que o PostgREST devolveu.
+    """
+    if not value:
+        return None
+
+    moment = datetime.fromisoformat(str(value))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+class LocalReplica:
+    """
+    Cópia local (SQLite em WAL) de transactions e memory_notes para leituras
+    sem ida à rede.
+
+    - pull() traz só o que mudou desde o último watermark (updated_at, id),
+      em páginas keyset, e aplica os deletes registrados em replica_deletions.
+    - apply() grava na réplica as linhas que acabaram de ser escritas no
+      Supabase, para o próprio processo ler o que escreveu antes do próximo pull.
+    - ready() diz se a réplica pode atender leituras: habilitada, com pull
+      completo e atraso menor que REPLICA_MAX_LAG_SECONDS. Senão, os
+      repositórios leem do Supabase.
+
+    Várias instâncias (workers do bot, dashboard) podem usar o mesmo arquivo.
+    """
+
+    def __init__(self, path: str = REPLICA_PATH, enabled: bool = REPLICA_ENABLED):
+        self.path = path
+        self.enabled = enabled
+        self.reads = LatencyStats()
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # todas as conexões de leitura abertas, para o close()
+        self._readers: List[sqlite3.Connection] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _db(self) -> sqlite3.Connection:
+        """
+        Conexão de escrita, compartilhada sob self._lock.
+        """
+        if self._conn is None:
+            conn = self._connect()
+            conn.executescript(SCHEMA)
+            self._conn = conn
+
+        return self._conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """
+        Uma conexão de leitura por thread: no WAL, leitores não esperam o
+        escritor nem uns aos outros.
+        """
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            self._db()
+            conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+
+            with self._lock:
+                self._readers.append(conn)
+
+        return conn
+
+    def close(self) -> None:
+        """
+        Fecha a conexão de escrita e as de leitura de todas as threads.
+        Chamar no shutdown, depois do io_executor parar; um uso posterior
+        reabre as conexões.
+        """
+        with self._lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+            self._local = threading.local()
+
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # =====================
+    # ESTADO
+    # =====================
+
+    def ready(self, table: str) -> bool:
+        if not self.enabled:
+            return False
+
+        try:
+            row = self._reader().execute(
+                "SELECT synced_at FROM replica_state WHERE source = ?", (table,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Réplica local indisponível: %s", e)
+            return False
+
+        return bool(row and row[0]) and time.time() - row[0] <= REPLICA_MAX_LAG_SECONDS
+
+    def stats(self) -> Dict[str, Any]:
+        reader = self._reader()
+
+        counts = {
+            table: reader.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in TABLES
+        }
+        oldest = reader.execute("SELECT MIN(synced_at) FROM replica_state").fetchone()[0]
+        reads = self.reads.snapshot().get("local", {})
+
+        return {
+            **counts,
+            "lag_seconds": time.time() - oldest if oldest else None,
+            "reads": reads.get("count", 0),
+            "read_p50_ms": reads.get("p50_ms", 0.0),
+            "read_p99_ms": reads.get("p99_ms", 0.0),
+        }
+
+    # =====================
+    # SINCRONIZAÇÃO
+    # =====================
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Pull incremental de todas as tabelas; os deletes vêm por último, para
+        valer também sobre linhas trazidas neste mesmo ciclo.
+        """
+        return {source: self.pull(source) for source in (*TABLES, DELETIONS_TABLE)}
+
+    def refresh(self, max_age: float = REPLICA_SYNC_SECONDS) -> None:
+        """
+        Sincroniza se o último pull tem mais de `max_age` segundos. Para
+        processos sem o ReplicaSyncWorker (ex.: o dashboard).
+        """
+        if not self.enabled:
+            return
+
+        synced = self._reader().execute("SELECT MIN(synced_at) FROM replica_state").fetchone()[0]
+        if synced is None or time.time() - synced > max_age:
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning("Falha ao sincronizar a réplica local: %s", e)
+
+    def pull(self, source: str) -> int:
+        column = "deleted_at" if source == DELETIONS_TABLE else "updated_at"
+        supabase = get_supabase_client()
+
+        watermark = self._watermark(source)
+        since = None
+        if watermark:
+            since = datetime.fromisoformat(watermark[0]) - timedelta(seconds=REPLICA_OVERLAP_SECONDS)
+
+        cursor: Optional[Tuple[str, str]] = None
+        pulled = 0
+
+        while True:
+            query = supabase.table(source).select("*")
+
+            if since:
+                query = query.gte(column, since.isoformat() + "+00:00")
+
+            if cursor is not None:
+                at, row_id = cursor
+                query = query.or_(
+                    f'{column}.gt."{at}",and({column}.eq."{at}",id.gt.{row_id})'
+                )
+
+            rows = (
+                query
+                .order(column)
+                .order("id")
+                .limit(REPLICA_PAGE_SIZE)
+                .execute()
+            ).data or []
+
+            if not rows:
+                break
+
+            if source == DELETIONS_TABLE:
+                self._delete(rows)
+            else:
+                self._store(source, rows)
+
+            cursor = (rows[-1][column], rows[-1]["id"])
+            pulled += len(rows)
+
+            # avança a cada página: um pull interrompido continua daqui
+            self._advance(source, (_utc(cursor[0]), str(cursor[1])))
+
+        with self._lock:
+            self._db().execute(
+                "INSERT INTO replica_state (source, synced_at) VALUES (?, ?) "
+                "ON CONFLICT (source) DO UPDATE SET synced_at = excluded.synced_at",
+                (source, time.time()),
+            )
+
+        return pulled
+
+    def apply(self, table: str, rows: Iterable[Dict]) -> None:
+        """
+        Grava localmente linhas já confirmadas pelo Supabase. Nunca levanta:
+        uma falha aqui só atrasa a linha até o próximo pull.
+        """
+        if not self.enabled:
+            return
+
+        try:
+            self._store(table, list(rows))
+        except Exception as e:
+            logger.warning("Falha ao aplicar escrita na réplica local: %s", e)
+
+    # =====================
+    # LEITURAS
+    # =====================
+
+    def iter_transactions(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        columns: str = "*",
+        page_size: int = REPLICA_PAGE_SIZE,
+        descending: bool = False,
+    ) -> Iterator[List[Dict]]:
+        """
+        Mesma ordem e páginas de FinanceRepository.iter_chunks, lidas do
+        índice (transaction_date, id) local.
+        """
+        where, args = [], []
+
+        if start_date:
+            where.append("transaction_date >= ?")
+            args.append(start_date.isoformat())
+
+        if end_date:
+            where.append("transaction_date <= ?")
+            args.append(end_date.isoformat())
+
+        direction = "DESC" if descending else "ASC"
+        sql = "SELECT data FROM transactions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY transaction_date {direction}, id {direction}"
+
+        names = None if columns.strip() == "*" else [c.strip() for c in columns.split(",")]
+        rows = self._reader().execute(sql, args)
+
+        while True:
+            started = time.perf_counter()
+            page = rows.fetchmany(page_size)
+            self.reads.record("local", time.perf_counter() - started)
+
+            if not page:
+                return
+
+            chunk = [json.loads(data) for (data,) in page]
+            if names:
+                chunk = [{name: row.get(name) for name in names} for row in chunk]
+
+            yield chunk
+
+    def get(self, table: str, row_id: str) -> Optional[Dict]:
+        started = time.perf_counter()
+        row = self._reader().execute(
+            f"SELECT data FROM {table} WHERE id = ?", (str(row_id),)
+        ).fetchone()
+        self.reads.record("local", time.perf_counter() - started)
+
+        return json.loads(row[0]) if row else None
+
+    def memory_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+        before: Optional[Tuple[str, str]] = None,
+    ) -> Dict:
+        """
+        Mesma paginação keyset (created_at, id) de MemoryRepository.list_page.
+        """
+        started = time.perf_counter()
+        reader = self._reader()
+
+        if before is not None:
+            rows = reader.execute(
+                "SELECT data FROM memory_notes WHERE (created_at, id) > (?, ?) "
+                "ORDER BY created_at, id LIMIT ?",
+                (_utc(before[0]), str(before[1]), limit + 1),
+            ).fetchall()
+
+            page = {
+                "items": [json.loads(r[0]) for r in reversed(rows[:limit])],
+                "has_older": True,
+                "has_newer": len(rows) > limit,
+            }
+
+        else:
+            sql = "SELECT data FROM memory_notes"
+            args: List[Any] = []
+
+            if after is not None:
+                sql += " WHERE (created_at, id) < (?, ?)"
+                args += [_utc(after[0]), str(after[1])]
+
+            rows = reader.execute(
+                sql + " ORDER BY created_at DESC, id DESC LIMIT ?", (*args, limit + 1)
+            ).fetchall()
+
+            page = {
+                "items": [json.loads(r[0]) for r in rows[:limit]],
+                "has_older": len(rows) > limit,
+                "has_newer": after is not None,
+            }
+
+        self.reads.record("local", time.perf_counter() - started)
+        return page
+
+    # =====================
+    # INTERNAL
+    # =====================
+
+    def _store(self, table: str, rows: List[Dict]) -> None:
+        if not rows:
+            return
+
+        indexed = TABLES[table]
+        names = ("id", *indexed, "updated_at", "data")
+        updates = ", ".join(f"{n} = excluded.{n}" for n in names[1:])
+
+        values = [
+            (
+                str(row["id"]),
+                *(_utc(row.get(c)) if c in TIMESTAMP_COLUMNS else row.get(c) for c in indexed),
+                _utc(row.get("updated_at")),
+                json.dumps(row, ensure_ascii=False, default=str),
+            )
+            for row in rows
+        ]
+
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.executemany(
+                    f"INSERT INTO {table} ({', '.join(names)}) "
+                    f"VALUES ({', '.join('?' * len(names))}) "
+                    f"ON CONFLICT (id) DO UPDATE SET {updates}",
+                    values,
+                )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+    def _delete(self, tombstones: List[Dict]) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                for tombstone in tombstones:
+                    table = tombstone["table_name"]
+                    if table not in TABLES:
+                        continue
+
+                    if tombstone["row_id"] == "*":
+                        # TRUNCATE: some tudo o que existia até aquele momento
+                        db.execute(
+                            f"DELETE FROM {table} WHERE updated_at <= ?",
+                            (_utc(tombstone["deleted_at"]),),
+                        )
+                    else:
+                        db.execute(f"DELETE FROM {table} WHERE id = ?", (tombstone["row_id"],))
+
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+    def _watermark(self, source: str) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT watermark_at, watermark_id FROM replica_state WHERE source = ?",
+                (source,),
+            ).fetchone()
+
+        return tuple(row) if row and row[0] else None
+
+    def _advance(self, source: str, position: Tuple[str, str]) -> None:
+        # a janela de releitura começa antes do watermark: nunca voltar
+        with self._lock:
+            self._db().execute(
+                "INSERT INTO replica_state (source, watermark_at, watermark_id) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT (source) DO UPDATE SET "
+                "watermark_at = excluded.watermark_at, watermark_id = excluded.watermark_id "
+                "WHERE replica_state.watermark_at IS NULL "
+                "OR (excluded.watermark_at, excluded.watermark_id) "
+                "> (replica_state.watermark_at, replica_state.watermark_id)",
+                (source, *position),
+            )
+
+
+class ReplicaSyncWorker:
+    """
+    Puxa as mudanças do Supabase para a réplica a cada
+    REPLICA_SYNC_SECONDS, no io_executor.
+    """
+
+    def __init__(self, replica: LocalReplica, interval: float = REPLICA_SYNC_SECONDS):
+        self.replica = replica
+        self.interval = interval
+        self.pulled = 0
+        self.failed = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if not self.replica.enabled:
+            return
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                pulled = await io_executor.run(self.replica.sync)
+                self.pulled += sum(pulled.values())
+            except Exception:
+                logger.exception("Falha ao sincronizar a réplica local")
+                self.failed += 1
+
+            await asyncio.sleep(self.interval)
+
+
+# Réplica única do processo (desligada sem LOCAL_REPLICA_ENABLED)
+local_replica = LocalReplica()
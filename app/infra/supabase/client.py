@@ -1,14 +1,10 @@
-import os
-from dotenv import load_dotenv
-from supabase import create_client, Client
+from typing import TYPE_CHECKING
 
-load_dotenv()
+from app.infra.registry import clients
 
-def get_supabase_client() -> Client:
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_SERVICE_KEY")
+if TYPE_CHECKING:
+    from supabase import Client
 
-    if not url or not key:
-        raise RuntimeError("Supabase environment variables not set")
 
-    return create_client(url, key)
+def get_supabase_client() -> "Client":
+    return clients.supabase()
@@ -0,0 +1,45 @@
+"""
+Verifica os saldos incrementais (transaction_balances) contra a soma real
+das transações, e opcionalmente recalcula tudo.
+
+    python -m app.modules.finance.balance_check
+    python -m app.modules.finance.balance_check --repair
+"""
+
+import argparse
+
+from app.modules.finance.finance_service import FinanceService
+from app.modules.finance.installment_service import InstallmentService
+from app.modules.finance.repository import FinanceRepository
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verifica os saldos incrementais")
+    parser.add_argument("--repair", action="store_true", help="recalcula se divergir")
+    args = parser.parse_args()
+
+    service = FinanceService(
+        repository=FinanceRepository(),
+        installment_service=InstallmentService(),
+    )
+
+    drift = service.check_balance_consistency(repair=args.repair)
+
+    if not drift:
+        print("✅ Saldos consistentes")
+        return
+
+    print(f"{'período':<10}{'guardado':>14}{'real':>14}{'qtd guardada':>14}{'qtd real':>10}")
+    for row in drift:
+        print(
+            f"{row['period']:<10}{float(row['stored_balance']):>14.2f}"
+            f"{float(row['actual_balance']):>14.2f}"
+            f"{row['stored_count']:>14}{row['actual_count']:>10}"
+        )
+
+    if args.repair:
+        print("🔧 Saldos recalculados")
+
+
+if __name__ == "__main__":
+    main()
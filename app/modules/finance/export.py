@@ -0,0 +1,62 @@
+"""
+Exporta transações para CSV lendo o banco em páginas (memória constante).
+
+    python -m app.modules.finance.export transacoes.csv
+    python -m app.modules.finance.export setembro.csv --start 2026-09-01 --end 2026-09-30
+"""
+
+import argparse
+import csv
+from datetime import date
+from typing import IO, Optional
+
+from app.modules.finance.repository import FinanceRepository
+
+EXPORT_COLUMNS = (
+    "id",
+    "transaction_date",
+    "description",
+    "amount",
+    "transaction_type",
+    "category",
+    "is_installment",
+    "installment_number",
+    "installments_total",
+)
+
+
+def export_csv(
+    repository: FinanceRepository,
+    output: IO[str],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> int:
+    """
+    Escreve as transações do período em `output` e retorna quantas foram.
+    """
+    writer = csv.DictWriter(output, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+
+    written = 0
+    for chunk in repository.iter_chunks(start_date, end_date, columns=",".join(EXPORT_COLUMNS)):
+        writer.writerows(chunk)
+        written += len(chunk)
+
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Exporta transações para CSV")
+    parser.add_argument("output")
+    parser.add_argument("--start", type=date.fromisoformat)
+    parser.add_argument("--end", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    with open(args.output, "w", encoding="utf-8", newline="") as f:
+        written = export_csv(FinanceRepository(), f, args.start, args.end)
+
+    print(f"✅ {written} transações exportadas para {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
-from datetime import datetime, date
-from typing import Optional, List
+import calendar
+from datetime import datetime, date, timedelta
+from typing import Dict, Optional, List
 
+from app.infra.outbox import Outbox
 from app.modules.finance.repository import FinanceRepository
 from app.modules.finance.installment_service import InstallmentService
 from app.modules.finance.notion_sync_service import FinanceNotionSyncService
@@ -13,10 +15,12 @@ class FinanceService:
         repository: FinanceRepository,
         installment_service: InstallmentService,
         notion_sync_service: Optional[FinanceNotionSyncService] = None,
+        outbox: Optional[Outbox] = None,
     ):
         self.repository = repository
         self.installment_service = installment_service
         self.notion_sync_service = notion_sync_service
+        self.outbox = outbox
 
     # =====================
     # CREATE
@@ -91,9 +95,107 @@ class FinanceService:
     # READ
     # =====================
 
-    def get_balance(self) -> float:
-        transactions = self.repository.get_all()
-        return sum(t["amount"] for t in transactions)
+    def get_balance(self, month: Optional[date] = None) -> float:
+        """
+        Saldo total, ou só do mês de `month`.
+        """
+        return self.get_totals(month)["balance"]
+
+    def get_totals(self, month: Optional[date] = None) -> Dict:
+        """
+        {"balance", "income", "expense", "tx_count"} do histórico inteiro ou
+        do mês de `month`.
+
+        Lê a linha mantida por trigger em transaction_balances (O(1)); se a
+        tabela não estiver disponível, soma no servidor com transaction_totals.
+        """
+        period = month.strftime("%Y-%m") if month else "all"
+
+        try:
+            row = self.repository.get_balance_row(period)
+        except Exception as e:
+            print(f"[WARN] Saldo incremental indisponível, usando agregação: {e}")
+            start, end = self._month_range(month) if month else (None, None)
+            row = self.repository.aggregate_totals(start, end)
+
+        row = row or {}
+        return {
+            "balance": float(row.get("balance") or 0),
+            "income": float(row.get("income") or 0),
+            "expense": float(row.get("expense") or 0),
+            "tx_count": int(row.get("tx_count") or 0),
+        }
+
+    def get_monthly_summary(self, month: date) -> Dict:
+        """
+        Resumo do mês a partir de transaction_rollups: entradas, saídas,
+        saldo, total em parcelas e gastos por categoria.
+        """
+        return self.get_monthly_summaries(month, month)[0]
+
+    def get_monthly_summaries(self, start_month: date, end_month: date) -> List[Dict]:
+        """
+        Um resumo por mês de start_month a end_month (inclusive), inclusive
+        os meses sem lançamentos. Lê só as linhas de rollup do intervalo.
+        """
+        rows = self.repository.get_rollups(start_month, end_month)
+
+        by_month: Dict[str, List[dict]] = {}
+        for row in rows:
+            by_month.setdefault(row["month"][:10], []).append(row)
+
+        summaries = []
+        month = start_month.replace(day=1)
+        while month <= end_month:
+            summaries.append(
+                self._summarize(month, by_month.get(month.isoformat(), []))
+            )
+            month = (month + timedelta(days=32)).replace(day=1)
+
+        return summaries
+
+    def get_cash_flow_forecast(
+        self,
+        months: int = 6,
+        start_date: Optional[date] = None,
+    ) -> List[Dict]:
+        """
+        Entradas e saídas já comprometidas (parcelas e demais lançamentos
+        com data futura), mês a mês, de start_date (padrão: hoje) até
+        `months` meses à frente. O primeiro mês conta só a partir de
+        start_date; "cumulative" é o saldo comprometido acumulado.
+        """
+        # numpy só é importado aqui: não pesa no cold start do bot
+        from app.modules.finance.forecast import FORECAST_COLUMNS, CashFlowProjection
+
+        projection = CashFlowProjection(start_date or date.today(), months)
+
+        for chunk in self.repository.iter_chunks(
+            projection.start_date, projection.end_date, columns=FORECAST_COLUMNS
+        ):
+            projection.add(chunk)
+
+        return projection.result()
+
+    def rebuild_rollups(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> None:
+        self.repository.rebuild_rollups(start_date, end_date)
+
+    def check_balance_consistency(self, repair: bool = False) -> List[dict]:
+        """
+        Compara os saldos guardados com a soma real das transações e
+        retorna os períodos divergentes; com repair=True recalcula tudo.
+        """
+        drift = self.repository.check_balances()
+
+        if drift and repair:
+            print(f"[WARN] {len(drift)} períodos com saldo divergente; recalculando")
+            self.repository.rebuild_balances()
+
+        return drift
 
     def get_statement(
         self,
@@ -107,17 +209,71 @@ class FinanceService:
     # INTERNAL
     # =====================
 
+    @staticmethod
+    def _summarize(month: date, rows: List[dict]) -> Dict:
+        income = expense = installments = 0.0
+        tx_count = 0
+        categories = []
+
+        for row in rows:
+            total = float(row["total"])
+            tx_count += row["tx_count"]
+
+            if row["transaction_type"] == "income":
+                income += total
+            else:
+                expense += -total
+                installments += -float(row["installment_total"])
+
+            categories.append({
+                "category": row["category"],
+                "type": row["transaction_type"],
+                "total": abs(total),
+                "count": row["tx_count"],
+            })
+
+        categories.sort(key=lambda c: c["total"], reverse=True)
+
+        return {
+            "month": month,
+            "income": round(income, 2),
+            "expense": round(expense, 2),
+            "balance": round(income - expense, 2),
+            "installments": round(installments, 2),
+            "tx_count": tx_count,
+            "categories": categories,
+        }
+
+    @staticmethod
+    def _month_range(month: date):
+        last_day = calendar.monthrange(month.year, month.month)[1]
+        return month.replace(day=1), month.replace(day=last_day)
+
     @staticmethod
     def _validate_amount(amount: float):
         if amount <= 0:
             raise ValueError("O valor deve ser maior que zero")
 
     def _sync_notion_safe(self, transactions: List[dict]):
+        # com outbox: só grava o job; o OutboxWorker sincroniza depois,
+        # com retry, sem segurar a confirmação do usuário.
+        # O enqueue não é atômico com o save no Supabase: se o processo cair
+        # entre os dois, a transação fica sem job. O /resync_notion reconcilia
+        # (sync_transaction atualiza a página existente em vez de duplicar).
+        if self.outbox:
+            try:
+                self.outbox.enqueue_many("notion_finance", transactions)
+            except Exception as e:
+                # a transação já está salva: repetir a ação duplicaria o lançamento
+                print(f"[WARN] Falha ao enfileirar sync com Notion: {e}")
+            return
+
         if not self.notion_sync_service:
             return
 
-        try:
-            self.notion_sync_service.sync(transactions)
-        except Exception as e:
-            # Nunca quebrar o fluxo financeiro por falha externa
-            print(f"[WARN] Falha ao sincronizar com Notion: {e}")
+        for transaction in transactions:
+            try:
+                self.notion_sync_service.sync_transaction(transaction)
+            except Exception as e:
+                # Nunca quebrar o fluxo financeiro por falha externa
+                print(f"[WARN] Falha ao sincronizar com Notion: {e}")
@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable, List
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+# Só o necessário para os baldes mensais; o sinal de amount diz entrada/saída
+FORECAST_COLUMNS = "transaction_date,amount,is_installment"
+
+MAX_MONTHS = 36
+
+
+def month_index(dates: Iterable[str], start_month: date) -> np.ndarray:
+    """
+    Índice do mês de cada data (0 = mês de start_month), em uma operação
+    vetorizada: datetime64[D] → datetime64[M] → diferença em meses.
+    """
+    months = np.asarray(dates, dtype="datetime64[D]").astype("datetime64[M]")
+    return (months - np.datetime64(start_month, "M")).astype(np.int64)
+
+
+class CashFlowProjection:
+    """
+    Entradas e saídas comprometidas por mês, de start_date até `months`
+    meses à frente (o mês de start_date é o primeiro).
+
+    add() recebe lotes de transações (ex.: FinanceRepository.iter_chunks)
+    e soma cada lote nos baldes com np.bincount, em centavos inteiros: o
+    custo é por lote, não por linha, e a memória não depende do histórico.
+    """
+
+    def __init__(self, start_date: date, months: int):
+        if not 1 <= months <= MAX_MONTHS:
+            raise ValueError(f"O horizonte deve ter de 1 a {MAX_MONTHS} meses")
+
+        self.start_date = start_date
+        self.start_month = start_date.replace(day=1)
+        self.months = months
+
+        self.inflow = np.zeros(months, dtype=np.int64)
+        self.outflow = np.zeros(months, dtype=np.int64)
+        self.installments = np.zeros(months, dtype=np.int64)
+        self.installment_count = np.zeros(months, dtype=np.int64)
+
+    @property
+    def end_date(self) -> date:
+        return self.start_month + relativedelta(months=self.months) - timedelta(days=1)
+
+    def add(self, rows: List[Dict]) -> None:
+        if not rows:
+            return
+
+        # o único trabalho por linha é tirar os campos dos dicts
+        index = month_index([r["transaction_date"][:10] for r in rows], self.start_month)
+        cents = np.rint(
+            np.array([r["amount"] for r in rows], dtype=np.float64) * 100
+        ).astype(np.int64)
+        installment = np.array([r.get("is_installment") for r in rows], dtype=bool)
+
+        inside = (index >= 0) & (index < self.months)
+        index, cents, installment = index[inside], cents[inside], installment[inside]
+
+        income = cents > 0
+        expense = cents < 0
+        planned = expense & installment
+
+        self.inflow += self._bucket(index[income], cents[income])
+        self.outflow += self._bucket(index[expense], -cents[expense])
+        self.installments += self._bucket(index[planned], -cents[planned])
+        self.installment_count += np.bincount(index[planned], minlength=self.months)
+
+    def result(self) -> List[Dict]:
+        net = self.inflow - self.outflow
+        cumulative = np.cumsum(net)
+
+        return [
+            {
+                "month": self.start_month + relativedelta(months=i),
+                "inflow": int(self.inflow[i]) / 100,
+                "outflow": int(self.outflow[i]) / 100,
+                "installments": int(self.installments[i]) / 100,
+                "installment_count": int(self.installment_count[i]),
+                "net": int(net[i]) / 100,
+                "cumulative": int(cumulative[i]) / 100,
+            }
+            for i in range(self.months)
+        ]
+
+    def _bucket(self, index: np.ndarray, cents: np.ndarray) -> np.ndarray:
+        # pesos float64 são exatos para somas de centavos abaixo de 2**53
+        return np.rint(
+            np.bincount(index, weights=cents, minlength=self.months)
+        ).astype(np.int64)
@@ -18,16 +18,16 @@ class InstallmentService:
         if installments < 2:
             raise ValueError("Parcelamento deve ter no mínimo 2 parcelas")
 
-        amount_per_installment = round(total_amount / installments, 2)
+        amounts = InstallmentService.split_amount(total_amount, installments)
 
         generated = []
 
-        for i in range(1, installments + 1):
+        for i, amount in enumerate(amounts, start=1):
             due_date = start_due_date + relativedelta(months=i - 1)
 
             generated.append({
                 "id": str(uuid.uuid4()),
-                "amount": amount_per_installment,
+                "amount": amount,
                 "description": description,
                 "category": category,
                 "type": transaction_type,
@@ -38,3 +38,20 @@ class InstallmentService:
             })
 
         return generated
+
+    @staticmethod
+    def split_amount(total_amount: float, installments: int) -> List[float]:
+        """
+        Divide o total em centavos inteiros: as primeiras parcelas levam o
+        centavo que sobra, e a soma das parcelas é exatamente o total
+        (R$ 100,00 em 3x → 33,34 + 33,33 + 33,33).
+        """
+        total_cents = round(total_amount * 100)
+        sign = -1 if total_cents < 0 else 1
+
+        base, remainder = divmod(abs(total_cents), installments)
+
+        return [
+            sign * (base + (1 if i < remainder else 0)) / 100
+            for i in range(installments)
+        ]
@@ -1,12 +1,7 @@
-import os
 from datetime import datetime
-from app.infra.notion.client import get_notion_client
 
-# ID da database de Finanças no Notion
-FINANCE_DB_ID = os.getenv("NOTION_FINANCE_DB_ID")
-
-if not FINANCE_DB_ID:
-    raise RuntimeError("NOTION_FINANCE_DB_ID não definida no ambiente")
+from app.config import settings
+from app.infra.notion.client import find_page, get_notion_client
 
 
 class FinanceNotionSyncService:
@@ -14,17 +9,30 @@ class FinanceNotionSyncService:
         # Usa o mesmo padrão do módulo Memory (lazy client)
         self.notion = get_notion_client()
 
+        # ID da database de Finanças no Notion (exigido só ao sincronizar)
+        self.database_id = settings.require("notion_finance_db_id")
+
     def sync_transaction(self, transaction: dict):
         """
-        Cria uma página no Notion para a transação ou parcela.
+        Cria uma página no Notion para a transação ou parcela, ou atualiza
+        a que já tem o mesmo Transaction ID: reenvios do outbox e o
+        /resync_notion não duplicam páginas.
         Mapper é defensivo para evitar KeyError.
         """
         print("🔁 Sync com Notion iniciado:", transaction.get("id"))
 
-        self.notion.pages.create(
-            parent={"database_id": FINANCE_DB_ID},
-            properties=self._map_properties(transaction)
-        )
+        properties = self._map_properties(transaction)
+        page_id = find_page(self.notion, self.database_id, "Transaction ID", transaction["id"])
+
+        if page_id:
+            # "Criado em" é da primeira sincronização
+            properties.pop("Criado em")
+            self.notion.pages.update(page_id=page_id, properties=properties)
+        else:
+            self.notion.pages.create(
+                parent={"database_id": self.database_id},
+                properties=properties
+            )
 
         print("✅ Sync com Notion finalizado")
 
@@ -43,15 +51,17 @@ class FinanceNotionSyncService:
         # 📝 Descrição
         description = t.get("description", "Sem descrição")
 
-        # 📅 Data (date para simples / due_date para parcelas)
+        # 📅 Data (date para simples / due_date para parcelas /
+        # transaction_date para linhas lidas do banco, ex.: resync)
         date_value = (
             t.get("date")
             or t.get("due_date")
+            or t.get("transaction_date")
             or datetime.utcnow().date().isoformat()
         )
 
         # 🔁 Tipo financeiro
-        tx_type = t.get("type", "expense")
+        tx_type = t.get("type") or t.get("transaction_type") or "expense"
 
         # 💰 Valor
         amount = float(t.get("amount", 0.0))
@@ -1,12 +1,30 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import date
 
+from app.infra.replica import local_replica
 from app.infra.supabase.client import get_supabase_client
 
+# (transaction_date, id) da última linha lida: posição no keyset
+Cursor = Tuple[str, str]
+
+# Abaixo do teto padrão de linhas do PostgREST no Supabase (1000)
+PAGE_SIZE = 1000
+
 
 class FinanceRepository:
     TABLE_NAME = "transactions"
 
+    # Saldos mantidos por trigger (supabase/migrations/*_transaction_balances.sql)
+    BALANCES_TABLE = "transaction_balances"
+    BALANCE_COLUMNS = "period,balance,income,expense,tx_count"
+
+    # Rollups por (mês, categoria, tipo), também mantidos por trigger
+    ROLLUPS_TABLE = "transaction_rollups"
+    ROLLUP_COLUMNS = (
+        "month,category,transaction_type,total,tx_count,"
+        "installment_total,installment_count"
+    )
+
     def __init__(self):
         self.supabase = get_supabase_client()
 
@@ -27,6 +45,8 @@ class FinanceRepository:
         if not response.data:
             raise RuntimeError("Failed to insert finance transaction")
 
+        local_replica.apply(self.TABLE_NAME, response.data)
+
         return response.data[0]
 
     def save_many(self, transactions: List[Dict]) -> List[Dict]:
@@ -42,55 +62,251 @@ class FinanceRepository:
         if not response.data:
             raise RuntimeError("Failed to insert finance transactions")
 
+        local_replica.apply(self.TABLE_NAME, response.data)
+
         return response.data
 
-    # =====================
-    # READ
-    # =====================
+    def save_imported(self, transactions: List[Dict]) -> List[Dict]:
+        """
+        Insere lançamentos importados de extrato ignorando os que já existem
+        (mesma import_hash). Retorna só as linhas realmente inseridas, que
+        pode ser uma lista vazia quando o lote inteiro já tinha sido importado.
+        """
+        if not transactions:
+            return []
+
+        payloads = [self._to_db_payload(t) for t in transactions]
 
-    def get_all(self) -> List[Dict]:
         response = (
             self.supabase
             .table(self.TABLE_NAME)
-            .select("*")
-            .order("transaction_date", desc=True)
+            .upsert(payloads, on_conflict="import_hash", ignore_duplicates=True)
             .execute()
         )
 
-        return response.data or []
+        saved = response.data or []
+        local_replica.apply(self.TABLE_NAME, saved)
+
+        return saved
+
+    # =====================
+    # READ
+    # =====================
+
+    def get_all(self) -> List[Dict]:
+        """
+        Todas as transações, da mais recente para a mais antiga. Materializa
+        a lista inteira: prefira iter_rows/iter_chunks.
+        """
+        return list(self.iter_rows(descending=True))
 
     def get_by_period(
         self,
         start_date: Optional[date],
         end_date: Optional[date],
     ) -> List[Dict]:
+        return list(self.iter_rows(start_date, end_date))
+
+    def iter_chunks(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        columns: str = "*",
+        page_size: int = PAGE_SIZE,
+        descending: bool = False,
+    ) -> Iterator[List[Dict]]:
+        """
+        Lê as transações do período em páginas de até `page_size` linhas,
+        por keyset em (transaction_date, id): cada página é uma consulta
+        indexada que continua de onde a anterior parou, sem OFFSET e sem
+        depender do teto de linhas do PostgREST.
+
+        `columns` é a projeção do select; transaction_date e id são
+        incluídos sempre, porque formam o cursor.
+
+        Com a réplica local pronta, as páginas vêm dela, na mesma ordem.
+        """
+        columns = self._with_cursor_columns(columns)
+
+        if local_replica.ready(self.TABLE_NAME):
+            yield from local_replica.iter_transactions(
+                start_date, end_date, columns, page_size, descending
+            )
+            return
+
+        op = "lt" if descending else "gt"
+        cursor: Optional[Cursor] = None
 
-        query = (
+        while True:
+            query = (
+                self.supabase
+                .table(self.TABLE_NAME)
+                .select(columns)
+            )
+
+            if start_date:
+                query = query.gte("transaction_date", start_date.isoformat())
+
+            if end_date:
+                query = query.lte("transaction_date", end_date.isoformat())
+
+            if cursor is not None:
+                query = query.or_(self._keyset_filter(op, cursor))
+
+            rows = self._fetch_page(
+                query
+                .order("transaction_date", desc=descending)
+                .order("id", desc=descending)
+                .limit(page_size)
+            )
+
+            # só para na página vazia: um teto de linhas do servidor menor
+            # que page_size encurta as páginas, mas não trunca a leitura
+            if not rows:
+                return
+
+            cursor = (rows[-1]["transaction_date"], rows[-1]["id"])
+
+            yield rows
+
+            # o consumidor já tem a página; não segurar uma cópia durante
+            # a busca da próxima
+            del rows
+
+    def iter_rows(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        columns: str = "*",
+        page_size: int = PAGE_SIZE,
+        descending: bool = False,
+    ) -> Iterator[Dict]:
+        """
+        Uma transação por vez, com memória constante (uma página por vez).
+        """
+        for chunk in self.iter_chunks(start_date, end_date, columns, page_size, descending):
+            yield from chunk
+
+    # =====================
+    # BALANCES
+    # =====================
+
+    def get_balance_row(self, period: str) -> Optional[Dict]:
+        """
+        Saldo guardado do período ('all' ou 'YYYY-MM'): uma busca por chave.
+        None quando o período não tem lançamentos.
+        """
+        response = (
             self.supabase
-            .table(self.TABLE_NAME)
-            .select("*")
+            .table(self.BALANCES_TABLE)
+            .select(self.BALANCE_COLUMNS)
+            .eq("period", period)
+            .limit(1)
+            .execute()
         )
 
-        if start_date:
-            query = query.gte("transaction_date", start_date.isoformat())
+        return response.data[0] if response.data else None
 
-        if end_date:
-            query = query.lte("transaction_date", end_date.isoformat())
+    def aggregate_totals(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict:
+        """
+        Soma feita no Postgres (RPC transaction_totals): não baixa as linhas
+        nem sofre com o teto de linhas do PostgREST.
+        """
+        response = self.supabase.rpc(
+            "transaction_totals",
+            {
+                "p_start": start_date.isoformat() if start_date else None,
+                "p_end": end_date.isoformat() if end_date else None,
+            },
+        ).execute()
+
+        return response.data[0]
 
-        response = query.order("transaction_date", desc=False).execute()
+    def check_balances(self) -> List[Dict]:
+        """
+        Períodos em que o saldo guardado diverge da soma das transações.
+        """
+        return self.supabase.rpc("check_transaction_balances", {}).execute().data or []
+
+    def rebuild_balances(self) -> None:
+        self.supabase.rpc("rebuild_transaction_balances", {}).execute()
+
+    # =====================
+    # ROLLUPS
+    # =====================
+
+    def get_rollups(self, start_month: date, end_month: date) -> List[Dict]:
+        """
+        Linhas de transaction_rollups dos meses de start_month a end_month
+        (inclusive): uma por (mês, categoria, tipo).
+        """
+        response = (
+            self.supabase
+            .table(self.ROLLUPS_TABLE)
+            .select(self.ROLLUP_COLUMNS)
+            .gte("month", start_month.replace(day=1).isoformat())
+            .lte("month", end_month.replace(day=1).isoformat())
+            .order("month")
+            .execute()
+        )
 
         return response.data or []
 
+    def rebuild_rollups(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> None:
+        self.supabase.rpc(
+            "rebuild_transaction_rollups",
+            {
+                "p_start": start_date.isoformat() if start_date else None,
+                "p_end": end_date.isoformat() if end_date else None,
+            },
+        ).execute()
+
     # =====================
     # INTERNAL
     # =====================
 
+    @staticmethod
+    def _with_cursor_columns(columns: str) -> str:
+        if columns.strip() == "*":
+            return columns
+
+        names = [c.strip() for c in columns.split(",") if c.strip()]
+        for required in ("transaction_date", "id"):
+            if required not in names:
+                names.append(required)
+
+        return ",".join(names)
+
+    @staticmethod
+    def _fetch_page(query) -> List[Dict]:
+        """
+        Só as linhas da página: o APIResponse (e o corpo HTTP que ele
+        referencia) sai de escopo aqui, antes da próxima página.
+        """
+        return query.execute().data or []
+
+    @staticmethod
+    def _keyset_filter(op: str, cursor: Cursor) -> str:
+        transaction_date, transaction_id = cursor
+        return (
+            f'transaction_date.{op}."{transaction_date}",'
+            f'and(transaction_date.eq."{transaction_date}",id.{op}.{transaction_id})'
+        )
+
     def _to_db_payload(self, transaction: Dict) -> Dict:
         """
         Traduz o modelo do domínio financeiro para o modelo do banco.
         """
 
-        return {
+        payload = {
             "description": transaction["description"],
             "amount": transaction["amount"],
             "transaction_type": transaction["type"],
@@ -100,3 +316,9 @@ class FinanceRepository:
             "installment_number": transaction.get("installment_number"),
             "installments_total": transaction.get("installments_total"),
         }
+
+        # só importações de extrato têm chave de deduplicação
+        if transaction.get("import_hash"):
+            payload["import_hash"] = transaction["import_hash"]
+
+        return payload
@@ -8,13 +8,14 @@ class FinanceResyncService:
         self.notion = FinanceNotionSyncService()
 
     def resync_all(self):
-        transactions = self.repo.list_all()
-
-        total = len(transactions)
+        # lê em páginas: memória constante mesmo com o histórico inteiro
+        total = 0
         success = 0
         failed = 0
 
-        for tx in transactions:
+        for tx in self.repo.iter_rows():
+            total += 1
+
             try:
                 self.notion.sync_transaction(tx)
                 success += 1
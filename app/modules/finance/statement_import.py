@@ -0,0 +1,399 @@
+import csv
+import hashlib
+import re
+from collections import Counter, OrderedDict
+from datetime import date, datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from app.ai.finance_rules import strip_accents
+from app.ai.statement_categorizer import StatementCategorizer
+from app.infra.outbox import Outbox
+from app.modules.finance.repository import FinanceRepository
+
+IMPORT_CHUNK_SIZE = 500
+
+# Datas cujas ocorrências o importador lembra (LRU). Tuplas iguais têm a
+# mesma data e extratos vêm agrupados por data: a janela mantém a contagem
+# com memória limitada, sem crescer com o arquivo.
+SEEN_DATES_WINDOW = 62
+
+# Cabeçalhos aceitos (sem acento, minúsculos) por campo
+DATE_COLUMNS = {"data", "date", "data lancamento", "data da transacao", "data movimento", "dt"}
+DESCRIPTION_COLUMNS = {
+    "descricao", "description", "historico", "lancamento", "memo", "title",
+    "estabelecimento", "identificacao",
+}
+AMOUNT_COLUMNS = {"valor", "amount", "valor (r$)", "valor r$", "quantia"}
+CREDIT_COLUMNS = {"credito", "entrada", "credit"}
+DEBIT_COLUMNS = {"debito", "saida", "debit"}
+
+# Convenção de sinal da coluna de valor: no extrato da conta, saídas vêm
+# negativas; na fatura do cartão, compras vêm positivas (e estornos e
+# pagamentos, negativos)
+BANK = "bank"
+CARD = "card"
+
+# Cabeçalhos que só aparecem em faturas (ex.: Nubank: date,title,amount)
+CARD_COLUMNS = {"title", "estabelecimento", "portador", "parcela", "cartao", "final do cartao"}
+CARD_FILENAME_RE = re.compile(r"fatura|cartao|card", re.IGNORECASE)
+
+CSV_DELIMITERS = ";,\t"
+
+THOUSANDS_ONLY_RE = re.compile(r"^-?\d{1,3}(\.\d{3})+$")
+
+OFX_TRANSACTION_RE = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.IGNORECASE | re.DOTALL)
+OFX_FIELD_RE = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+READ_SIZE = 64 * 1024
+
+
+class StatementFormatError(ValueError):
+    """
+    O arquivo não parece um extrato CSV/OFX suportado.
+    """
+
+
+# =====================
+# PARSING
+# =====================
+
+def parse_amount(raw: str) -> Optional[float]:
+    """
+    Aceita "1.234,56", "-45,90", "1234.56", "R$ 10,00" e "(10,00)".
+    """
+    value = raw.strip().replace("R$", "").replace(" ", "")
+    if not value:
+        return None
+
+    negative = value.startswith("(") and value.endswith(")")
+    value = value.strip("()")
+
+    if "," in value or THOUSANDS_ONLY_RE.match(value):
+        value = value.replace(".", "").replace(",", ".")
+
+    try:
+        amount = float(value)
+    except ValueError:
+        return None
+
+    return -abs(amount) if negative else amount
+
+
+def parse_date(raw: str) -> Optional[date]:
+    raw = raw.strip()[:10]
+
+    for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%d/%m/%y", "%d-%m-%Y", "%Y%m%d"):
+        try:
+            return datetime.strptime(raw, fmt).date()
+        except ValueError:
+            continue
+
+    return None
+
+
+def _detect_encoding(path: str) -> str:
+    with open(path, "rb") as f:
+        sample = f.read(READ_SIZE)
+
+    if b"CHARSET:1252" in sample.upper():
+        return "cp1252"
+
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # erro só no fim da amostra: caractere cortado ao meio
+        if e.start < len(sample) - 3:
+            return "cp1252"
+
+    return "utf-8-sig"
+
+
+def _guess_delimiter(sample: str) -> str:
+    """
+    Quando o Sniffer desiste: o separador mais frequente no cabeçalho
+    (";" no empate, o comum nos extratos de bancos brasileiros).
+    """
+    header = sample.splitlines()[0] if sample else ""
+    return max(CSV_DELIMITERS, key=header.count)
+
+
+def detect_convention(header: List[str], filename: str = "") -> str:
+    """
+    CARD para faturas de cartão (pelo cabeçalho ou pelo nome do arquivo),
+    BANK para o resto.
+    """
+    names = {strip_accents(h.strip().lower()) for h in header}
+
+    if names & CARD_COLUMNS or CARD_FILENAME_RE.search(strip_accents(filename)):
+        return CARD
+
+    return BANK
+
+
+def iter_csv_rows(
+    path: str,
+    filename: str = "",
+    convention: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    Linhas do CSV com amount já no sinal do repositório (saídas negativas).
+    `convention` (BANK/CARD) força a convenção de sinal; sem ela, é
+    detectada pelo cabeçalho e pelo nome do arquivo.
+    """
+    with open(path, encoding=_detect_encoding(path), newline="") as f:
+        sample = f.read(READ_SIZE)
+        f.seek(0)
+
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS)
+            reader = csv.reader(f, dialect)
+        except csv.Error:
+            reader = csv.reader(f, delimiter=_guess_delimiter(sample))
+
+        columns = None
+        sign = 1
+
+        for record in reader:
+            if columns is None:
+                columns = _map_columns(record)
+                if (convention or detect_convention(record, filename)) == CARD:
+                    sign = -1
+                continue
+
+            row = _csv_row(record, columns, sign)
+            if row:
+                yield row
+
+    if columns is None:
+        raise StatementFormatError("Arquivo vazio")
+
+
+def _map_columns(header: List[str]) -> Dict[str, int]:
+    names = [strip_accents(h.strip().lower()) for h in header]
+    columns = {}
+
+    for field, accepted in (
+        ("date", DATE_COLUMNS),
+        ("description", DESCRIPTION_COLUMNS),
+        ("amount", AMOUNT_COLUMNS),
+        ("credit", CREDIT_COLUMNS),
+        ("debit", DEBIT_COLUMNS),
+    ):
+        for i, name in enumerate(names):
+            if name in accepted:
+                columns[field] = i
+                break
+
+    if "date" not in columns or "description" not in columns:
+        raise StatementFormatError("Cabeçalho sem colunas de data e descrição")
+
+    if "amount" not in columns and not ("credit" in columns or "debit" in columns):
+        raise StatementFormatError("Cabeçalho sem coluna de valor")
+
+    return columns
+
+
+def _csv_row(record: List[str], columns: Dict[str, int], sign: int = 1) -> Optional[Dict]:
+    def cell(field: str) -> str:
+        i = columns.get(field)
+        return record[i] if i is not None and i < len(record) else ""
+
+    when = parse_date(cell("date"))
+
+    if "amount" in columns:
+        amount = parse_amount(cell("amount"))
+        # fatura: compra positiva vira saída
+        amount = amount * sign if amount else amount
+    else:
+        credit = parse_amount(cell("credit")) or 0.0
+        debit = parse_amount(cell("debit")) or 0.0
+        amount = abs(credit) - abs(debit)
+
+    if when is None or not amount:
+        return None
+
+    return {"date": when, "description": cell("description").strip(), "amount": amount}
+
+
+def iter_ofx_rows(path: str) -> Iterator[Dict]:
+    """
+    Lê os <STMTTRN> de OFX 1.x (SGML) ou 2.x (XML) em blocos, sem carregar
+    o arquivo inteiro.
+    """
+    buffer = ""
+    found = False
+
+    with open(path, encoding=_detect_encoding(path), errors="replace") as f:
+        while True:
+            chunk = f.read(READ_SIZE)
+            buffer += chunk
+
+            last_end = 0
+            for match in OFX_TRANSACTION_RE.finditer(buffer):
+                found = True
+                last_end = match.end()
+
+                row = _ofx_row(match.group(1))
+                if row:
+                    yield row
+
+            buffer = buffer[last_end:]
+
+            if not chunk:
+                break
+
+    if not found:
+        raise StatementFormatError("Nenhuma transação <STMTTRN> encontrada")
+
+
+def _ofx_row(block: str) -> Optional[Dict]:
+    fields = {tag.upper(): value.strip() for tag, value in OFX_FIELD_RE.findall(block)}
+
+    when = parse_date(fields.get("DTPOSTED", "")[:8])
+    amount = parse_amount(fields.get("TRNAMT", ""))
+    description = fields.get("MEMO") or fields.get("NAME") or ""
+
+    if when is None or not amount:
+        return None
+
+    # TRNAMT já vem do ponto de vista do titular, inclusive em <CCSTMTRS>
+    # (compras de cartão negativas): não há convenção a inverter
+    return {
+        "date": when,
+        "description": description,
+        "amount": amount,
+        "fitid": fields.get("FITID") or None,
+    }
+
+
+def iter_statement_rows(
+    path: str,
+    filename: str,
+    convention: Optional[str] = None,
+) -> Iterator[Dict]:
+    if filename.lower().endswith((".ofx", ".qfx")):
+        return iter_ofx_rows(path)
+
+    return iter_csv_rows(path, filename, convention)
+
+
+def import_key(row: Dict, occurrence: int = 0) -> str:
+    """
+    Chave de deduplicação: hash de (data, valor, descrição, FITID) mais a
+    ocorrência da mesma tupla no arquivo. Reimportar o arquivo gera as
+    mesmas chaves; dois cafés iguais no mesmo dia continuam dois.
+    """
+    description = " ".join(strip_accents(row["description"].lower()).split())
+    raw = "|".join((
+        row["date"].isoformat(),
+        f"{round(row['amount'] * 100)}",
+        description,
+        row.get("fitid") or "",
+        str(occurrence),
+    ))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def chunked(rows: Iterable[Dict], size: int = IMPORT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+# =====================
+# IMPORT
+# =====================
+
+class StatementImporter:
+    """
+    Grava lançamentos de extrato em lotes: categoriza o lote (heurística +
+    LLM em lote para os desconhecidos), grava com save_imported (linhas já
+    importadas são ignoradas pela import_hash) e enfileira a sincronização
+    com o Notion só das novas.
+    """
+
+    def __init__(
+        self,
+        repository: FinanceRepository,
+        categorizer: StatementCategorizer,
+        outbox: Optional[Outbox] = None,
+    ):
+        self.repository = repository
+        self.categorizer = categorizer
+        self.outbox = outbox
+
+        self.imported = 0
+        self.duplicates = 0
+        self.income = 0.0
+        self.expense = 0.0
+
+        # data → ocorrências de cada tupla já vistas nela (entre lotes)
+        self._seen: "OrderedDict[date, Counter]" = OrderedDict()
+
+    def import_chunk(self, rows: List[Dict]) -> int:
+        """
+        Bloqueante: chame no io_executor.
+        """
+        categories = self.categorizer.categorize_many(r["description"] for r in rows)
+
+        transactions = []
+
+        for row in rows:
+            income = row["amount"] > 0
+            base = import_key(row)
+            occurrence = self._occurrence(row, base)
+
+            transactions.append({
+                # mesmo sinal do resto do repositório: saídas negativas
+                "amount": abs(row["amount"]) if income else -abs(row["amount"]),
+                "description": row["description"][:200] or "Sem descrição",
+                "category": categories.get(row["description"]),
+                "type": "income" if income else "expense",
+                "is_installment": False,
+                "due_date": row["date"],
+                "import_hash": import_key(row, occurrence) if occurrence else base,
+            })
+
+        saved = self.repository.save_imported(transactions)
+
+        if self.outbox and saved:
+            self.outbox.enqueue_many("notion_finance", saved)
+
+        for transaction in saved:
+            amount = float(transaction["amount"])
+            if amount > 0:
+                self.income += amount
+            else:
+                self.expense += -amount
+
+        self.imported += len(saved)
+        self.duplicates += len(transactions) - len(saved)
+        return len(saved)
+
+    def _occurrence(self, row: Dict, base: str) -> int:
+        # o FITID já distingue lançamentos iguais: não precisa contar
+        if row.get("fitid"):
+            return 0
+
+        seen = self._seen.get(row["date"])
+
+        if seen is None:
+            seen = self._seen[row["date"]] = Counter()
+            if len(self._seen) > SEEN_DATES_WINDOW:
+                self._seen.popitem(last=False)
+        else:
+            self._seen.move_to_end(row["date"])
+
+        occurrence = seen[base]
+        seen[base] += 1
+        return occurrence
+
+    def summary(self) -> Dict:
+        return {
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "income": round(self.income, 2),
+            "expense": round(self.expense, 2),
+            "llm_categorized": self.categorizer.llm_categorized,
+        }
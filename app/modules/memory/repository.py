@@ -1,9 +1,31 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+
+from app.infra.replica import local_replica
 from app.infra.supabase.client import get_supabase_client
 
+# (created_at, id) da última linha vista: posição na ordenação do keyset
+Cursor = Tuple[str, str]
+
+# Cache da primeira página de /ultimas, invalidado a cada create
+RECENT_CACHE_TTL = float(os.getenv("MEMORY_RECENT_CACHE_TTL_SECONDS", "60"))
+_recent_pages: TTLCache = TTLCache(maxsize=8, ttl=RECENT_CACHE_TTL)
+
+# TTLCache não é thread-safe e o repositório roda nas threads do io_executor.
+# A geração muda a cada create: uma página buscada antes dele não é cacheada.
+_recent_lock = threading.Lock()
+_recent_generation = 0
+
 
 class MemoryRepository:
     TABLE_NAME = "memory_notes"
 
+    # só o que a listagem mostra (content pode ser longo, mas é o que exibimos)
+    PAGE_COLUMNS = "id,content,memory_type,created_at"
+
     def create(self, data: dict) -> dict:
         supabase = get_supabase_client()
 
@@ -17,9 +39,18 @@ class MemoryRepository:
         if not response.data:
             raise RuntimeError("Failed to insert memory")
 
+        local_replica.apply(self.TABLE_NAME, response.data)
+        _invalidate_recent_pages()
+
         return response.data[0]
 
     def get_by_id(self, memory_id: str) -> dict | None:
+        if local_replica.ready(self.TABLE_NAME):
+            memory = local_replica.get(self.TABLE_NAME, memory_id)
+            # ausente na réplica: pode ter sido criada depois do último pull
+            if memory is not None:
+                return memory
+
         supabase = get_supabase_client()
 
         response = (
@@ -32,3 +63,97 @@ class MemoryRepository:
         )
 
         return response.data
+
+    def list_recent(self, limit: int = 5) -> List[dict]:
+        return self.list_page(limit=limit)["items"]
+
+    def list_page(
+        self,
+        limit: int = 5,
+        after: Optional[Cursor] = None,
+        before: Optional[Cursor] = None,
+    ) -> Dict:
+        """
+        Página de memórias da mais nova para a mais antiga, por keyset em
+        (created_at, id): uma consulta indexada por página, sem OFFSET.
+
+        after  → memórias mais antigas que o cursor (próxima página)
+        before → memórias mais novas que o cursor (página anterior)
+
+        Retorna {"items", "has_older", "has_newer"}.
+        """
+        if local_replica.ready(self.TABLE_NAME):
+            return local_replica.memory_page(limit, after, before)
+
+        if after is None and before is None:
+            with _recent_lock:
+                cached = _recent_pages.get(limit)
+                generation = _recent_generation
+            if cached is not None:
+                return cached
+
+        supabase = get_supabase_client()
+
+        query = (
+            supabase
+            .table(self.TABLE_NAME)
+            .select(self.PAGE_COLUMNS)
+        )
+
+        if before is not None:
+            # anda para trás: ordem crescente a partir do cursor e inverte
+            query = query.or_(self._keyset_filter("gt", before))
+            rows = (
+                query
+                .order("created_at")
+                .order("id")
+                .limit(limit + 1)
+                .execute()
+            ).data or []
+
+            page = {
+                "items": list(reversed(rows[:limit])),
+                "has_older": True,
+                "has_newer": len(rows) > limit,
+            }
+
+        else:
+            if after is not None:
+                query = query.or_(self._keyset_filter("lt", after))
+
+            rows = (
+                query
+                .order("created_at", desc=True)
+                .order("id", desc=True)
+                .limit(limit + 1)
+                .execute()
+            ).data or []
+
+            page = {
+                "items": rows[:limit],
+                "has_older": len(rows) > limit,
+                "has_newer": after is not None,
+            }
+
+        if after is None and before is None:
+            with _recent_lock:
+                if generation == _recent_generation:
+                    _recent_pages[limit] = page
+
+        return page
+
+    @staticmethod
+    def _keyset_filter(op: str, cursor: Cursor) -> str:
+        created_at, memory_id = cursor
+        return (
+            f'created_at.{op}."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.{op}.{memory_id})'
+        )
+
+
+def _invalidate_recent_pages() -> None:
+    global _recent_generation
+
+    with _recent_lock:
+        _recent_generation += 1
+        _recent_pages.clear()
@@ -0,0 +1,51 @@
+import json
+import re
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CORPUS_PATH = Path(__file__).with_name("corpus.jsonl")
+
+# Datas relativas no corpus: $today, $today-1, $today+1, $day-20, $year
+DATE_TOKEN_RE = re.compile(r"\$(?:(today|day)([+-]\d+)?|(year))")
+
+
+def _resolve(value: Any, today: date) -> Any:
+    if not isinstance(value, str):
+        return value
+
+    def replace(match: re.Match) -> str:
+        token, offset = match.group(1), int(match.group(2) or 0)
+
+        if match.group(3):
+            return str(today.year)
+
+        if token == "today":
+            return (today + timedelta(days=offset)).isoformat()
+
+        # $day-N: dia N do mês corrente
+        return today.replace(day=abs(offset)).isoformat()
+
+    return DATE_TOKEN_RE.sub(replace, value)
+
+
+def load_corpus(path: Path = CORPUS_PATH, today: Optional[date] = None) -> List[Dict]:
+    """
+    Lê o corpus rotulado (uma mensagem por linha) resolvendo as datas
+    relativas em relação a `today`.
+    """
+    today = today or date.today()
+    items = []
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+
+            item = json.loads(line)
+            item["expected"] = {
+                key: _resolve(value, today) for key, value in item["expected"].items()
+            }
+            items.append(item)
+
+    return items
@@ -0,0 +1,254 @@
+"""
+Servidor local que imita o endpoint /v1/chat/completions da OpenAI,
+com latência configurável e respostas fixas tiradas do corpus.
+
+Uso isolado (ex.: para subir o bot contra ele):
+
+    python -m benchmarks.fake_openai --port 8765 --latency-ms 400
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python run_telegram_bot.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from benchmarks.corpus import load_corpus
+
+
+class FakeOpenAIServer:
+    """
+    Responde como o gpt-4o-mini responderia se acertasse tudo: a saída de
+    cada mensagem conhecida é o "expected" do corpus. Mensagens desconhecidas
+    recebem uma resposta genérica de memória.
+
+    latency_ms/jitter_ms simulam o tempo até o primeiro token; error_rate
+    devolve HTTP 500 para exercitar retries, circuit breaker e fallbacks.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 300,
+        jitter_ms: float = 100,
+        error_rate: float = 0.0,
+        chunk_delay_ms: float = 15,
+        corpus: Optional[list] = None,
+    ):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.chunk_delay = chunk_delay_ms / 1000
+
+        self.answers: Dict[str, Dict] = {
+            item["text"]: item for item in (corpus or load_corpus())
+        }
+
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # =====================
+    # RESPOSTAS
+    # =====================
+
+    def answer(self, body: Dict) -> str:
+        """
+        Conteúdo da resposta conforme o prompt usado na requisição.
+        """
+        text = body["messages"][-1]["content"]
+        cache_key = body.get("prompt_cache_key") or ""
+        item = self.answers.get(text)
+
+        if cache_key.endswith(":finance"):
+            return json.dumps(self._finance(item, text), ensure_ascii=False)
+
+        if cache_key.endswith(":memory"):
+            return json.dumps(self._memory(item, text), ensure_ascii=False)
+
+        if cache_key.endswith(":extract"):
+            return json.dumps(self._extract(item, text), ensure_ascii=False)
+
+        if cache_key.endswith(":extract_many"):
+            items = [self._extract(self.answers.get(t), t) for t in json.loads(text)]
+            return json.dumps({"items": items}, ensure_ascii=False)
+
+        # IntentRouter: responde só a palavra
+        return item["intent"] if item else "memory"
+
+    @staticmethod
+    def _finance(item: Optional[Dict], text: str) -> Dict:
+        if item and item["intent"] == "finance":
+            return {"module": "finance", "account": None, **item["expected"]}
+
+        return {
+            "module": "finance",
+            "description": text[:60],
+            "amount": None,
+            "transaction_type": "expense",
+            "category": "Outros",
+            "payment_method": None,
+            "account": None,
+            "installments_total": None,
+            "transaction_date": time.strftime("%Y-%m-%d"),
+        }
+
+    @staticmethod
+    def _memory(item: Optional[Dict], text: str) -> Dict:
+        if item and item["intent"] == "memory":
+            return dict(item["expected"])
+
+        return {"memory_type": "note", "content": text, "tags": ["geral"], "datetime": None}
+
+    def _extract(self, item: Optional[Dict], text: str) -> Dict:
+        if item and item["intent"] == "finance":
+            finance = self._finance(item, text)
+            finance.pop("module")
+            return {"intent": "finance", "finance": finance, "memory": None}
+
+        return {"intent": "memory", "finance": None, "memory": self._memory(item, text)}
+
+    # =====================
+    # HTTP
+    # =====================
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+
+                with server._lock:
+                    server.requests += 1
+
+                time.sleep(max(0.0, server.latency + random.uniform(-1, 1) * server.jitter))
+
+                if random.random() < server.error_rate:
+                    self._send_json(500, {"error": {"message": "fake upstream error", "type": "server_error"}})
+                    return
+
+                content = server.answer(body)
+                usage = {
+                    "prompt_tokens": sum(len(m["content"]) for m in body["messages"]) // 4,
+                    "completion_tokens": len(content) // 4,
+                    "total_tokens": 0,
+                    "prompt_tokens_details": {"cached_tokens": 0},
+                }
+
+                if body.get("stream"):
+                    self._send_stream(body, content, usage)
+                else:
+                    self._send_json(200, {
+                        "id": f"chatcmpl-{uuid.uuid4().hex}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": body.get("model"),
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }],
+                        "usage": usage,
+                    })
+
+            def _send_json(self, status: int, payload: Dict):
+                data = json.dumps(payload, ensure_ascii=False).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, body: Dict, content: str, usage: Dict):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+
+                base = {
+                    "id": f"chatcmpl-{uuid.uuid4().hex}",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model"),
+                }
+
+                # ~4 caracteres por token, um token por chunk
+                for start in range(0, len(content), 4):
+                    delta = {"content": content[start:start + 4]}
+                    self._event({**base, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+                    time.sleep(server.chunk_delay)
+
+                self._event({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    self._event({**base, "choices": [], "usage": usage})
+
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+            def _event(self, payload: Dict):
+                self.wfile.write(f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode())
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat-completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+    )
+
+    print(f"Fake OpenAI listening on {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""
+Benchmark das leituras do FinanceRepository sobre uma tabela sintética
+(1M linhas por padrão) servida por um PostgREST falso local em SQLite, com
+o mesmo teto de linhas por resposta do Supabase (db-max-rows = 1000).
+
+Compara o select("*") único de antes (trunca no teto) com iter_rows/
+iter_chunks em keyset, com e sem projeção de colunas. Memória é o pico de
+alocações Python do cliente (tracemalloc). --uncapped roda também o select
+único sem teto, que materializa a tabela inteira (com 1M linhas, alguns GB
+entre servidor e cliente).
+
+    python -m benchmarks.finance_reads
+    python -m benchmarks.finance_reads --rows 200000 --page-size 500
+    python -m benchmarks.finance_reads --rows 200000 --uncapped
+    python -m benchmarks.finance_reads --db /tmp/bench_tx.sqlite3   # reaproveita a base
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import re
+import socket
+import sqlite3
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+COLUMNS = (
+    "id", "description", "amount", "transaction_type", "category",
+    "transaction_date", "is_installment", "installment_number", "installments_total",
+    "updated_at",
+)
+
+# Tabelas servidas pelo PostgREST falso (a réplica local também lê as duas últimas)
+TABLES = ("transactions", "memory_notes", "replica_deletions")
+
+MEMORY_NOTES = 10_000
+
+# Muda quando o esquema da base sintética muda: força gerar de novo
+SCHEMA_VERSION = 2
+
+CATEGORIES = ("Alimentação", "Transporte", "Moradia", "Saúde", "Lazer", "Outros")
+
+KEYSET_RE = re.compile(
+    r'^\((\w+)\.(gt|lt)\."?([^",]+)"?,and\((\w+)\.eq\."?([^",]+)"?,(\w+)\.(gt|lt)\.([^)]+)\)\)$'
+)
+
+OPERATORS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "eq": "="}
+
+
+# =====================
+# BASE SINTÉTICA
+# =====================
+
+def build_database(path: str, rows: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    first_day = date(2021, 1, 1)
+    first_write = datetime(2021, 1, 1, tzinfo=timezone.utc)
+
+    def stamp() -> str:
+        return (first_write + timedelta(seconds=rng.randrange(5 * 365 * 86400))).isoformat()
+
+    def generate():
+        for _ in range(rows):
+            income = rng.random() < 0.1
+            installment = not income and rng.random() < 0.15
+            yield (
+                str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                f"Lançamento {rng.randrange(10_000)}",
+                round(rng.uniform(100, 8000) if income else -rng.uniform(5, 900), 2),
+                "income" if income else "expense",
+                rng.choice(CATEGORIES),
+                (first_day + timedelta(days=rng.randrange(5 * 365))).isoformat(),
+                int(installment),
+                rng.randint(1, 12) if installment else None,
+                12 if installment else None,
+                stamp(),
+            )
+
+    def notes():
+        for i in range(MEMORY_NOTES):
+            created = stamp()
+            yield (
+                str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                f"Memória {i}",
+                rng.choice(("note", "reminder", "idea")),
+                created,
+                created,
+            )
+
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        DROP TABLE IF EXISTS transactions;
+        CREATE TABLE transactions (
+            id TEXT PRIMARY KEY,
+            description TEXT,
+            amount REAL,
+            transaction_type TEXT,
+            category TEXT,
+            transaction_date TEXT,
+            is_installment INTEGER,
+            installment_number INTEGER,
+            installments_total INTEGER,
+            updated_at TEXT
+        );
+        DROP TABLE IF EXISTS memory_notes;
+        CREATE TABLE memory_notes (
+            id TEXT PRIMARY KEY,
+            content TEXT,
+            memory_type TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        );
+        DROP TABLE IF EXISTS replica_deletions;
+        CREATE TABLE replica_deletions (
+            id INTEGER PRIMARY KEY,
+            table_name TEXT,
+            row_id TEXT,
+            deleted_at TEXT
+        );
+        """
+    )
+    conn.executemany(f"INSERT INTO transactions VALUES ({','.join('?' * len(COLUMNS))})", generate())
+    conn.executemany("INSERT INTO memory_notes VALUES (?, ?, ?, ?, ?)", notes())
+    conn.executescript(
+        f"""
+        CREATE INDEX transactions_date_id ON transactions (transaction_date, id);
+        CREATE INDEX transactions_updated_id ON transactions (updated_at, id);
+        CREATE INDEX memory_notes_created_id ON memory_notes (created_at, id);
+        CREATE INDEX memory_notes_updated_id ON memory_notes (updated_at, id);
+        PRAGMA user_version = {SCHEMA_VERSION};
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+def count_rows(path: str) -> int:
+    try:
+        with sqlite3.connect(path) as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                return 0
+            return conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+    except sqlite3.Error:
+        return 0
+
+
+# =====================
+# POSTGREST FALSO
+# =====================
+
+def _to_sql(table: str, params: Dict[str, List[str]], max_rows: int) -> Tuple[str, list]:
+    """
+    Traduz o subconjunto de PostgREST que os repositórios e a réplica usam:
+    select, filtros gte/lte/eq, or=(keyset), order e limit.
+    """
+    if table not in TABLES:
+        raise ValueError(f"tabela desconhecida: {table}")
+
+    select = params.pop("select", ["*"])[0]
+    columns = "*" if select == "*" else ",".join(c for c in select.split(",") if c.isidentifier())
+
+    where, args = [], []
+
+    for value in params.pop("or", []):
+        match = KEYSET_RE.match(value)
+        if not match:
+            raise ValueError(f"or= não suportado: {value}")
+
+        col, op, val, eq_col, eq_val, id_col, id_op, id_val = match.groups()
+        where.append(f"({col} {OPERATORS[op]} ? OR ({eq_col} = ? AND {id_col} {OPERATORS[id_op]} ?))")
+        args += [val, eq_val, id_val]
+
+    order = params.pop("order", [""])[0]
+    limit = int(params.pop("limit", ["0"])[0]) or None
+    params.pop("offset", None)
+
+    for column, values in params.items():
+        if not column.isidentifier():
+            continue
+        for value in values:
+            op, _, val = value.partition(".")
+            where.append(f"{column} {OPERATORS[op]} ?")
+            args.append(val)
+
+    sql = f"SELECT {columns} FROM {table}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+
+    if order:
+        terms = []
+        for term in order.split(","):
+            name, _, direction = term.partition(".")
+            terms.append(f"{name} {'DESC' if direction.startswith('desc') else 'ASC'}")
+        sql += " ORDER BY " + ", ".join(terms)
+
+    # teto do servidor, como o db-max-rows do PostgREST
+    if max_rows:
+        limit = min(limit or max_rows, max_rows)
+    if limit:
+        sql += f" LIMIT {limit}"
+
+    return sql, args
+
+
+def serve(db_path: str, port: int, max_rows: int) -> None:
+    local = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            conn = local.setdefault(id(self.server), sqlite3.connect(db_path, check_same_thread=False))
+
+            try:
+                table = url.path.rstrip("/").rsplit("/", 1)[-1]
+                sql, args = _to_sql(table, parse_qs(url.query), max_rows)
+                cursor = conn.execute(sql, args)
+                names = [d[0] for d in cursor.description]
+                rows = [dict(zip(names, row)) for row in cursor]
+
+                # .single(): o PostgREST devolve o objeto, não a lista
+                if "vnd.pgrst.object" in self.headers.get("Accept", ""):
+                    rows = rows[0] if rows else None
+
+                body = json.dumps(rows).encode()
+                status = 200
+            except Exception as e:
+                body = json.dumps({"message": str(e)}).encode()
+                status = 400
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(db_path: str, max_rows: int) -> Tuple[multiprocessing.Process, str]:
+    port = _free_port()
+    process = multiprocessing.Process(target=serve, args=(db_path, port, max_rows), daemon=True)
+    process.start()
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+
+    return process, f"http://127.0.0.1:{port}"
+
+
+# =====================
+# CENÁRIOS
+# =====================
+
+def measure(name: str, fn: Callable[[], int]) -> Dict:
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    rows = fn()
+
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scenario": name,
+        "rows": rows,
+        "seconds": round(elapsed, 2),
+        "rows_per_s": int(rows / elapsed) if elapsed else 0,
+        "peak_mb": round(peak / 2**20, 1),
+    }
+
+
+def run_scenarios(repo, page_size: int, uncapped_url: str | None) -> List[Dict]:
+    def legacy_select_all(client):
+        def run():
+            return len(client.table("transactions").select("*").order("transaction_date").execute().data)
+        return run
+
+    def stream(**kwargs):
+        def run():
+            return sum(1 for _ in repo.iter_rows(page_size=page_size, **kwargs))
+        return run
+
+    def chunks(**kwargs):
+        def run():
+            return sum(len(c) for c in repo.iter_chunks(page_size=page_size, **kwargs))
+        return run
+
+    results = [
+        measure("select(*) único (com teto)", legacy_select_all(repo.supabase)),
+        measure("iter_rows *", stream()),
+        measure("iter_rows id,amount,date", stream(columns="id,amount,transaction_date")),
+        measure("iter_chunks 1 mês", chunks(start_date=date(2023, 6, 1), end_date=date(2023, 6, 30))),
+        measure("iter_rows desc", stream(descending=True, columns="id,amount")),
+    ]
+
+    if uncapped_url:
+        from supabase import create_client
+
+        uncapped = create_client(uncapped_url, os.environ["SUPABASE_SERVICE_KEY"])
+        results.insert(1, measure("select(*) único (sem teto)", legacy_select_all(uncapped)))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das leituras em keyset")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--max-rows", type=int, default=1000, help="teto por resposta do servidor")
+    parser.add_argument("--db", default=os.path.join("data", "bench_transactions.sqlite3"))
+    parser.add_argument("--uncapped", action="store_true", help="roda também o select único sem teto")
+    parser.add_argument("--json", help="grava o relatório em JSON")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.db) or ".", exist_ok=True)
+
+    if count_rows(args.db) != args.rows:
+        print(f"Gerando {args.rows} linhas em {args.db}...")
+        started = time.perf_counter()
+        build_database(args.db, args.rows)
+        print(f"  pronto em {time.perf_counter() - started:.1f}s")
+
+    capped, capped_url = start_server(args.db, args.max_rows)
+    uncapped, uncapped_url = start_server(args.db, 0) if args.uncapped else (None, None)
+
+    # o cliente lê as credenciais no import de app.config
+    os.environ["SUPABASE_URL"] = capped_url
+    os.environ["SUPABASE_SERVICE_KEY"] = "bench.fake.key"
+
+    from app.modules.finance.repository import FinanceRepository
+
+    try:
+        results = run_scenarios(FinanceRepository(), args.page_size, uncapped_url)
+    finally:
+        capped.terminate()
+        if uncapped:
+            uncapped.terminate()
+
+    print(f"\n{'cenário':<30}{'linhas':>10}{'s':>8}{'linhas/s':>11}{'pico MB':>10}")
+    for r in results:
+        print(f"{r['scenario']:<30}{r['rows']:>10}{r['seconds']:>8}{r['rows_per_s']:>11}{r['peak_mb']:>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Benchmark offline dos parsers: roda o corpus rotulado por IntentRouter,
+FinanceParser e MemoryParser (ponta a ponta, com cache, regras locais e
+openai_guard) contra um servidor OpenAI falso local.
+
+    python -m benchmarks.parser_benchmark
+    python -m benchmarks.parser_benchmark --latency-ms 800 --error-rate 0.05
+    python -m benchmarks.parser_benchmark --save-baseline data/bench_baseline.json
+    python -m benchmarks.parser_benchmark --baseline data/bench_baseline.json
+
+Com --real as chamadas vão para a OpenAI de verdade (OPENAI_API_KEY), o que
+torna a acurácia por campo significativa para comparar prompts e modelos.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+from benchmarks.corpus import load_corpus
+from benchmarks.fake_openai import FakeOpenAIServer
+
+FINANCE_FIELDS = (
+    "amount",
+    "transaction_type",
+    "category",
+    "payment_method",
+    "installments_total",
+    "transaction_date",
+)
+MEMORY_FIELDS = ("memory_type", "datetime")
+
+
+def percentile(samples: List[float], pct: int) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _same(field: str, got, expected) -> bool:
+    if field == "amount":
+        return got is not None and expected is not None and abs(got - expected) < 0.01
+
+    if field == "datetime" and got and expected:
+        return got[:16] == expected[:16]
+
+    return got == expected
+
+
+class ParserBenchmark:
+    def __init__(self, corpus: List[Dict], concurrency: int, stream: bool):
+        # importados aqui: os clientes precisam enxergar OPENAI_BASE_URL
+        from app.ai.finance_parser import FinanceParser
+        from app.ai.intent_router import IntentRouter
+        from app.ai.memory_parser import MemoryParser
+
+        self.corpus = corpus
+        self.concurrency = concurrency
+        self.stream = stream
+
+        self.router = IntentRouter()
+        self.parsers = {"finance": FinanceParser(), "memory": MemoryParser()}
+
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.hits: Counter = Counter()
+        self.totals: Counter = Counter()
+        self.fallbacks = 0
+        self.messages = 0
+
+    async def run(self, repeat: int, keep_cache: bool) -> Dict:
+        from app.ai.cache import parse_cache
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(item):
+            async with semaphore:
+                await self._process(item)
+
+        started = time.perf_counter()
+
+        for _ in range(repeat):
+            if not keep_cache:
+                parse_cache.clear()
+
+            await asyncio.gather(*(one(item) for item in self.corpus))
+
+        elapsed = time.perf_counter() - started
+
+        return self._report(elapsed)
+
+    # =====================
+    # INTERNAL
+    # =====================
+
+    async def _process(self, item: Dict) -> None:
+        text = item["text"]
+        started = time.perf_counter()
+
+        intent = await self.router.route_async(text)
+        routed = time.perf_counter()
+
+        parser = self.parsers[intent]
+
+        if self.stream:
+            first = None
+            async for parsed in parser.stream_async(text):
+                first = first or time.perf_counter()
+            self.latencies["first_partial"].append(first - routed)
+        else:
+            parsed = await parser.parse_async(text)
+
+        finished = time.perf_counter()
+
+        self.latencies["route"].append(routed - started)
+        self.latencies[f"parse_{intent}"].append(finished - routed)
+        self.latencies["end_to_end"].append(finished - started)
+        self.messages += 1
+
+        self._score(item, intent, parsed, parser)
+
+    def _score(self, item: Dict, intent: str, parsed: Dict, parser) -> None:
+        self.totals["intent"] += 1
+        self.hits["intent"] += intent == item["intent"]
+
+        if intent == "finance":
+            fallback = bool(parsed.get("needs_review"))
+        else:
+            fallback = parsed == parser._fallback(item["text"])
+
+        self.fallbacks += fallback
+
+        if intent != item["intent"]:
+            return
+
+        fields = FINANCE_FIELDS if intent == "finance" else MEMORY_FIELDS
+        for field in fields:
+            name = f"{intent}.{field}"
+            self.totals[name] += 1
+            self.hits[name] += _same(field, parsed.get(field), item["expected"].get(field))
+
+    def _report(self, elapsed: float) -> Dict:
+        from app.ai.metrics import finance_parse_stats, intent_stats
+
+        return {
+            "messages": self.messages,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_msg_s": round(self.messages / elapsed, 2) if elapsed else 0.0,
+            "fallback_rate": round(self.fallbacks / self.messages, 4) if self.messages else 0.0,
+            "latency_ms": {
+                stage: {
+                    "p50": round(percentile(samples, 50) * 1000, 1),
+                    "p95": round(percentile(samples, 95) * 1000, 1),
+                    "p99": round(percentile(samples, 99) * 1000, 1),
+                }
+                for stage, samples in sorted(self.latencies.items())
+            },
+            "accuracy": {
+                name: round(self.hits[name] / total, 4)
+                for name, total in sorted(self.totals.items())
+            },
+            "paths": {
+                "finance": {k: v["count"] for k, v in finance_parse_stats.snapshot().items()},
+                "intent": {k: v["count"] for k, v in intent_stats.snapshot().items()},
+            },
+        }
+
+
+def print_report(report: Dict, baseline: Dict | None = None) -> None:
+    def delta(value, old):
+        if old is None:
+            return ""
+        diff = value - old
+        return f"  ({'+' if diff >= 0 else ''}{diff:.4g})"
+
+    base = baseline or {}
+
+    print(f"\nMensagens: {report['messages']} em {report['elapsed_s']}s")
+    print(
+        f"Throughput: {report['throughput_msg_s']} msg/s"
+        f"{delta(report['throughput_msg_s'], base.get('throughput_msg_s'))}"
+    )
+    print(
+        f"Fallback rate: {report['fallback_rate']:.2%}"
+        f"{delta(report['fallback_rate'], base.get('fallback_rate'))}"
+    )
+
+    print("\nLatência (ms)        p50       p95       p99")
+    for stage, values in report["latency_ms"].items():
+        old = base.get("latency_ms", {}).get(stage, {})
+        print(
+            f"  {stage:<16}"
+            + "".join(f"{values[p]:>10.1f}" for p in ("p50", "p95", "p99"))
+            + delta(values["p99"], old.get("p99"))
+        )
+
+    print("\nAcurácia por campo")
+    for name, value in report["accuracy"].items():
+        old = base.get("accuracy", {}).get(name)
+        print(f"  {name:<30}{value:>8.2%}{delta(value, old)}")
+
+    print("\nCaminhos:", json.dumps(report["paths"], ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline dos parsers")
+    parser.add_argument("--real", action="store_true", help="usa a OpenAI de verdade")
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep-cache", action="store_true", help="não limpa o cache entre rodadas")
+    parser.add_argument("--stream", action="store_true", help="usa stream_async nos parsers")
+    parser.add_argument("--json", help="grava o relatório em JSON")
+    parser.add_argument("--save-baseline", help="grava o relatório como baseline")
+    parser.add_argument("--baseline", help="compara com um baseline salvo")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    server = None
+
+    if not args.real:
+        server = FakeOpenAIServer(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            corpus=corpus,
+        ).start()
+
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+        # o limite local do tier não se aplica ao servidor falso
+        os.environ.setdefault("OPENAI_RPM", "100000")
+        os.environ.setdefault("OPENAI_TPM", "100000000")
+
+    try:
+        bench = ParserBenchmark(corpus, concurrency=args.concurrency, stream=args.stream)
+        report = asyncio.run(bench.run(args.repeat, args.keep_cache))
+    finally:
+        if server:
+            server.stop()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+
+    for path in filter(None, (args.json, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark da réplica local (app/infra/replica.py) sobre a base sintética
+de benchmarks.finance_reads, servida pelo mesmo PostgREST falso: pull
+inicial, pull incremental sem mudanças e latência das leituras (extrato,
+página de /ultimas, memória por id) vindas do Supabase e da réplica.
+
+    python -m benchmarks.replica_reads
+    python -m benchmarks.replica_reads --rows 1000000 --repeat 200
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import date
+from typing import Callable, Dict, List
+
+from benchmarks.finance_reads import build_database, count_rows, start_server
+
+
+def latency(fn: Callable[[], object], repeat: int) -> Dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+    }
+
+
+def timed(fn: Callable[[], object]) -> Dict:
+    started = time.perf_counter()
+    result = fn()
+    return {"seconds": round(time.perf_counter() - started, 2), "result": result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da réplica local")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--db", default=os.path.join("data", "bench_transactions.sqlite3"))
+    parser.add_argument("--json", help="grava o relatório em JSON")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.db) or ".", exist_ok=True)
+
+    if count_rows(args.db) != args.rows:
+        print(f"Gerando {args.rows} linhas em {args.db}...")
+        build_database(args.db, args.rows)
+
+    with sqlite3.connect(args.db) as conn:
+        memory_id, created_at = conn.execute(
+            "SELECT id, created_at FROM memory_notes ORDER BY created_at DESC LIMIT 1 OFFSET 100"
+        ).fetchone()
+
+    server, url = start_server(args.db, 1000)
+    workdir = tempfile.TemporaryDirectory()
+
+    # credenciais e réplica são lidas no import de app.config / app.infra.replica
+    os.environ["SUPABASE_URL"] = url
+    os.environ["SUPABASE_SERVICE_KEY"] = "bench.fake.key"
+    os.environ["LOCAL_REPLICA_ENABLED"] = "true"
+    os.environ["LOCAL_REPLICA_PATH"] = os.path.join(workdir.name, "replica.sqlite3")
+
+    from app.infra.replica import local_replica
+    from app.modules.finance.repository import FinanceRepository
+    from app.modules.memory.repository import MemoryRepository
+
+    finance = FinanceRepository()
+    memories = MemoryRepository()
+    day = date(2023, 6, 15)
+
+    reads = {
+        "extrato 1 dia": lambda: finance.get_by_period(day, day),
+        "extrato 1 mês": lambda: finance.get_by_period(date(2023, 6, 1), date(2023, 6, 30)),
+        "/ultimas (página 2)": lambda: memories.list_page(limit=5, after=(created_at, memory_id)),
+        "memória por id": lambda: memories.get_by_id(memory_id),
+    }
+
+    report: Dict[str, List[Dict] | Dict] = {"reads": []}
+
+    try:
+        local_replica.enabled = False
+        remote = {name: latency(fn, args.repeat) for name, fn in reads.items()}
+
+        local_replica.enabled = True
+        initial = timed(local_replica.sync)
+        incremental = timed(local_replica.sync)
+
+        local = {name: latency(fn, args.repeat) for name, fn in reads.items()}
+    finally:
+        server.terminate()
+
+    report["sync"] = {
+        "initial_s": initial["seconds"],
+        "initial_rows": initial["result"],
+        "incremental_s": incremental["seconds"],
+        "incremental_rows": incremental["result"],
+    }
+
+    print(
+        f"\nPull inicial: {sum(initial['result'].values())} linhas em {initial['seconds']} s"
+        f"\nPull incremental sem mudanças: {sum(incremental['result'].values())} linhas "
+        f"em {incremental['seconds']} s"
+    )
+
+    print(f"\n{'leitura':<24}{'supabase p50':>14}{'p99':>10}{'réplica p50':>14}{'p99':>10}")
+    for name in reads:
+        r, l = remote[name], local[name]
+        print(f"{name:<24}{r['p50_ms']:>14}{r['p99_ms']:>10}{l['p50_ms']:>14}{l['p99_ms']:>10}")
+        report["reads"].append({"read": name, "supabase": r, "replica": l})
+
+    workdir.cleanup()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
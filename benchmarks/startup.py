@@ -0,0 +1,195 @@
+"""
+Benchmark de cold start do bot: cada rodada é um processo Python novo que
+importa app.bot.telegram_bot, monta o Application e processa o primeiro
+update (/start) contra o Bot API falso do load test. No fim, uma rodada com
+-X importtime mostra os módulos que mais pesam no import.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --top 25
+    python -m benchmarks.startup --save-baseline data/startup_baseline.json
+    python -m benchmarks.startup --baseline data/startup_baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+PHASES = ("import_ms", "build_ms", "first_update_ms", "total_ms")
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+# =====================
+# PROCESSO FILHO
+# =====================
+
+def _child() -> Dict:
+    started = time.perf_counter()
+
+    from telegram import Update
+    from telegram.ext import ApplicationBuilder
+
+    from app.bot.telegram_bot import build_application
+
+    imported = time.perf_counter()
+
+    # o Bot API falso é só infraestrutura do teste: fica fora das medições
+    from benchmarks.webhook_load import FakeBotAPI
+
+    api = FakeBotAPI()
+
+    built_at = time.perf_counter()
+    app = build_application(ApplicationBuilder().base_url(api.base_url))
+    built = time.perf_counter()
+
+    async def first_update() -> float:
+        begin = time.perf_counter()
+
+        await app.initialize()
+        await app.process_update(Update.de_json(api.make_update(1), app.bot))
+        elapsed = time.perf_counter() - begin
+
+        await app.shutdown()
+        return elapsed
+
+    handled = asyncio.run(first_update())
+    answered = api.answered
+    api.stop()
+
+    if not answered:
+        raise RuntimeError("o primeiro update não foi respondido")
+
+    result = {
+        "import_ms": (imported - started) * 1000,
+        "build_ms": (built - built_at) * 1000,
+        "first_update_ms": handled * 1000,
+    }
+    result["total_ms"] = sum(result.values())
+    return result
+
+
+# =====================
+# RELATÓRIO
+# =====================
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("TELEGRAM_BOT_TOKEN", "123:startup-bench")
+    return env
+
+
+def run_once() -> Dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        capture_output=True, text=True, check=True, env=_env(),
+    ).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_breakdown(top: int) -> List[Dict]:
+    """
+    Roda `python -X importtime` no import do bot e retorna os módulos de
+    primeiro nível (pacotes diretos) com maior tempo cumulativo.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.bot.telegram_bot"],
+        capture_output=True, text=True, check=True, env=_env(),
+    ).stderr
+
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append({
+            "module": module,
+            "depth": len(indent) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+
+    # depth 0/1: o próprio bot e o que ele importa direta ou quase diretamente
+    shallow = [r for r in rows if r["depth"] <= 1]
+    return sorted(shallow, key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+
+
+def build_report(runs: int, top: int) -> Dict:
+    samples = [run_once() for _ in range(runs)]
+
+    return {
+        "runs": runs,
+        "median_ms": {
+            phase: round(statistics.median(s[phase] for s in samples), 1)
+            for phase in PHASES
+        },
+        "max_ms": {
+            phase: round(max(s[phase] for s in samples), 1)
+            for phase in PHASES
+        },
+        "imports": import_breakdown(top),
+    }
+
+
+def print_report(report: Dict, baseline: Dict | None = None) -> None:
+    base = (baseline or {}).get("median_ms", {})
+
+    print(f"\nCold start ({report['runs']} processos)   mediana       máx")
+    for phase in PHASES:
+        line = (
+            f"  {phase:<22}{report['median_ms'][phase]:>10.1f}"
+            f"{report['max_ms'][phase]:>10.1f}"
+        )
+
+        old = base.get(phase)
+        if old:
+            diff = report["median_ms"][phase] - old
+            line += f"  ({'+' if diff >= 0 else ''}{diff:.1f}, {diff / old:+.0%})"
+
+        print(line)
+
+    print(f"\n{'Imports mais caros (ms)':<50}{'cumulativo':>12}{'próprio':>11}")
+    for row in report["imports"]:
+        name = "  " * row["depth"] + row["module"]
+        print(f"  {name:<48}{row['cumulative_ms']:>12.1f}{row['self_ms']:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de cold start do bot")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", help="grava o relatório em JSON")
+    parser.add_argument("--save-baseline", help="grava o relatório como baseline")
+    parser.add_argument("--baseline", help="compara com um baseline salvo")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(_child()))
+        return
+
+    report = build_report(args.runs, args.top)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+
+    for path in filter(None, (args.json, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
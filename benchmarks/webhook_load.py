@@ -0,0 +1,251 @@
+"""
+Load test polling x webhook: o Application real (build_application) roda
+contra um Bot API falso local. Cada update é um /start; a latência vai da
+entrega do update (fila do getUpdates ou POST no webhook) até o sendMessage
+da resposta chegar ao Bot API falso.
+
+    python -m benchmarks.webhook_load --updates 500 --chats 50
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List
+from urllib.parse import parse_qs
+
+import httpx
+
+from benchmarks.parser_benchmark import percentile
+
+SECRET = "load-test-secret"
+WEBHOOK_PORT = 8790
+
+
+class FakeBotAPI:
+    """
+    Implementa só o necessário do Bot API: getMe, getUpdates (long polling),
+    setWebhook/deleteWebhook e sendMessage (registra o horário da resposta).
+    """
+
+    def __init__(self):
+        self._updates: List[Dict] = []
+        self._cond = threading.Condition()
+        self._next_id = 1
+
+        # horário de entrega dos updates ainda sem resposta, por chat
+        self.pending: Dict[int, Deque[float]] = defaultdict(deque)
+        self.latencies: List[float] = []
+        self.answered = 0
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/bot"
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+
+    def make_update(self, chat_id: int) -> Dict:
+        with self._cond:
+            update_id = self._next_id
+            self._next_id += 1
+
+        return {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "Load"},
+                "text": "/start",
+                "entities": [{"type": "bot_command", "offset": 0, "length": 6}],
+            },
+        }
+
+    def mark_delivered(self, chat_id: int) -> None:
+        with self._cond:
+            self.pending[chat_id].append(time.perf_counter())
+
+    def push(self, update: Dict) -> None:
+        """
+        Modo polling: o update fica disponível para o próximo getUpdates.
+        """
+        chat_id = update["message"]["chat"]["id"]
+
+        with self._cond:
+            self._updates.append(update)
+            self.pending[chat_id].append(time.perf_counter())
+            self._cond.notify_all()
+
+    # =====================
+    # MÉTODOS DO BOT API
+    # =====================
+
+    def call(self, method: str, params: Dict):
+        if method == "getMe":
+            return {
+                "id": 1, "is_bot": True, "first_name": "Load", "username": "load_bot",
+                "can_join_groups": False, "can_read_all_group_messages": False,
+                "supports_inline_queries": False,
+            }
+
+        if method == "getUpdates":
+            return self._get_updates(int(params.get("offset", 0)), float(params.get("timeout", 0)))
+
+        if method == "sendMessage":
+            chat_id = int(params["chat_id"])
+
+            with self._cond:
+                delivered = self.pending[chat_id].popleft() if self.pending[chat_id] else None
+                if delivered is not None:
+                    self.latencies.append(time.perf_counter() - delivered)
+                self.answered += 1
+
+            return {
+                "message_id": self.answered,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": params.get("text", ""),
+            }
+
+        return True
+
+    def _get_updates(self, offset: int, timeout: float) -> List[Dict]:
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            self._updates = [u for u in self._updates if u["update_id"] >= offset]
+
+            while not self._updates and time.monotonic() < deadline:
+                self._cond.wait(deadline - time.monotonic())
+
+            return list(self._updates)
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length).decode()
+
+                if "json" in (self.headers.get("Content-Type") or ""):
+                    params = json.loads(raw or "{}")
+                else:
+                    params = {k: v[0] for k, v in parse_qs(raw).items()}
+
+                method = self.path.rsplit("/", 1)[-1]
+                body = json.dumps({"ok": True, "result": api.call(method, params)}).encode()
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST
+
+        return Handler
+
+
+async def run_mode(mode: str, updates: int, chats: int, interval: float) -> Dict:
+    from telegram.ext import ApplicationBuilder
+
+    from app.bot.telegram_bot import build_application
+
+    api = FakeBotAPI()
+    app = build_application(ApplicationBuilder().base_url(api.base_url))
+
+    async with app:
+        await app.start()
+
+        if mode == "polling":
+            await app.updater.start_polling(poll_interval=0, timeout=10)
+        else:
+            await app.updater.start_webhook(
+                listen="127.0.0.1",
+                port=WEBHOOK_PORT,
+                url_path="telegram",
+                webhook_url=f"http://127.0.0.1:{WEBHOOK_PORT}/telegram",
+                secret_token=SECRET,
+            )
+
+        webhook_url = f"http://127.0.0.1:{WEBHOOK_PORT}/telegram"
+        headers = {"X-Telegram-Bot-Api-Secret-Token": SECRET}
+
+        async with httpx.AsyncClient() as http:
+            if mode == "webhook":
+                rejected = await http.post(webhook_url, json=api.make_update(1))
+                assert rejected.status_code == 403, "secret token não foi validado"
+
+            started = time.perf_counter()
+
+            for i in range(updates):
+                update = api.make_update(1000 + i % chats)
+
+                if mode == "polling":
+                    api.push(update)
+                else:
+                    api.mark_delivered(update["message"]["chat"]["id"])
+                    await http.post(webhook_url, json=update, headers=headers)
+
+                await asyncio.sleep(interval)
+
+            while api.answered < updates and time.perf_counter() - started < 60:
+                await asyncio.sleep(0.01)
+
+            elapsed = time.perf_counter() - started
+
+        await app.updater.stop()
+        await app.stop()
+
+    api.stop()
+
+    return {
+        "mode": mode,
+        "answered": api.answered,
+        "throughput_upd_s": round(api.answered / elapsed, 1),
+        "p50_ms": round(percentile(api.latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(api.latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(api.latencies, 99) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test polling x webhook")
+    parser.add_argument("--updates", type=int, default=300)
+    parser.add_argument("--chats", type=int, default=30)
+    parser.add_argument("--interval-ms", type=float, default=5)
+    parser.add_argument("--modes", default="polling,webhook")
+    args = parser.parse_args()
+
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123:load-test")
+    # mede o transporte, não os limites de envio do Telegram
+    os.environ.setdefault("BOT_GLOBAL_RATE", "100000")
+    os.environ.setdefault("BOT_CHAT_RATE", "100000")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    print(f"{'modo':<10}{'respostas':>10}{'upd/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for mode in args.modes.split(","):
+        result = asyncio.run(run_mode(mode, args.updates, args.chats, args.interval_ms / 1000))
+        print(
+            f"{result['mode']:<10}{result['answered']:>10}{result['throughput_upd_s']:>10}"
+            f"{result['p50_ms']:>10}{result['p95_ms']:>10}{result['p99_ms']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
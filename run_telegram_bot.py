@@ -1,6 +1,4 @@
-from dotenv import load_dotenv
-load_dotenv()  # 🔴 ESSENCIAL: carrega o .env antes de qualquer import
-
+# o .env é carregado pelo pacote app (app/config.py) antes de qualquer import
 from app.bot.telegram_bot import run_bot
 
 if __name__ == "__main__":
@@ -0,0 +1,4 @@
+-- Paginação keyset de /ultimas: ORDER BY created_at DESC, id DESC
+-- com filtro (created_at, id) < cursor vira um index scan por página.
+create index if not exists memory_notes_created_at_id_idx
+    on public.memory_notes (created_at desc, id desc);
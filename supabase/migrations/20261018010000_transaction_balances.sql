@@ -0,0 +1,239 @@
+-- Saldo incremental: transaction_balances guarda o saldo total ('all') e
+-- o de cada mês ('YYYY-MM'), mantidos por triggers de statement na mesma
+-- transação do INSERT/UPDATE/DELETE em transactions. Ler o saldo é uma
+-- busca por chave, independente do tamanho do histórico.
+
+create table if not exists public.transaction_balances (
+    period      text primary key,               -- 'all' ou 'YYYY-MM'
+    balance     numeric(14, 2) not null default 0,
+    income      numeric(14, 2) not null default 0,
+    expense     numeric(14, 2) not null default 0,
+    tx_count    bigint not null default 0,
+    updated_at  timestamptz not null default now()
+);
+
+-- só o service role (bot) lê; os triggers escrevem via security definer
+alter table public.transaction_balances enable row level security;
+
+-- Agregações por período (fallback e verificação) usam a data
+create index if not exists transactions_transaction_date_idx
+    on public.transactions (transaction_date);
+
+do $$
+begin
+    if not exists (select 1 from pg_type where typname = 'transaction_balance_delta') then
+        create type public.transaction_balance_delta as (
+            transaction_date date,
+            amount numeric,
+            sign integer
+        );
+    end if;
+end $$;
+
+
+-- =====================
+-- APLICAÇÃO DOS DELTAS
+-- =====================
+
+create or replace function public.apply_transaction_balance_deltas(
+    p_deltas public.transaction_balance_delta[]
+) returns void
+language sql
+security definer
+set search_path = public
+as $$
+    insert into public.transaction_balances as b
+        (period, balance, income, expense, tx_count, updated_at)
+    select
+        p.period,
+        sum(d.sign * d.amount),
+        sum(d.sign * greatest(d.amount, 0)),
+        sum(d.sign * greatest(-d.amount, 0)),
+        sum(d.sign),
+        now()
+    from unnest(p_deltas) as d
+    cross join lateral (
+        values ('all'), (to_char(d.transaction_date, 'YYYY-MM'))
+    ) as p(period)
+    group by p.period
+    -- ordem fixa: escritores concorrentes travam as linhas na mesma ordem
+    order by p.period
+    on conflict (period) do update set
+        balance    = b.balance + excluded.balance,
+        income     = b.income + excluded.income,
+        expense    = b.expense + excluded.expense,
+        tx_count   = b.tx_count + excluded.tx_count,
+        updated_at = excluded.updated_at;
+$$;
+
+-- security definer: não pode ficar exposta via RPC para anon/authenticated
+revoke execute on function public.apply_transaction_balance_deltas(public.transaction_balance_delta[])
+    from public, anon, authenticated;
+
+-- Os triggers rodam como o dono (security definer): quem escreve em
+-- transactions não precisa de EXECUTE em apply_transaction_balance_deltas.
+create or replace function public.transaction_balances_on_insert()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    perform public.apply_transaction_balance_deltas(array(
+        select row(transaction_date, amount, 1)::public.transaction_balance_delta
+        from new_rows
+    ));
+    return null;
+end;
+$$;
+
+create or replace function public.transaction_balances_on_update()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    perform public.apply_transaction_balance_deltas(array(
+        select row(transaction_date, amount, -1)::public.transaction_balance_delta
+        from old_rows
+        union all
+        select row(transaction_date, amount, 1)::public.transaction_balance_delta
+        from new_rows
+    ));
+    return null;
+end;
+$$;
+
+create or replace function public.transaction_balances_on_delete()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    perform public.apply_transaction_balance_deltas(array(
+        select row(transaction_date, amount, -1)::public.transaction_balance_delta
+        from old_rows
+    ));
+    return null;
+end;
+$$;
+
+create or replace function public.transaction_balances_on_truncate()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    delete from public.transaction_balances;
+    return null;
+end;
+$$;
+
+drop trigger if exists transaction_balances_insert on public.transactions;
+create trigger transaction_balances_insert
+    after insert on public.transactions
+    referencing new table as new_rows
+    for each statement execute function public.transaction_balances_on_insert();
+
+drop trigger if exists transaction_balances_update on public.transactions;
+create trigger transaction_balances_update
+    after update on public.transactions
+    referencing old table as old_rows new table as new_rows
+    for each statement execute function public.transaction_balances_on_update();
+
+drop trigger if exists transaction_balances_delete on public.transactions;
+create trigger transaction_balances_delete
+    after delete on public.transactions
+    referencing old table as old_rows
+    for each statement execute function public.transaction_balances_on_delete();
+
+drop trigger if exists transaction_balances_truncate on public.transactions;
+create trigger transaction_balances_truncate
+    after truncate on public.transactions
+    for each statement execute function public.transaction_balances_on_truncate();
+
+
+-- =====================
+-- FALLBACK E VERIFICAÇÃO
+-- =====================
+
+-- Soma no servidor (sem o teto de linhas do PostgREST); intervalo opcional
+create or replace function public.transaction_totals(
+    p_start date default null,
+    p_end date default null
+) returns table (balance numeric, income numeric, expense numeric, tx_count bigint)
+language sql
+stable
+as $$
+    select
+        coalesce(sum(amount), 0),
+        coalesce(sum(greatest(amount, 0)), 0),
+        coalesce(sum(greatest(-amount, 0)), 0),
+        count(*)
+    from public.transactions
+    where (p_start is null or transaction_date >= p_start)
+      and (p_end is null or transaction_date <= p_end);
+$$;
+
+-- Períodos em que o saldo guardado diverge da soma real
+create or replace function public.check_transaction_balances()
+returns table (
+    period text,
+    stored_balance numeric,
+    actual_balance numeric,
+    stored_count bigint,
+    actual_count bigint
+)
+language sql
+stable
+as $$
+    with actual as (
+        select
+            p.period,
+            sum(t.amount) as balance,
+            count(*) as tx_count
+        from public.transactions t
+        cross join lateral (
+            values ('all'), (to_char(t.transaction_date, 'YYYY-MM'))
+        ) as p(period)
+        group by p.period
+    )
+    select
+        coalesce(a.period, b.period),
+        coalesce(b.balance, 0),
+        coalesce(a.balance, 0),
+        coalesce(b.tx_count, 0),
+        coalesce(a.tx_count, 0)
+    from actual a
+    full outer join public.transaction_balances b on b.period = a.period
+    where coalesce(b.balance, 0) <> coalesce(a.balance, 0)
+       or coalesce(b.tx_count, 0) <> coalesce(a.tx_count, 0)
+    order by 1;
+$$;
+
+-- Recalcula tudo a partir de transactions (backfill e reparo)
+create or replace function public.rebuild_transaction_balances()
+returns void
+language plpgsql
+as $$
+begin
+    -- bloqueia escritas em transactions durante o recálculo
+    lock table public.transactions in share mode;
+
+    delete from public.transaction_balances;
+
+    perform public.apply_transaction_balance_deltas(array(
+        select row(transaction_date, amount, 1)::public.transaction_balance_delta
+        from public.transactions
+    ));
+end;
+$$;
+
+-- reparo é operação de manutenção: fora do alcance da API
+revoke execute on function public.rebuild_transaction_balances()
+    from public, anon, authenticated;
+
+select public.rebuild_transaction_balances();
@@ -0,0 +1,218 @@
+-- Rollups por (mês, categoria, tipo): resumos mensais leem algumas dezenas
+-- de linhas em vez de todas as transações do período. Mantidos por
+-- triggers de statement, como transaction_balances.
+
+create table if not exists public.transaction_rollups (
+    month               date not null,          -- primeiro dia do mês
+    category            text not null,          -- 'Sem categoria' quando nula
+    transaction_type    text not null,
+    total               numeric(14, 2) not null default 0,
+    tx_count            bigint not null default 0,
+    installment_total   numeric(14, 2) not null default 0,
+    installment_count   bigint not null default 0,
+    updated_at          timestamptz not null default now(),
+    primary key (month, category, transaction_type)
+);
+
+alter table public.transaction_rollups enable row level security;
+
+do $$
+begin
+    if not exists (select 1 from pg_type where typname = 'transaction_rollup_delta') then
+        create type public.transaction_rollup_delta as (
+            transaction_date date,
+            category text,
+            transaction_type text,
+            amount numeric,
+            is_installment boolean,
+            sign integer
+        );
+    end if;
+end $$;
+
+
+-- =====================
+-- APLICAÇÃO DOS DELTAS
+-- =====================
+
+create or replace function public.apply_transaction_rollup_deltas(
+    p_deltas public.transaction_rollup_delta[]
+) returns void
+language sql
+security definer
+set search_path = public
+as $$
+    insert into public.transaction_rollups as r
+        (month, category, transaction_type, total, tx_count,
+         installment_total, installment_count, updated_at)
+    select
+        date_trunc('month', d.transaction_date)::date,
+        coalesce(d.category, 'Sem categoria'),
+        d.transaction_type,
+        sum(d.sign * d.amount),
+        sum(d.sign),
+        sum(case when d.is_installment then d.sign * d.amount else 0 end),
+        sum(case when d.is_installment then d.sign else 0 end),
+        now()
+    from unnest(p_deltas) as d
+    group by 1, 2, 3
+    order by 1, 2, 3
+    on conflict (month, category, transaction_type) do update set
+        total             = r.total + excluded.total,
+        tx_count          = r.tx_count + excluded.tx_count,
+        installment_total = r.installment_total + excluded.installment_total,
+        installment_count = r.installment_count + excluded.installment_count,
+        updated_at        = excluded.updated_at;
+
+    -- grupos que ficaram vazios: só as chaves que receberam delta negativo
+    -- podem ter zerado, então o delete não varre a tabela
+    delete from public.transaction_rollups r
+    using (
+        select distinct
+            date_trunc('month', d.transaction_date)::date as month,
+            coalesce(d.category, 'Sem categoria') as category,
+            d.transaction_type
+        from unnest(p_deltas) as d
+        where d.sign < 0
+    ) as k
+    where r.month = k.month
+      and r.category = k.category
+      and r.transaction_type = k.transaction_type
+      and r.tx_count = 0;
+$$;
+
+revoke execute on function public.apply_transaction_rollup_deltas(public.transaction_rollup_delta[])
+    from public, anon, authenticated;
+
+-- Triggers como security definer, como em transaction_balances
+create or replace function public.transaction_rollups_on_insert()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    perform public.apply_transaction_rollup_deltas(array(
+        select row(transaction_date, category, transaction_type, amount,
+                   coalesce(is_installment, false), 1)::public.transaction_rollup_delta
+        from new_rows
+    ));
+    return null;
+end;
+$$;
+
+create or replace function public.transaction_rollups_on_update()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    perform public.apply_transaction_rollup_deltas(array(
+        select row(transaction_date, category, transaction_type, amount,
+                   coalesce(is_installment, false), -1)::public.transaction_rollup_delta
+        from old_rows
+        union all
+        select row(transaction_date, category, transaction_type, amount,
+                   coalesce(is_installment, false), 1)::public.transaction_rollup_delta
+        from new_rows
+    ));
+    return null;
+end;
+$$;
+
+create or replace function public.transaction_rollups_on_delete()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    perform public.apply_transaction_rollup_deltas(array(
+        select row(transaction_date, category, transaction_type, amount,
+                   coalesce(is_installment, false), -1)::public.transaction_rollup_delta
+        from old_rows
+    ));
+    return null;
+end;
+$$;
+
+create or replace function public.transaction_rollups_on_truncate()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    delete from public.transaction_rollups;
+    return null;
+end;
+$$;
+
+drop trigger if exists transaction_rollups_insert on public.transactions;
+create trigger transaction_rollups_insert
+    after insert on public.transactions
+    referencing new table as new_rows
+    for each statement execute function public.transaction_rollups_on_insert();
+
+drop trigger if exists transaction_rollups_update on public.transactions;
+create trigger transaction_rollups_update
+    after update on public.transactions
+    referencing old table as old_rows new table as new_rows
+    for each statement execute function public.transaction_rollups_on_update();
+
+drop trigger if exists transaction_rollups_delete on public.transactions;
+create trigger transaction_rollups_delete
+    after delete on public.transactions
+    referencing old table as old_rows
+    for each statement execute function public.transaction_rollups_on_delete();
+
+drop trigger if exists transaction_rollups_truncate on public.transactions;
+create trigger transaction_rollups_truncate
+    after truncate on public.transactions
+    for each statement execute function public.transaction_rollups_on_truncate();
+
+
+-- =====================
+-- RECÁLCULO EM LOTE
+-- =====================
+
+-- Recalcula os rollups (tudo, ou só os meses de p_start a p_end)
+create or replace function public.rebuild_transaction_rollups(
+    p_start date default null,
+    p_end date default null
+) returns void
+language plpgsql
+as $$
+declare
+    v_start date := date_trunc('month', p_start)::date;
+    v_end date := (date_trunc('month', p_end) + interval '1 month - 1 day')::date;
+begin
+    lock table public.transactions in share mode;
+
+    delete from public.transaction_rollups
+    where (v_start is null or month >= v_start)
+      and (v_end is null or month <= v_end);
+
+    insert into public.transaction_rollups
+        (month, category, transaction_type, total, tx_count,
+         installment_total, installment_count)
+    select
+        date_trunc('month', transaction_date)::date,
+        coalesce(category, 'Sem categoria'),
+        transaction_type,
+        sum(amount),
+        count(*),
+        sum(case when is_installment then amount else 0 end),
+        count(*) filter (where is_installment)
+    from public.transactions
+    where (v_start is null or transaction_date >= v_start)
+      and (v_end is null or transaction_date <= v_end)
+    group by 1, 2, 3;
+end;
+$$;
+
+revoke execute on function public.rebuild_transaction_rollups(date, date)
+    from public, anon, authenticated;
+
+select public.rebuild_transaction_rollups();
@@ -0,0 +1,8 @@
+-- Leitura em páginas (FinanceRepository.iter_chunks): ORDER BY
+-- transaction_date, id com filtro (transaction_date, id) > cursor vira um
+-- index scan por página, nos dois sentidos.
+create index if not exists transactions_transaction_date_id_idx
+    on public.transactions (transaction_date, id);
+
+-- o índice composto já atende filtros só por data
+drop index if exists public.transactions_transaction_date_idx;
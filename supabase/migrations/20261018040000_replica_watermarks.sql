@@ -0,0 +1,97 @@
+-- Watermarks para a réplica local (app/infra/replica.py): updated_at em
+-- transactions e memory_notes, índice (updated_at, id) para o pull
+-- incremental em keyset, e replica_deletions com os deletes, que um pull
+-- por updated_at não enxerga.
+
+alter table public.transactions
+    add column if not exists updated_at timestamptz not null default now();
+
+alter table public.memory_notes
+    add column if not exists updated_at timestamptz not null default now();
+
+create or replace function public.set_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists transactions_set_updated_at on public.transactions;
+create trigger transactions_set_updated_at
+    before update on public.transactions
+    for each row execute function public.set_updated_at();
+
+drop trigger if exists memory_notes_set_updated_at on public.memory_notes;
+create trigger memory_notes_set_updated_at
+    before update on public.memory_notes
+    for each row execute function public.set_updated_at();
+
+create index if not exists transactions_updated_at_id_idx
+    on public.transactions (updated_at, id);
+
+create index if not exists memory_notes_updated_at_id_idx
+    on public.memory_notes (updated_at, id);
+
+
+-- =====================
+-- TOMBSTONES
+-- =====================
+
+create table if not exists public.replica_deletions (
+    id          bigint generated always as identity primary key,
+    table_name  text not null,
+    row_id      text not null,                  -- '*' para TRUNCATE
+    deleted_at  timestamptz not null default now()
+);
+
+alter table public.replica_deletions enable row level security;
+
+create index if not exists replica_deletions_deleted_at_id_idx
+    on public.replica_deletions (deleted_at, id);
+
+create or replace function public.record_replica_deletions()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    if tg_op = 'TRUNCATE' then
+        insert into public.replica_deletions (table_name, row_id)
+        values (tg_table_name, '*');
+    else
+        insert into public.replica_deletions (table_name, row_id)
+        select tg_table_name, id::text from old_rows;
+    end if;
+
+    return null;
+end;
+$$;
+
+revoke execute on function public.record_replica_deletions()
+    from public, anon, authenticated;
+
+drop trigger if exists transactions_replica_delete on public.transactions;
+create trigger transactions_replica_delete
+    after delete on public.transactions
+    referencing old table as old_rows
+    for each statement execute function public.record_replica_deletions();
+
+drop trigger if exists transactions_replica_truncate on public.transactions;
+create trigger transactions_replica_truncate
+    after truncate on public.transactions
+    for each statement execute function public.record_replica_deletions();
+
+drop trigger if exists memory_notes_replica_delete on public.memory_notes;
+create trigger memory_notes_replica_delete
+    after delete on public.memory_notes
+    referencing old table as old_rows
+    for each statement execute function public.record_replica_deletions();
+
+drop trigger if exists memory_notes_replica_truncate on public.memory_notes;
+create trigger memory_notes_replica_truncate
+    after truncate on public.memory_notes
+    for each statement execute function public.record_replica_deletions();
@@ -0,0 +1,10 @@
+-- Deduplicação de extratos importados: import_hash é o hash de (data,
+-- valor, descrição, FITID, ocorrência no arquivo). Reimportar o mesmo
+-- arquivo vira INSERT ... ON CONFLICT DO NOTHING. Lançamentos digitados
+-- ficam com import_hash nula, e nulas não conflitam entre si.
+
+alter table public.transactions
+    add column if not exists import_hash text;
+
+create unique index if not exists transactions_import_hash_key
+    on public.transactions (import_hash);
@@ -0,0 +1,15 @@
+-- Mensagens confirmadas no bot, com a intenção escolhida pelo usuário.
+-- É o texto real usado para avaliar o classificador local de intenção
+-- (python -m app.ai.intent_classifier report); as transações só guardam
+-- a descrição.
+create table if not exists public.intent_samples (
+    id uuid primary key default gen_random_uuid(),
+    text text not null,
+    intent text not null check (intent in ('finance', 'memory')),
+    created_at timestamptz not null default now()
+);
+
+create index if not exists intent_samples_created_at_idx
+    on public.intent_samples (created_at desc);
+
+alter table public.intent_samples enable row level security;
@@ -0,0 +1,105 @@
+import asyncio
+
+from app.ai.batcher import MicroBatcher
+
+
+async def parse_one(text, on_partial=None):
+    return {"text": text}
+
+
+def submit_all(batcher, texts):
+    async def main():
+        return await asyncio.gather(
+            *(batcher.submit("chat", text) for text in texts), return_exceptions=True
+        )
+
+    return asyncio.run(main())
+
+
+def test_results_follow_arrival_order():
+    async def parse_many(texts):
+        return [{"text": t} for t in texts]
+
+    batcher = MicroBatcher(parse_one, parse_many, window_ms=10)
+
+    assert submit_all(batcher, ["a", "b", "c"]) == [{"text": "a"}, {"text": "b"}, {"text": "c"}]
+
+
+def test_short_batch_fails_every_caller():
+    async def parse_many(texts):
+        return [{"text": texts[0]}]
+
+    batcher = MicroBatcher(parse_one, parse_many, window_ms=10)
+    results = submit_all(batcher, ["a", "b"])
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_cancelled_batch_cancels_callers():
+    async def main():
+        running = asyncio.Event()
+
+        async def parse_many(texts):
+            running.set()
+            await asyncio.sleep(10)
+
+        batcher = MicroBatcher(parse_one, parse_many, window_ms=1)
+        callers = [asyncio.create_task(batcher.submit("chat", t)) for t in ("a", "b")]
+        await running.wait()
+
+        for task in asyncio.all_tasks():
+            if task.get_coro().__name__ == "_run":
+                task.cancel()
+
+        return await asyncio.gather(*callers, return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+
+def test_running_batches_are_referenced_until_done():
+    async def main():
+        release = asyncio.Event()
+
+        async def parse_many(texts):
+            await release.wait()
+            return [{"text": t} for t in texts]
+
+        batcher = MicroBatcher(parse_one, parse_many, window_ms=1)
+        callers = [asyncio.create_task(batcher.submit("chat", t)) for t in ("a", "b")]
+        await asyncio.sleep(0.01)
+
+        running = len(batcher._tasks)
+        release.set()
+        results = await asyncio.gather(*callers)
+
+        return running, len(batcher._tasks), results
+
+    running, left, results = asyncio.run(main())
+
+    assert running == 1
+    assert left == 0
+    assert results == [{"text": "a"}, {"text": "b"}]
+
+
+def test_close_cancels_open_windows_and_running_batches():
+    async def main():
+        async def parse_many(texts):
+            await asyncio.sleep(10)
+
+        batcher = MicroBatcher(parse_one, parse_many, window_ms=1)
+        running = [asyncio.create_task(batcher.submit("a", t)) for t in ("1", "2")]
+        await asyncio.sleep(0.01)
+
+        batcher.window = 10
+        waiting = asyncio.create_task(batcher.submit("b", "3"))
+        await asyncio.sleep(0)
+
+        await batcher.close()
+        return await asyncio.gather(*running, waiting, return_exceptions=True), batcher
+
+    results, batcher = asyncio.run(main())
+
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+    assert not batcher._tasks and not batcher._timers
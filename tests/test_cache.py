@@ -0,0 +1,59 @@
+import time
+from datetime import date
+
+from app.ai.cache import ParseCache
+
+
+def test_reference_date_is_part_of_the_key():
+    cache = ParseCache()
+    today = ParseCache.make_key("finance", "paguei 10 ontem", date(2026, 10, 18))
+    tomorrow = ParseCache.make_key("finance", "paguei 10 ontem", date(2026, 10, 19))
+
+    cache.set(today, {"transaction_date": "2026-10-17"})
+
+    assert today != tomorrow
+    assert cache.get(tomorrow) is None
+    assert cache.get(today) == {"transaction_date": "2026-10-17"}
+
+
+def test_key_normalizes_whitespace_and_case_per_namespace():
+    day = date(2026, 10, 18)
+
+    assert ParseCache.make_key("finance", "  Uber   10 ", day) == ParseCache.make_key("finance", "uber 10", day)
+    assert ParseCache.make_key("finance", "uber 10", day) != ParseCache.make_key("memory", "uber 10", day)
+
+
+def test_lru_evicts_the_least_recently_used():
+    cache = ParseCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = ParseCache(ttl=0.05)
+    cache.set("a", 1)
+    time.sleep(0.1)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_values_are_copied_and_hits_counted():
+    cache = ParseCache()
+    value = {"tags": ["x"]}
+    cache.set("a", value)
+    value["tags"].append("y")
+
+    first = cache.get("a")
+    first["tags"].append("z")
+
+    assert cache.get("a") == {"tags": ["x"]}
+    assert cache.get("b") is None
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 1)
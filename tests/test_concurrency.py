@@ -0,0 +1,114 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from telegram import Chat, Message, Update
+
+from app.bot import telegram_bot
+from app.bot.concurrency import ChatLocks, ChatOrderedUpdateProcessor
+
+
+def make_update(update_id, chat_id):
+    message = Message(update_id, datetime.now(), Chat(chat_id, "private"), text="oi")
+    return Update(update_id, message=message)
+
+
+def test_chat_locks_are_fifo_and_released():
+    locks = ChatLocks()
+    order = []
+
+    async def hold(chat_id, name, delay):
+        async with locks.hold(chat_id):
+            order.append(f"{name}+")
+            await asyncio.sleep(delay)
+            order.append(f"{name}-")
+
+    async def scenario():
+        await asyncio.gather(hold(1, "a", 0.02), hold(1, "b", 0), hold(2, "c", 0))
+
+    asyncio.run(scenario())
+
+    # b espera a; c (outro chat) não espera ninguém
+    assert order.index("a-") < order.index("b+")
+    assert order.index("c+") < order.index("a-")
+    assert locks.active_chats == 0
+
+
+def test_processor_orders_each_chat_and_parallelizes_chats():
+    events = []
+
+    async def handle(name, delay):
+        events.append(f"{name}+")
+        await asyncio.sleep(delay)
+        events.append(f"{name}-")
+
+    async def scenario():
+        processor = ChatOrderedUpdateProcessor(workers=4, max_pending=8, locks=ChatLocks())
+        await processor.initialize()
+        await asyncio.gather(
+            processor.do_process_update(make_update(1, 10), handle("a1", 0.03)),
+            processor.do_process_update(make_update(2, 10), handle("a2", 0)),
+            processor.do_process_update(make_update(3, 20), handle("b1", 0)),
+        )
+
+    asyncio.run(scenario())
+
+    assert events.index("a1-") < events.index("a2+")
+    assert events.index("b1-") < events.index("a1-")
+
+
+def test_processor_bounds_workers():
+    running = 0
+    peak = 0
+
+    async def handle():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    async def scenario():
+        processor = ChatOrderedUpdateProcessor(workers=2, max_pending=8, locks=ChatLocks())
+        await processor.initialize()
+        await asyncio.gather(*(
+            processor.do_process_update(make_update(i, i), handle()) for i in range(6)
+        ))
+
+    asyncio.run(scenario())
+
+    assert peak == 2
+
+
+def test_route_message_replies_in_arrival_order(monkeypatch):
+    replies = []
+    delays = {"primeira": 0.03, "segunda": 0}
+
+    async def submit(chat_id, text, on_partial=None):
+        await asyncio.sleep(delays[text])
+        return {"intent": "finance", "data": {"text": text}}
+
+    async def reply(update, context, data, message=None):
+        replies.append(data["text"])
+
+    monkeypatch.setattr(telegram_bot.message_extractor, "extract_local", lambda text: None)
+    monkeypatch.setattr(telegram_bot.message_batcher, "submit", submit)
+    monkeypatch.setattr(telegram_bot, "reply_finance_confirmation", reply)
+    monkeypatch.setattr(telegram_bot, "STREAMING_ENABLED", False)
+
+    def update(text):
+        return SimpleNamespace(
+            message=SimpleNamespace(text=text),
+            effective_chat=SimpleNamespace(id=1),
+        )
+
+    async def scenario():
+        # como no block=False: as duas tasks começam antes da primeira terminar
+        await asyncio.gather(
+            telegram_bot.route_message(update("primeira"), None),
+            telegram_bot.route_message(update("segunda"), None),
+        )
+
+    asyncio.run(scenario())
+
+    assert replies == ["primeira", "segunda"]
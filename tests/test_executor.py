@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+
+from app.infra.executor import BlockingExecutor
+
+
+def test_run_returns_results_and_raises_errors():
+    executor = BlockingExecutor(max_workers=2, max_queue=2)
+
+    def fail():
+        raise ValueError("x")
+
+    async def scenario():
+        assert await executor.run(lambda a, b=0: a + b, 1, b=2) == 3
+        try:
+            await executor.run(fail)
+        except ValueError:
+            return True
+
+    try:
+        assert asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+
+def test_threads_are_bounded_by_max_workers():
+    executor = BlockingExecutor(max_workers=2, max_queue=10)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    async def scenario():
+        await asyncio.gather(*(executor.run(work) for _ in range(8)))
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert peak == 2
+    assert executor.snapshot()["running"] == 0
+
+
+def test_calls_beyond_the_queue_wait_on_the_loop():
+    executor = BlockingExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        calls = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+
+        # 1 rodando + 1 na fila do pool; os outros 2 nem foram submetidos
+        snapshot = executor.snapshot()
+        release.set()
+        await asyncio.gather(*calls)
+        return snapshot
+
+    try:
+        snapshot = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert (snapshot["running"], snapshot["queued"]) == (1, 1)
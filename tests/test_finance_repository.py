@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.modules.finance import repository
+from app.modules.finance.repository import FinanceRepository
+
+
+def test_keyset_filter_ascending():
+    assert FinanceRepository._keyset_filter("gt", ("2026-03-05", "abc")) == (
+        'transaction_date.gt."2026-03-05",'
+        'and(transaction_date.eq."2026-03-05",id.gt.abc)'
+    )
+
+
+def test_keyset_filter_descending():
+    assert FinanceRepository._keyset_filter("lt", ("2026-03-05", "abc")).startswith(
+        'transaction_date.lt."2026-03-05",'
+    )
+
+
+@pytest.mark.parametrize("columns, expected", [
+    ("*", "*"),
+    (" * ", " * "),
+    ("amount", "amount,transaction_date,id"),
+    ("id, amount", "id,amount,transaction_date"),
+    ("transaction_date,amount,id", "transaction_date,amount,id"),
+])
+def test_with_cursor_columns(columns, expected):
+    assert FinanceRepository._with_cursor_columns(columns) == expected
+
+
+class FakeQuery:
+    def __init__(self, pages):
+        self.pages = pages
+        self.filters = []
+
+    def select(self, columns):
+        return self
+
+    def or_(self, keyset):
+        self.filters.append(keyset)
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def limit(self, size):
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=self.pages.pop(0))
+
+
+def repository_with_pages(monkeypatch, pages):
+    monkeypatch.setattr(repository.local_replica, "ready", lambda table: False)
+    query = FakeQuery(pages)
+    repo = FinanceRepository.__new__(FinanceRepository)
+    repo.supabase = SimpleNamespace(table=lambda name: query)
+    return repo, query
+
+
+def test_fetch_page_uses_execute():
+    assert FinanceRepository._fetch_page(FakeQuery([[{"id": "a"}]])) == [{"id": "a"}]
+    assert FinanceRepository._fetch_page(FakeQuery([None])) == []
+
+
+def test_iter_chunks_advances_the_cursor_until_an_empty_page(monkeypatch):
+    pages = [
+        [{"transaction_date": "2026-03-01", "id": "a"}],
+        [{"transaction_date": "2026-03-02", "id": "b"}],
+        [],
+    ]
+    repo, query = repository_with_pages(monkeypatch, pages)
+
+    chunks = list(repo.iter_chunks(page_size=1))
+
+    assert [c[0]["id"] for c in chunks] == ["a", "b"]
+    assert query.filters == [
+        FinanceRepository._keyset_filter("gt", ("2026-03-01", "a")),
+        FinanceRepository._keyset_filter("gt", ("2026-03-02", "b")),
+    ]
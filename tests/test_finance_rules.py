@@ -0,0 +1,77 @@
+from datetime import date
+
+import pytest
+
+from app.ai.finance_rules import FinanceRuleParser, strip_accents
+
+TODAY = date(2026, 10, 18)
+
+
+@pytest.fixture
+def parser():
+    return FinanceRuleParser()
+
+
+def test_strip_accents():
+    assert strip_accents("Crédito à vista, São João") == "Credito a vista, Sao Joao"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("r$ 45,90", 45.90),
+    ("r$ 1.234,5", 1234.50),
+    ("600", 600.0),
+    ("1,5 mil", 1500.0),
+    ("3k", 3000.0),
+    ("2 contas de 50", None),
+    ("5 km", None),
+])
+def test_extract_amount(text, expected):
+    assert FinanceRuleParser._extract_amount(text)[0] == expected
+
+
+def test_extract_date():
+    assert FinanceRuleParser._extract_date("dia 12/10/25", TODAY)[0] == date(2025, 10, 12)
+    assert FinanceRuleParser._extract_date("dia 05", TODAY)[0] == date(2026, 10, 5)
+    assert FinanceRuleParser._extract_date("ontem", TODAY)[0] == date(2026, 10, 17)
+    assert FinanceRuleParser._extract_date("anteontem", TODAY)[0] == date(2026, 10, 16)
+    assert FinanceRuleParser._extract_date("sem data", TODAY)[0] == TODAY
+
+
+def test_extract_installments():
+    assert FinanceRuleParser._extract_installments("600 em 10x")[0] == 10
+    assert FinanceRuleParser._extract_installments("1x")[0] is None
+
+
+def test_parse_pix_expense(parser):
+    parsed = parser.parse("paguei R$ 45,90 no pix mercado", today=TODAY)
+
+    assert parsed["amount"] == 45.90
+    assert parsed["transaction_type"] == "expense"
+    assert parsed["payment_method"] == "pix"
+    assert parsed["category"] == "Alimentação"
+    assert parsed["description"] == "Mercado"
+    assert parsed["transaction_date"] == "2026-10-18"
+
+
+def test_parse_installments_default_to_credit(parser):
+    parsed = parser.parse("comprei tênis 600 em 3x", today=TODAY)
+
+    assert parsed["installments_total"] == 3
+    assert parsed["payment_method"] == "credit"
+    assert parsed["description"] == "Tênis"
+
+
+def test_parse_income(parser):
+    parsed = parser.parse("recebi salário de 5.000,00", today=TODAY)
+
+    assert parsed["amount"] == 5000.0
+    assert parsed["transaction_type"] == "income"
+
+
+@pytest.mark.parametrize("text", [
+    "ideia: gastar menos com uber 30",
+    "paguei 2 contas de 50",
+    "andei 5 km",
+])
+def test_low_confidence_defers_to_llm(parser, text):
+    assert parser.parse(text, today=TODAY) is None
@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+
+from app.modules.finance.forecast import CashFlowProjection, month_index
+
+
+def row(day, amount, installment=False):
+    return {"transaction_date": day, "amount": amount, "is_installment": installment}
+
+
+def test_month_index():
+    assert list(month_index(["2026-10-01", "2026-12-31", "2027-01-15", "2026-09-30"], date(2026, 10, 18))) == [
+        0, 2, 3, -1,
+    ]
+
+
+def test_projection_buckets_by_month():
+    projection = CashFlowProjection(date(2026, 10, 18), 3)
+    projection.add([
+        row("2026-10-20", 5000.0),
+        row("2026-10-25", -33.34, True),
+        row("2026-11-25", -33.33, True),
+        row("2026-12-25", -33.33, True),
+        row("2026-11-02", -120.10),
+    ])
+    projection.add([
+        row("2027-01-05", -999.0),
+        row("2026-09-30T12:00:00", -1.0),
+    ])
+
+    result = projection.result()
+
+    assert [m["month"] for m in result] == [date(2026, 10, 1), date(2026, 11, 1), date(2026, 12, 1)]
+    assert [m["inflow"] for m in result] == [5000.0, 0.0, 0.0]
+    assert [m["outflow"] for m in result] == [33.34, 153.43, 33.33]
+    assert [m["installments"] for m in result] == [33.34, 33.33, 33.33]
+    assert [m["installment_count"] for m in result] == [1, 1, 1]
+    assert [m["net"] for m in result] == [4966.66, -153.43, -33.33]
+    assert [m["cumulative"] for m in result] == [4966.66, 4813.23, 4779.9]
+
+
+def test_projection_sums_in_exact_cents():
+    projection = CashFlowProjection(date(2026, 1, 1), 1)
+    projection.add([row("2026-01-10", -0.1)] * 3 + [row("2026-01-11", 0.3)])
+
+    assert projection.result()[0]["net"] == 0.0
+
+
+def test_end_date_and_horizon():
+    assert CashFlowProjection(date(2026, 10, 18), 3).end_date == date(2026, 12, 31)
+    assert CashFlowProjection(date(2026, 10, 18), 1).add([]) is None
+
+    with pytest.raises(ValueError):
+        CashFlowProjection(date(2026, 10, 18), 0)
@@ -0,0 +1,77 @@
+from app.bot import ingress
+from app.bot.ingress import WorkerSupervisor, pick_worker
+
+
+class FakeProcess:
+    def __init__(self):
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+
+def supervisor(monkeypatch, count=2):
+    spawned = []
+
+    def spawn(self, index):
+        self._started_at[index] = now[0]
+        process = FakeProcess()
+        spawned.append((index, process))
+        return process
+
+    now = [0.0]
+    monkeypatch.setattr(WorkerSupervisor, "_spawn", spawn)
+    monkeypatch.setattr(ingress, "WORKER_BACKOFF_BASE", 1.0)
+    monkeypatch.setattr(ingress, "WORKER_BACKOFF_MAX", 4.0)
+    monkeypatch.setattr(ingress, "WORKER_STABLE_SECONDS", 60.0)
+
+    s = WorkerSupervisor(count)
+    s.start()
+    return s, spawned, now
+
+
+def test_dead_worker_restarts_with_growing_backoff(monkeypatch):
+    s, spawned, now = supervisor(monkeypatch)
+    delays = []
+
+    for _ in range(4):
+        s.processes[0].returncode = 1
+        s.check(now[0])
+        delays.append(s._restart_at[0] - now[0])
+
+        now[0] = s._restart_at[0]
+        s.check(now[0])
+
+    assert delays == [1.0, 2.0, 4.0, 4.0]
+    assert s.restarts == 4
+    assert all(index == 0 for index, _ in spawned[2:])
+
+
+def test_stable_worker_resets_backoff(monkeypatch):
+    s, _, now = supervisor(monkeypatch, count=1)
+    s._backoff[0] = 4.0
+
+    now[0] = 120.0
+    s.processes[0].returncode = 1
+    s.check(now[0])
+
+    assert s._restart_at[0] == 121.0
+
+
+def test_other_workers_keep_running_during_backoff(monkeypatch):
+    s, spawned, now = supervisor(monkeypatch)
+    s.processes[0].returncode = 1
+
+    s.check(0.0)
+    s.check(0.5)
+
+    assert s.restarts == 0
+    assert s.processes[1].poll() is None
+    assert len(spawned) == 2
+
+
+def test_same_chat_always_goes_to_the_same_worker():
+    update = {"update_id": 1, "message": {"chat": {"id": 42}, "text": "oi"}}
+    callback = {"update_id": 2, "callback_query": {"from": {"id": 42}, "message": {"chat": {"id": 42}}}}
+
+    assert pick_worker(update, 4) == pick_worker(callback, 4)
@@ -0,0 +1,61 @@
+from datetime import date
+
+import pytest
+
+from app.modules.finance.installment_service import InstallmentService
+
+
+def cents(amounts):
+    return [round(a * 100) for a in amounts]
+
+
+@pytest.mark.parametrize("total, installments", [
+    (100.0, 3),
+    (0.05, 4),
+    (1999.99, 12),
+    (-100.0, 3),
+    (-0.01, 2),
+    (123456.78, 24),
+])
+def test_split_sums_to_total(total, installments):
+    parts = InstallmentService.split_amount(total, installments)
+
+    assert len(parts) == installments
+    assert sum(cents(parts)) == round(total * 100)
+
+
+def test_leftover_cents_go_to_first_installments():
+    assert InstallmentService.split_amount(100.0, 3) == [33.34, 33.33, 33.33]
+    assert InstallmentService.split_amount(10.0, 6) == [1.67, 1.67, 1.67, 1.67, 1.66, 1.66]
+
+
+def test_negative_total_keeps_sign_on_every_installment():
+    assert InstallmentService.split_amount(-100.0, 3) == [-33.34, -33.33, -33.33]
+
+
+def test_generated_installments_are_monthly():
+    generated = InstallmentService.generate_installments(
+        total_amount=-300.0,
+        installments=3,
+        description="Tênis",
+        category="Vestuário",
+        start_due_date=date(2026, 1, 31),
+        transaction_type="expense",
+    )
+
+    assert [g["due_date"] for g in generated] == [
+        date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31),
+    ]
+    assert [g["installment_number"] for g in generated] == [1, 2, 3]
+
+
+def test_single_installment_is_rejected():
+    with pytest.raises(ValueError):
+        InstallmentService.generate_installments(
+            total_amount=10.0,
+            installments=1,
+            description="x",
+            category=None,
+            start_due_date=date(2026, 1, 1),
+            transaction_type="expense",
+        )
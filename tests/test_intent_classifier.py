@@ -0,0 +1,70 @@
+import sys
+
+from app.ai import intent_classifier
+from app.ai.intent_classifier import HashedIntentClassifier
+
+
+SOURCES = [
+    ([(f"paguei {i} mercado", "finance"), (f"mercado {i} no pix", "finance")], False)
+    for i in range(20)
+] + [
+    ([(f"ideia para o projeto numero {i}", "memory")], False) for i in range(20)
+] + [
+    ([(f"uber {i} ontem", "finance")], True) for i in range(10)
+] + [
+    ([(f"lembrar de ligar pro joão {i}", "memory")], True) for i in range(10)
+]
+
+
+def test_split_keeps_sibling_messages_together():
+    train_set, test_set = intent_classifier._split(SOURCES)
+    train = set(train_set)
+
+    for samples, _ in SOURCES:
+        assert all(s in train for s in samples) or not any(s in train for s in samples)
+
+
+def test_split_evaluates_only_real_text():
+    real = {s for samples, is_real in SOURCES if is_real for s in samples}
+    _, test_set = intent_classifier._split(SOURCES)
+
+    assert test_set
+    assert set(test_set) <= real
+
+
+def test_report_trains_on_the_train_split_only(monkeypatch):
+    trained_on = []
+    original_train = HashedIntentClassifier.train.__func__
+
+    def spy(cls, samples, *args, **kwargs):
+        trained_on.append(list(samples))
+        return original_train(cls, samples, *args, **kwargs)
+
+    monkeypatch.setattr(intent_classifier, "load_training_data", lambda limit: SOURCES)
+    monkeypatch.setattr(HashedIntentClassifier, "train", classmethod(spy))
+    monkeypatch.setattr(HashedIntentClassifier, "load", classmethod(lambda cls, path=None: None))
+    monkeypatch.setattr(sys, "argv", ["intent_classifier", "report"])
+
+    intent_classifier.main()
+
+    train_set, test_set = intent_classifier._split(SOURCES)
+    assert trained_on == [train_set]
+    assert not set(test_set) & set(trained_on[0])
+
+
+def test_template_only_model_is_not_trusted():
+    model = HashedIntentClassifier.train([s for samples, _ in SOURCES for s in samples])
+    assert not model.trusted()
+
+    model.report = {"samples": 200, "confident_accuracy": 0.99}
+    assert model.trusted()
+
+    model.report = {"samples": 200, "confident_accuracy": 0.9}
+    assert not model.trusted()
+
+
+def test_report_survives_save_and_load(tmp_path):
+    model = HashedIntentClassifier(weights={1: 0.5}, report={"samples": 60, "confident_accuracy": 1.0})
+    model.save(tmp_path / "model.json")
+
+    assert HashedIntentClassifier.load(tmp_path / "model.json").report == model.report
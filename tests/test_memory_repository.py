@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from app.modules.memory import repository
+from app.modules.memory.repository import MemoryRepository
+
+
+class FakeQuery:
+    def __init__(self, on_execute):
+        self.on_execute = on_execute
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return SimpleNamespace(data=self.on_execute())
+
+
+def use_supabase(monkeypatch, on_execute):
+    client = SimpleNamespace(table=lambda name: FakeQuery(on_execute))
+    monkeypatch.setattr(repository, "get_supabase_client", lambda: client)
+    monkeypatch.setattr(repository.local_replica, "ready", lambda table: False)
+    repository._invalidate_recent_pages()
+
+
+def test_first_page_is_cached_until_create(monkeypatch):
+    fetches = []
+    use_supabase(monkeypatch, lambda: fetches.append(1) or [{"id": "m-1"}])
+
+    repo = MemoryRepository()
+    repo.list_page(5)
+    repo.list_page(5)
+    assert len(fetches) == 1
+
+    repository._invalidate_recent_pages()
+    repo.list_page(5)
+    assert len(fetches) == 2
+
+
+def test_page_fetched_before_a_create_is_not_cached(monkeypatch):
+    def fetch_racing_a_create():
+        # um create em outra thread termina no meio da consulta
+        repository._invalidate_recent_pages()
+        return [{"id": "m-1"}]
+
+    use_supabase(monkeypatch, fetch_racing_a_create)
+
+    MemoryRepository().list_page(5)
+
+    assert repository._recent_pages.get(5) is None
@@ -0,0 +1,77 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.ai import message_extractor
+from app.ai.cache import ParseCache
+from app.ai.message_extractor import MessageExtractor
+from app.ai.metrics import LatencyStats
+
+MEMORY = {
+    "intent": "memory",
+    "finance": None,
+    "memory": {"memory_type": "idea", "content": "app de receitas", "tags": ["ideia"], "datetime": None},
+}
+FINANCE = {
+    "intent": "finance",
+    "memory": None,
+    "finance": {
+        "description": "mercado", "amount": 50.0, "transaction_type": "expense",
+        "category": "Mercado", "payment_method": None, "account": None,
+        "installments_total": None, "transaction_date": "2026-10-18",
+    },
+}
+
+
+def completion(payload):
+    return SimpleNamespace(
+        usage=None,
+        choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(payload)))],
+    )
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    stats = LatencyStats()
+    cache = ParseCache()
+    replies = []
+
+    async def acall(create, **kwargs):
+        return completion(replies.pop(0))
+
+    monkeypatch.setattr(message_extractor, "finance_parse_stats", stats)
+    monkeypatch.setattr(message_extractor, "parse_cache", cache)
+    monkeypatch.setattr(message_extractor, "openai_guard", SimpleNamespace(acall=acall))
+    monkeypatch.setattr(MessageExtractor, "async_client", SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=None))
+    ))
+
+    return SimpleNamespace(extractor=MessageExtractor(), stats=stats, cache=cache, replies=replies)
+
+
+def test_llm_stats_count_only_finance_results(extractor):
+    extractor.replies += [MEMORY, FINANCE]
+
+    async def scenario():
+        await extractor.extractor.extract_async("tive uma ideia de app de receitas", local_checked=True)
+        await extractor.extractor.extract_async("gastei cinquenta no mercado", local_checked=True)
+
+    asyncio.run(scenario())
+
+    assert extractor.stats.snapshot()["llm"]["count"] == 1
+
+
+def test_local_checked_skips_the_second_cache_lookup(extractor):
+    extractor.replies.append({"items": [MEMORY, FINANCE]})
+    texts = ["tive uma ideia de app de receitas", "gastei cinquenta no mercado"]
+
+    async def scenario():
+        return await extractor.extractor.extract_many_async(texts, local_checked=True)
+
+    results = asyncio.run(scenario())
+
+    assert [r["intent"] for r in results] == ["memory", "finance"]
+    assert extractor.cache.misses == 0
+    assert extractor.stats.snapshot()["llm_batch"]["count"] == 1
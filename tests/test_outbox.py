@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+from app.infra.notion import reminders
+from app.infra.outbox import Outbox, OutboxWorker
+from app.modules.finance import notion_sync_service
+from app.modules.finance.finance_service import FinanceService
+from app.modules.finance.notion_sync_service import FinanceNotionSyncService
+
+
+def test_jobs_complete_one_by_one(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.sqlite3"))
+    outbox.enqueue_many("notion_finance", [{"id": "a"}, {"id": "b"}, {"id": "c"}])
+
+    seen = []
+
+    def handler(payload):
+        # ao chegar em "c", os jobs anteriores já saíram da fila
+        seen.append((payload["id"], outbox.stats()["pending"]))
+        if payload["id"] == "b":
+            raise RuntimeError("notion fora")
+
+    worker = OutboxWorker(outbox, {"notion_finance": handler})
+    worker._process(outbox.claim())
+
+    assert seen == [("a", 3), ("b", 2), ("c", 2)]
+    assert (worker.processed, worker.failed) == (2, 1)
+    assert outbox.stats()["pending"] == 1
+
+
+class FakeNotion:
+    def __init__(self):
+        self.pages_by_tx = {}
+        self.created = 0
+        self.updated = 0
+        self.pages = SimpleNamespace(create=self._create, update=self._update)
+        self.databases = SimpleNamespace(
+            retrieve=lambda database_id: {"data_sources": [{"id": "ds-" + database_id}]}
+        )
+        self.data_sources = SimpleNamespace(query=self._query)
+
+    def _create(self, parent, properties):
+        key = properties.get("Transaction ID") or properties["Memory ID"]
+        key_id = key["rich_text"][0]["text"]["content"]
+        self.pages_by_tx[key_id] = f"page-{key_id}"
+        self.created += 1
+
+    def _update(self, page_id, properties):
+        assert "Criado em" not in properties
+        self.updated += 1
+
+    def _query(self, data_source_id, filter, page_size):
+        page = self.pages_by_tx.get(filter["rich_text"]["equals"])
+        return {"results": [{"id": page}] if page else []}
+
+
+def test_notion_sync_is_idempotent(monkeypatch):
+    notion = FakeNotion()
+    monkeypatch.setattr(notion_sync_service, "get_notion_client", lambda: notion)
+    monkeypatch.setattr(notion_sync_service, "settings", SimpleNamespace(require=lambda name: "db"))
+
+    service = FinanceNotionSyncService()
+    transaction = {"id": "tx-1", "description": "Mercado", "amount": -10, "category": "Casa"}
+
+    service.sync_transaction(transaction)
+    service.sync_transaction(transaction)
+
+    assert (notion.created, notion.updated) == (1, 1)
+
+
+def test_notion_reminder_is_idempotent(monkeypatch):
+    notion = FakeNotion()
+    monkeypatch.setattr(reminders, "get_notion_client", lambda: notion)
+    monkeypatch.setattr(reminders, "settings", SimpleNamespace(require=lambda name: "reminders"))
+
+    for _ in range(2):
+        reminders.create_notion_reminder("Dentista", "2026-10-20T09:00:00", memory_id="m-1")
+
+    assert (notion.created, notion.updated) == (1, 1)
+
+
+def test_enqueue_failure_does_not_break_the_save():
+    class BrokenOutbox:
+        def enqueue_many(self, kind, payloads):
+            raise OSError("disco cheio")
+
+    service = FinanceService(repository=None, installment_service=None, outbox=BrokenOutbox())
+
+    service._sync_notion_safe([{"id": "tx-1"}])
@@ -0,0 +1,58 @@
+from app.ai.partial_json import parse_partial_member, parse_partial_object
+
+
+def test_member_waits_for_key():
+    assert parse_partial_member('{"intent":"finance",', "finance") is None
+    assert parse_partial_member('{"intent":"finance","fin', "finance") is None
+
+
+def test_member_streams_nested_fields():
+    buffer = '{"intent":"finance","finance":{"description":"Uber","amount":12.5,"trans'
+
+    assert parse_partial_member(buffer, "finance") == {"description": "Uber", "amount": 12.5}
+
+
+def test_member_ignores_key_inside_strings():
+    buffer = '{"intent":"finance","finance":{"description":"x \\"memory\\": y",'
+
+    assert parse_partial_member(buffer, "memory") is None
+    assert parse_partial_member(buffer, "finance") == {"description": 'x "memory": y'}
+
+
+def test_member_null_value():
+    buffer = '{"intent":"memory","finance":null,"memory":{"memory_type":"idea",'
+
+    assert parse_partial_member(buffer, "finance") is None
+    assert parse_partial_member(buffer, "memory") == {"memory_type": "idea"}
+
+
+def test_object_without_brace():
+    assert parse_partial_object("") is None
+    assert parse_partial_object('  "a": 1') is None
+
+
+def test_object_only_returns_complete_fields():
+    assert parse_partial_object('{"description": "Mer') == {}
+    assert parse_partial_object('{"description": "Mercado", "amount": 4') == {"description": "Mercado"}
+
+
+def test_object_waits_for_nested_values():
+    buffer = '{"content": "x", "tags": ["a", "b"'
+
+    assert parse_partial_object(buffer) == {"content": "x"}
+    assert parse_partial_object(buffer + '], "datetime": null') == {"content": "x", "tags": ["a", "b"]}
+
+
+def test_object_ignores_commas_and_braces_inside_strings():
+    buffer = '{"description": "pão, leite {2}", "amount": 10.5, "cat'
+
+    assert parse_partial_object(buffer) == {"description": "pão, leite {2}", "amount": 10.5}
+
+
+def test_object_closed():
+    assert parse_partial_object('lixo {"a": 1, "b": [1, 2]} depois') == {"a": 1, "b": [1, 2]}
+
+
+def test_object_field_complete_at_trailing_comma():
+    assert parse_partial_object('{"amount": 12.5,') == {"amount": 12.5}
+    assert parse_partial_object('{"amount": 12.5') == {}
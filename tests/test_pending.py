@@ -0,0 +1,88 @@
+import asyncio
+import itertools
+import time
+
+from app.bot import pending
+from app.bot.pending import PendingStore, parse_callback_data
+
+
+def test_each_message_has_its_own_pending(tmp_path):
+    for store in (PendingStore(path=""), PendingStore(path=str(tmp_path / "pending.sqlite3"))):
+        first = PendingStore.make_key("finance", 1, 10)
+        second = PendingStore.make_key("finance", 1, 11)
+
+        store.put(first, {"amount": 10})
+        store.put(second, {"amount": 20})
+        store.delete(first)
+
+        assert store.get(first) is None
+        assert store.get(second) == {"amount": 20}
+        assert store.get(PendingStore.make_key("memory", 1, 11)) is None
+
+
+def test_memory_pending_expires():
+    store = PendingStore(path="", ttl=0.05)
+    store.put("k", {"a": 1})
+
+    time.sleep(0.1)
+
+    assert store.get("k") is None
+    assert len(store) == 0
+
+
+def test_sqlite_pending_expires(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(pending.time, "time", lambda: now[0])
+
+    store = PendingStore(path=str(tmp_path / "pending.sqlite3"), ttl=60)
+    store.put("k", {"a": 1})
+    assert store.get("k") == {"a": 1}
+
+    now[0] += 61
+    assert store.get("k") is None
+
+
+def test_sqlite_store_is_bounded_keeping_the_newest(tmp_path, monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr(pending.time, "time", lambda: next(clock))
+
+    store = PendingStore(path=str(tmp_path / "pending.sqlite3"), ttl=10_000, maxsize=10)
+    for i in range(100):
+        store.put(f"k{i}", {"i": i})
+
+    assert len(store) == 10
+    assert store.get("k99") == {"i": 99}
+    assert store.get("k0") is None
+
+
+def test_memory_store_is_bounded():
+    store = PendingStore(path="", maxsize=3)
+    for i in range(5):
+        store.put(f"k{i}", {"i": i})
+
+    assert len(store) == 3
+
+
+def test_sqlite_async_calls_go_through_the_executor(tmp_path, monkeypatch):
+    calls = []
+
+    async def run(fn, *args):
+        calls.append(fn.__name__)
+        return fn(*args)
+
+    monkeypatch.setattr(pending.io_executor, "run", run)
+    store = PendingStore(path=str(tmp_path / "pending.sqlite3"))
+
+    async def scenario():
+        await store.put_async("k", {"a": 1})
+        value = await store.get_async("k")
+        await store.delete_async("k")
+        return value
+
+    assert asyncio.run(scenario()) == {"a": 1}
+    assert calls == ["put", "get", "delete"]
+
+
+def test_parse_callback_data():
+    assert parse_callback_data("finance:confirm:123") == ("confirm", "123")
+    assert parse_callback_data("finance:confirm") == ("confirm", None)
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from telegram.error import RetryAfter
+
+from app.bot.rate_limit import FloodControlRateLimiter
+
+
+def edit(limiter, text, sent):
+    async def callback(text):
+        sent.append(text)
+        return text
+
+    return limiter.process_request(
+        callback, (), {"text": text}, "editMessageText", {"chat_id": 1, "message_id": 7}, None
+    )
+
+
+def test_cancelled_caller_hands_edit_to_coalesced_waiter():
+    async def main():
+        limiter = FloodControlRateLimiter()
+        limiter._paused_until = time.monotonic() + 0.05
+        sent = []
+
+        first = asyncio.create_task(edit(limiter, "v1", sent))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(edit(limiter, "v2", sent))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        result = await second
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        await limiter.shutdown()
+        return result, sent, limiter.stats()
+
+    result, sent, stats = asyncio.run(main())
+
+    assert result == "v2"
+    assert sent == ["v2"]
+    assert stats["coalesced"] == 1
+
+
+def test_edit_leaves_queue_when_every_caller_is_cancelled():
+    async def main():
+        limiter = FloodControlRateLimiter()
+        limiter._paused_until = time.monotonic() + 0.05
+        sent = []
+
+        callers = [asyncio.create_task(edit(limiter, f"v{i}", sent)) for i in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0.1)
+
+        stats = limiter.stats()
+        await limiter.shutdown()
+        return sent, stats
+
+    sent, stats = asyncio.run(main())
+
+    assert sent == []
+    assert stats["queued"] == 0
+
+
+@pytest.mark.parametrize("retry_after", [1, timedelta(seconds=1)])
+def test_retry_after_pauses_sends(retry_after):
+    async def main():
+        limiter = FloodControlRateLimiter()
+        calls = []
+
+        async def callback():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise RetryAfter(retry_after)
+            return True
+
+        result = await limiter.process_request(
+            callback, (), {}, "sendMessage", {"chat_id": 1}, None
+        )
+        await limiter.shutdown()
+        return result, calls
+
+    result, calls = asyncio.run(main())
+
+    assert result is True
+    assert calls[1] - calls[0] >= 1
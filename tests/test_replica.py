@@ -0,0 +1,132 @@
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from app.infra import replica
+from app.infra.replica import DELETIONS_TABLE, LocalReplica
+
+
+class FakeQuery:
+    def __init__(self, pages, calls):
+        self.pages = pages
+        self.calls = calls
+
+    def select(self, columns):
+        return self
+
+    def gte(self, column, value):
+        self.calls.append(("gte", column, value))
+        return self
+
+    def or_(self, keyset):
+        self.calls.append(("or", keyset))
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, size):
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=self.pages.pop(0) if self.pages else [])
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    pages = {}
+    calls = []
+    client = SimpleNamespace(table=lambda name: FakeQuery(pages.setdefault(name, []), calls))
+    monkeypatch.setattr(replica, "get_supabase_client", lambda: client)
+    return SimpleNamespace(pages=pages, calls=calls)
+
+
+@pytest.fixture
+def local(tmp_path):
+    store = LocalReplica(path=str(tmp_path / "replica.sqlite3"), enabled=True)
+    yield store
+    store.close()
+
+
+def memory(row_id, at):
+    return {"id": row_id, "created_at": at, "updated_at": at, "memory_type": "note", "content": row_id}
+
+
+def test_pull_stores_rows_and_advances_the_watermark(local, remote):
+    remote.pages["memory_notes"] = [
+        [memory("a", "2026-10-18T10:00:00+00:00"), memory("b", "2026-10-18T10:00:01+00:00")],
+        [memory("c", "2026-10-18T10:00:02+00:00")],
+    ]
+
+    assert local.pull("memory_notes") == 3
+    assert local.get("memory_notes", "c")["content"] == "c"
+    assert local._watermark("memory_notes") == ("2026-10-18T10:00:02.000000", "c")
+
+    # a segunda página continua do cursor da primeira
+    assert ("or", 'updated_at.gt."2026-10-18T10:00:01+00:00",'
+                  'and(updated_at.eq."2026-10-18T10:00:01+00:00",id.gt.b)') in remote.calls
+
+
+def test_next_pull_rereads_the_overlap_window(local, remote):
+    remote.pages["memory_notes"] = [[memory("a", "2026-10-18T10:05:00+00:00")]]
+    local.pull("memory_notes")
+    remote.calls.clear()
+
+    local.pull("memory_notes")
+
+    assert remote.calls[0] == ("gte", "updated_at", "2026-10-18T10:03:00+00:00")
+
+
+def test_watermark_never_moves_back(local):
+    local._advance("memory_notes", ("2026-10-18T10:00:02.000000", "c"))
+    local._advance("memory_notes", ("2026-10-18T10:00:01.000000", "z"))
+
+    assert local._watermark("memory_notes") == ("2026-10-18T10:00:02.000000", "c")
+
+
+def test_tombstones_delete_rows(local, remote):
+    remote.pages["memory_notes"] = [[memory("a", "2026-10-18T10:00:00+00:00")]]
+    remote.pages[DELETIONS_TABLE] = [[{
+        "id": 1, "table_name": "memory_notes", "row_id": "a",
+        "deleted_at": "2026-10-18T10:01:00+00:00",
+    }]]
+
+    local.sync()
+
+    assert local.get("memory_notes", "a") is None
+
+
+def test_ready_falls_back_until_a_recent_pull(local, remote, monkeypatch):
+    assert not LocalReplica(path=local.path, enabled=False).ready("memory_notes")
+    assert not local.ready("memory_notes")
+
+    local.pull("memory_notes")
+    assert local.ready("memory_notes")
+
+    monkeypatch.setattr(replica, "REPLICA_MAX_LAG_SECONDS", -1)
+    assert not local.ready("memory_notes")
+
+
+def test_ready_is_false_when_the_file_is_unusable(tmp_path):
+    broken = tmp_path / "replica.sqlite3"
+    broken.write_bytes(b"isto nao e um banco sqlite" * 100)
+
+    assert not LocalReplica(path=str(broken), enabled=True).ready("memory_notes")
+
+
+def test_close_closes_readers_of_every_thread(local):
+    readers = [local._reader()]
+    worker = threading.Thread(target=lambda: readers.append(local._reader()))
+    worker.start()
+    worker.join()
+
+    local.close()
+
+    for conn in readers:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    # reabre sob demanda
+    assert local.get("memory_notes", "x") is None
@@ -0,0 +1,126 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.ai.resilience import CircuitBreaker, LocalRateLimitError, ResilientCaller, TokenBucket
+
+
+def half_open_caller() -> ResilientCaller:
+    caller = ResilientCaller()
+    caller.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    caller.breaker.record_failure()
+    return caller
+
+
+def connection_error() -> Exception:
+    return openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com"))
+
+
+def test_cancelled_call_releases_trial():
+    caller = half_open_caller()
+
+    async def slow(**kwargs):
+        await asyncio.sleep(10)
+
+    async def main():
+        task = asyncio.create_task(caller.acall(slow))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    assert caller.breaker.allow()
+
+
+def test_stream_errors_reach_breaker():
+    caller = ResilientCaller()
+    caller.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+
+    async def chunks():
+        yield "a"
+        raise connection_error()
+
+    async def create(**kwargs):
+        return chunks()
+
+    async def main():
+        stream = await caller.acall(create, stream=True)
+        assert caller.breaker.state == "closed"
+
+        with pytest.raises(openai.APIConnectionError):
+            async for _ in stream:
+                pass
+
+    asyncio.run(main())
+
+    assert caller.breaker.state == "open"
+
+
+def test_stream_success_closes_half_open_circuit():
+    caller = half_open_caller()
+
+    async def chunks():
+        yield "a"
+
+    async def create(**kwargs):
+        return chunks()
+
+    async def main():
+        stream = await caller.acall(create, stream=True)
+        assert not caller.breaker.allow()
+        assert [c async for c in stream] == ["a"]
+
+    asyncio.run(main())
+
+    assert caller.breaker.state == "closed"
+
+
+def test_token_limit_rejection_does_not_spend_a_request():
+    caller = ResilientCaller()
+    caller.tokens = TokenBucket(rate_per_minute=60, capacity=10)
+    before = caller.requests.available
+
+    with pytest.raises(LocalRateLimitError):
+        caller.call(lambda **kwargs: None, messages=[{"content": "x" * 4000}])
+
+    assert caller.requests.available == pytest.approx(before)
+
+
+def test_unconsumed_stream_releases_trial():
+    caller = half_open_caller()
+
+    async def chunks():
+        yield "a"
+
+    async def create(**kwargs):
+        return chunks()
+
+    async def main():
+        stream = await caller.acall(create, stream=True)
+        assert not caller.breaker.allow()
+        del stream
+
+    asyncio.run(main())
+
+    assert caller.breaker.allow()
+
+
+def test_closed_stream_releases_trial():
+    caller = half_open_caller()
+
+    async def chunks():
+        yield "a"
+
+    async def create(**kwargs):
+        return chunks()
+
+    async def main():
+        stream = await caller.acall(create, stream=True)
+        await stream.aclose()
+        assert caller.breaker.allow()
+
+    asyncio.run(main())
@@ -0,0 +1,198 @@
+from datetime import date
+
+import pytest
+
+from app.modules.finance import statement_import
+from app.modules.finance.statement_import import (
+    BANK,
+    CARD,
+    StatementFormatError,
+    StatementImporter,
+    detect_convention,
+    import_key,
+    iter_csv_rows,
+    iter_ofx_rows,
+    parse_amount,
+    parse_date,
+)
+
+
+def write(tmp_path, name, content, encoding="utf-8"):
+    path = tmp_path / name
+    path.write_bytes(content.encode(encoding))
+    return str(path)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("1.234,56", 1234.56),
+    ("-45,90", -45.90),
+    ("1234.56", 1234.56),
+    ("R$ 10,00", 10.0),
+    ("(10,00)", -10.0),
+    ("3.000", 3000.0),
+    ("", None),
+    ("abc", None),
+])
+def test_parse_amount(raw, expected):
+    assert parse_amount(raw) == expected
+
+
+def test_parse_date_formats():
+    for raw in ("05/03/2026", "2026-03-05", "05/03/26", "05-03-2026", "20260305"):
+        assert parse_date(raw) == date(2026, 3, 5)
+
+    assert parse_date("ontem") is None
+
+
+def test_bank_csv_semicolon_keeps_sign(tmp_path):
+    path = write(
+        tmp_path, "extrato.csv",
+        "Data;Histórico;Valor\n05/03/2026;Mercado;-120,50\n06/03/2026;Salário;5.000,00\n",
+    )
+
+    rows = list(iter_csv_rows(path))
+
+    assert [r["amount"] for r in rows] == [-120.50, 5000.0]
+    assert rows[0]["description"] == "Mercado"
+
+
+def test_card_csv_purchases_become_expenses(tmp_path):
+    path = write(
+        tmp_path, "nubank.csv",
+        "date,title,amount\n2026-03-05,Padaria,12.50\n2026-03-07,Estorno,-12.50\n",
+    )
+
+    rows = list(iter_csv_rows(path))
+
+    assert [r["amount"] for r in rows] == [-12.50, 12.50]
+
+
+def test_explicit_convention_overrides_detection(tmp_path):
+    path = write(tmp_path, "x.csv", "data;descricao;valor\n05/03/2026;Compra;50,00\n")
+
+    assert list(iter_csv_rows(path))[0]["amount"] == 50.0
+    assert list(iter_csv_rows(path, convention=CARD))[0]["amount"] == -50.0
+
+
+def test_detect_convention():
+    assert detect_convention(["date", "title", "amount"]) == CARD
+    assert detect_convention(["data", "descricao", "valor"], "fatura-marco.csv") == CARD
+    assert detect_convention(["data", "descricao", "valor"], "extrato.csv") == BANK
+
+
+def test_credit_debit_columns(tmp_path):
+    path = write(
+        tmp_path, "extrato.csv",
+        "Data;Descrição;Crédito;Débito\n05/03/2026;Pix recebido;100,00;\n06/03/2026;Luz;;80,00\n",
+    )
+
+    assert [r["amount"] for r in iter_csv_rows(path)] == [100.0, -80.0]
+
+
+def test_delimiter_fallback_counts_header(tmp_path):
+    # uma coluna só de dados: o Sniffer não decide, o cabeçalho decide
+    path = write(tmp_path, "extrato.csv", "data;descricao;valor\n")
+
+    assert list(iter_csv_rows(path)) == []
+
+
+def test_csv_without_required_columns(tmp_path):
+    path = write(tmp_path, "x.csv", "foo;bar\n1;2\n")
+
+    with pytest.raises(StatementFormatError):
+        list(iter_csv_rows(path))
+
+
+def test_cp1252_csv(tmp_path):
+    path = write(
+        tmp_path, "extrato.csv",
+        "Data;Descrição;Valor\n05/03/2026;Farmácia São João;-30,00\n",
+        encoding="cp1252",
+    )
+
+    assert list(iter_csv_rows(path))[0]["description"] == "Farmácia São João"
+
+
+def test_ofx_rows(tmp_path):
+    path = write(
+        tmp_path, "extrato.ofx",
+        "OFXHEADER:100\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n"
+        "<STMTTRN>\n<TRNTYPE>DEBIT\n<DTPOSTED>20260305120000[-3:BRT]\n"
+        "<TRNAMT>-42.10\n<FITID>abc1\n<MEMO>Uber\n</STMTTRN>\n"
+        "<STMTTRN>\n<TRNTYPE>CREDIT\n<DTPOSTED>20260306\n"
+        "<TRNAMT>1500.00\n<FITID>abc2\n<NAME>Salario\n</STMTTRN>\n"
+        "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n",
+    )
+
+    rows = list(iter_ofx_rows(path))
+
+    assert rows == [
+        {"date": date(2026, 3, 5), "description": "Uber", "amount": -42.10, "fitid": "abc1"},
+        {"date": date(2026, 3, 6), "description": "Salario", "amount": 1500.0, "fitid": "abc2"},
+    ]
+
+
+def test_ofx_without_transactions(tmp_path):
+    path = write(tmp_path, "vazio.ofx", "<OFX></OFX>")
+
+    with pytest.raises(StatementFormatError):
+        list(iter_ofx_rows(path))
+
+
+def test_import_key_is_stable_and_counts_occurrences():
+    row = {"date": date(2026, 3, 5), "description": "Café  Bom", "amount": -7.5}
+
+    assert import_key(row) == import_key({**row, "description": "cafe bom"})
+    assert import_key(row, 1) != import_key(row)
+    assert import_key({**row, "fitid": "x"}) != import_key(row)
+
+
+class FakeRepository:
+    def __init__(self):
+        self.hashes = set()
+
+    def save_imported(self, transactions):
+        saved = [t for t in transactions if t["import_hash"] not in self.hashes]
+        self.hashes.update(t["import_hash"] for t in saved)
+        return saved
+
+
+class FakeCategorizer:
+    llm_categorized = 0
+
+    def categorize_many(self, descriptions):
+        return {d: None for d in descriptions}
+
+
+def test_importer_normalizes_sign_and_skips_reimports():
+    repository = FakeRepository()
+    rows = [
+        {"date": date(2026, 3, 5), "description": "Café", "amount": -7.5},
+        {"date": date(2026, 3, 5), "description": "Café", "amount": -7.5},
+        {"date": date(2026, 3, 6), "description": "Salário", "amount": 100.0},
+    ]
+
+    first = StatementImporter(repository, FakeCategorizer())
+    assert first.import_chunk(rows) == 3
+    assert first.summary()["expense"] == 15.0
+    assert first.summary()["income"] == 100.0
+
+    again = StatementImporter(repository, FakeCategorizer())
+    assert again.import_chunk(rows) == 0
+    assert again.summary()["duplicates"] == 3
+
+
+def test_importer_remembers_a_bounded_window_of_dates(monkeypatch):
+    monkeypatch.setattr(statement_import, "SEEN_DATES_WINDOW", 3)
+    importer = StatementImporter(FakeRepository(), FakeCategorizer())
+
+    rows = [
+        {"date": date(2026, 3, day), "description": "Café", "amount": -7.5}
+        for day in range(1, 11)
+        for _ in range(2)
+    ]
+    for chunk in statement_import.chunked(rows, 3):
+        importer.import_chunk(chunk)
+
+    assert importer.summary()["imported"] == 20
+    assert list(importer._seen) == [date(2026, 3, 8), date(2026, 3, 9), date(2026, 3, 10)]
@@ -0,0 +1,44 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.ai.metrics import LatencyStats
+from app.bot.handlers import stats_handler
+
+
+def fake_update():
+    sent = []
+
+    async def reply_text(text, **kwargs):
+        sent.append((text, kwargs))
+
+    return SimpleNamespace(message=SimpleNamespace(reply_text=reply_text)), sent
+
+
+def test_stats_escapes_metric_names(monkeypatch):
+    stats = LatencyStats()
+    stats.record("llm_batch", 0.2)
+    monkeypatch.setattr(stats_handler, "finance_parse_stats", stats)
+    monkeypatch.setattr(stats_handler, "notion_outbox", SimpleNamespace(
+        stats=lambda: {"pending": 0, "dead": 0, "lag_seconds": 0.0}
+    ))
+
+    update, sent = fake_update()
+    asyncio.run(stats_handler.handle_stats(update, None))
+
+    text, kwargs = sent[0]
+    assert kwargs["parse_mode"] == "Markdown"
+    assert "llm\\_batch" in text
+
+
+def test_health_does_not_leak_error_details(monkeypatch):
+    monkeypatch.setattr(stats_handler.clients, "health_check", lambda: {
+        "openai": "ok",
+        "notion": "erro: token secret_abc123 inválido",
+    })
+
+    update, sent = fake_update()
+    asyncio.run(stats_handler.handle_health(update, None))
+
+    text, _ = sent[0]
+    assert "secret_abc123" not in text
+    assert "notion: indisponível" in text